@@ -1,11 +1,37 @@
 """
 Vora AI Agents Package
+
+Agents are imported on first attribute access, so importing the package (or one
+agent from it) does not pay for building every agent's models and graphs.
 """
 
-from .gaia import gaia
-from .indra import indra
-from .thoth import thoth
-from .pan import pan
-from .isis import isis
+import importlib
+from typing import Iterable, Optional
+
+__all__ = ['gaia', 'indra', 'thoth', 'pan', 'isis']
+
+def _load(name):
+    module = importlib.import_module(f".{name}", __name__)
+    agent = getattr(module, name)
+    # Importing the submodule binds its name on the package; rebind it to the agent
+    globals()[name] = agent
+    return module, agent
+
+def __getattr__(name):
+    if name in __all__:
+        return _load(name)[1]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-__all__ = ['gaia', 'indra', 'thoth', 'pan', 'isis'] 
\ No newline at end of file
+def warm_up(names: Optional[Iterable[str]] = None) -> None:
+    """
+    Import the named agents (all of them by default) and build their models and
+    graphs ahead of the first request.
+    """
+    for name in names or __all__:
+        module, agent = _load(name)
+        if hasattr(agent, "warm_up"):
+            agent.warm_up()
+        if hasattr(module, "get_graph"):
+            module.get_graph()
+            # Graph agents share the default model from config
+            importlib.import_module("config").default_langchain_model
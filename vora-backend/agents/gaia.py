@@ -1,8 +1,10 @@
 import os
-from typing import Optional
+from typing import AsyncIterator, Iterator, List, Optional, Tuple
 from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
-from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+
+import config
+from response_cache import ResponseCache, cache_key
 
 # Load environment variables
 load_dotenv()
@@ -14,11 +16,8 @@ if not api_key:
 
 class GaiaAgent:
     def __init__(self):
-        self.model = ChatOpenAI(
-            model_name=os.getenv("DEFAULT_MODEL_NAME", "gpt-4"),
-            temperature=float(os.getenv("DEFAULT_MODEL_TEMPERATURE", "0")),
-            api_key=api_key
-        )
+        self.model_name = os.getenv("DEFAULT_MODEL_NAME", "gpt-4")
+        self.temperature = float(os.getenv("DEFAULT_MODEL_TEMPERATURE", "0"))
 
         self.SYSTEM_PROMPT = """You are Gaia, the Earth Mother AI assistant developed by Vora AI. 
         You are part of the Vora AI system, a cutting-edge AI platform that embodies the wisdom of nature.
@@ -36,15 +35,126 @@ class GaiaAgent:
         - Be helpful and supportive
         """
 
+    @property
+    def model(self):
+        """The shared OpenAI chat model from the config model factory"""
+        return config.get_model("OPENAI", self.model_name, self.temperature)
+
+    def warm_up(self) -> None:
+        """Construct the chat model ahead of the first request"""
+        self.model
+
+    def _chat_messages(self, message: str) -> List[BaseMessage]:
+        return [
+            SystemMessage(content=self.SYSTEM_PROMPT),
+            HumanMessage(content=message)
+        ]
+
+    def _task_messages(self, description: str) -> List[BaseMessage]:
+        # The task id is left out: identical descriptions share one model call, through
+        # the response cache or in-flight coalescing, so the answer must not name a task
+        task_prompt = f"""Task Description: {description}
+            
+            Please analyze this task and provide a detailed response with:
+            1. Your understanding of the task
+            2. A step-by-step plan to complete it
+            3. The final result or recommendation
+            """
+
+        return [
+            SystemMessage(content=self.SYSTEM_PROMPT),
+            HumanMessage(content=task_prompt)
+        ]
+
+    def _cache_entry(self, mode: str, content: str) -> Optional[Tuple[ResponseCache, str, str]]:
+        """
+        Response cache, key and similarity scope for a call, or None when the
+        call must not be cached. Only deterministic (temperature 0) calls are
+        cached. Task prompts are keyed on the description alone, since the
+        surrounding template is fixed.
+        """
+        cache = config.get_response_cache()
+        if cache is None or self.temperature != 0:
+            return None
+        scope = cache_key(self.model_name, self.temperature, self.SYSTEM_PROMPT, mode)
+        return cache, cache_key(self.model_name, self.temperature, self.SYSTEM_PROMPT, f"{mode}:{content}"), scope
+
+    def _invoke(self, mode: str, content: str, messages: List[BaseMessage]) -> str:
+        entry = self._cache_entry(mode, content)
+        if entry is not None:
+            cache, key, scope = entry
+            cached = cache.get(key, scope, content)
+            if cached is not None:
+                return cached
+
+        with config.llm_slot("OPENAI"):
+            response = self.model.invoke(messages)
+        if entry is not None:
+            cache.put(key, response.content, scope, content)
+        return response.content
+
+    def _stream(self, mode: str, content: str, messages: List[BaseMessage]) -> Iterator[str]:
+        entry = self._cache_entry(mode, content)
+        if entry is not None:
+            cache, key, scope = entry
+            cached = cache.get(key, scope, content)
+            if cached is not None:
+                yield cached
+                return
+
+        chunks = []
+        with config.llm_slot("OPENAI"):
+            for chunk in self.model.stream(messages):
+                if chunk.content:
+                    chunks.append(chunk.content)
+                    yield chunk.content
+        if entry is not None:
+            cache.put(key, "".join(chunks), scope, content)
+
+    async def _ainvoke(self, mode: str, content: str, messages: List[BaseMessage]) -> str:
+        entry = self._cache_entry(mode, content)
+        if entry is not None:
+            cache, key, scope = entry
+            cached = await cache.aget(key, scope, content)
+            if cached is not None:
+                return cached
+
+        async with config.allm_slot("OPENAI"):
+            response = await self.model.ainvoke(messages)
+        if entry is not None:
+            await cache.aput(key, response.content, scope, content)
+        return response.content
+
+    async def _astream(self, mode: str, content: str, messages: List[BaseMessage]) -> AsyncIterator[str]:
+        entry = self._cache_entry(mode, content)
+        if entry is not None:
+            cache, key, scope = entry
+            cached = await cache.aget(key, scope, content)
+            if cached is not None:
+                yield cached
+                return
+
+        chunks = []
+        async with config.allm_slot("OPENAI"):
+            async for chunk in self.model.astream(messages):
+                if chunk.content:
+                    chunks.append(chunk.content)
+                    yield chunk.content
+        if entry is not None:
+            await cache.aput(key, "".join(chunks), scope, content)
+
     def chat(self, message: str) -> str:
         """Handle direct chat messages"""
         try:
-            messages = [
-                SystemMessage(content=self.SYSTEM_PROMPT),
-                HumanMessage(content=message)
-            ]
-            response = self.model.invoke(messages)
-            return response.content
+            return self._invoke("chat", message, self._chat_messages(message))
+        except Exception as e:
+            error_msg = f"Error in chat: {str(e)}"
+            raise Exception(error_msg)
+
+    def stream_chat(self, message: str) -> Iterator[str]:
+        """Handle direct chat messages, yielding the response as it is generated"""
+        try:
+            yield from self._stream("chat", message, self._chat_messages(message))
         except Exception as e:
             error_msg = f"Error in chat: {str(e)}"
             raise Exception(error_msg)
@@ -52,21 +162,49 @@ class GaiaAgent:
     def process_task(self, task_id: str, description: str) -> str:
         """Handle task processing"""
         try:
-            task_prompt = f"""Task ID: {task_id}
-            Task Description: {description}
-            
-            Please analyze this task and provide a detailed response with:
-            1. Your understanding of the task
-            2. A step-by-step plan to complete it
-            3. The final result or recommendation
-            """
-            
-            messages = [
-                SystemMessage(content=self.SYSTEM_PROMPT),
-                HumanMessage(content=task_prompt)
-            ]
-            response = self.model.invoke(messages)
-            return response.content
+            return self._invoke("task", description, self._task_messages(description))
+        except Exception as e:
+            error_msg = f"Error processing task: {str(e)}"
+            raise Exception(error_msg)
+
+    def stream_task(self, task_id: str, description: str) -> Iterator[str]:
+        """Handle task processing, yielding the response as it is generated"""
+        try:
+            yield from self._stream("task", description, self._task_messages(description))
+        except Exception as e:
+            error_msg = f"Error processing task: {str(e)}"
+            raise Exception(error_msg)
+
+    async def achat(self, message: str) -> str:
+        """Handle direct chat messages on the event loop"""
+        try:
+            return await self._ainvoke("chat", message, self._chat_messages(message))
+        except Exception as e:
+            error_msg = f"Error in chat: {str(e)}"
+            raise Exception(error_msg)
+
+    async def astream_chat(self, message: str) -> AsyncIterator[str]:
+        """Handle direct chat messages on the event loop, yielding the response as it is generated"""
+        try:
+            async for chunk in self._astream("chat", message, self._chat_messages(message)):
+                yield chunk
+        except Exception as e:
+            error_msg = f"Error in chat: {str(e)}"
+            raise Exception(error_msg)
+
+    async def aprocess_task(self, task_id: str, description: str) -> str:
+        """Handle task processing on the event loop"""
+        try:
+            return await self._ainvoke("task", description, self._task_messages(description))
+        except Exception as e:
+            error_msg = f"Error processing task: {str(e)}"
+            raise Exception(error_msg)
+
+    async def astream_task(self, task_id: str, description: str) -> AsyncIterator[str]:
+        """Handle task processing on the event loop, yielding the response as it is generated"""
+        try:
+            async for chunk in self._astream("task", description, self._task_messages(description)):
+                yield chunk
         except Exception as e:
             error_msg = f"Error processing task: {str(e)}"
             raise Exception(error_msg)
@@ -1,6 +1,8 @@
+from functools import lru_cache
 from typing import Literal
 
 from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import StateGraph, MessagesState, END
 from langgraph.prebuilt import ToolNode
 
@@ -58,8 +60,18 @@ def reasoning(state: MessagesState):
     print()
     print("Isis is thinking...")
     messages = state['messages']
-    tooled_up_model = config.default_langchain_model.bind_tools(tools)
-    response = tooled_up_model.invoke(messages)
+    tooled_up_model = config.get_tool_model(tools)
+    with config.llm_slot():
+        response = tooled_up_model.invoke(messages)
+    return {"messages": [response]}
+
+async def areasoning(state: MessagesState):
+    print()
+    print("Isis is thinking...")
+    messages = state['messages']
+    tooled_up_model = config.get_tool_model(tools)
+    async with config.allm_slot():
+        response = await tooled_up_model.ainvoke(messages)
     return {"messages": [response]}
 
 def check_for_tool_calls(state: MessagesState) -> Literal["tools", "feedback_and_wait_on_human_input"]:
@@ -77,31 +89,42 @@ def check_for_tool_calls(state: MessagesState) -> Literal["tools", "feedback_and
     else:
         return "feedback_and_wait_on_human_input"
 
-acting = ToolNode(tools)
-
-workflow = StateGraph(MessagesState)
-workflow.add_node("feedback_and_wait_on_human_input", feedback_and_wait_on_human_input)
-workflow.add_node("reasoning", reasoning)
-workflow.add_node("tools", acting)
-workflow.set_entry_point("feedback_and_wait_on_human_input")
-workflow.add_conditional_edges(
-    "feedback_and_wait_on_human_input",
-    check_for_exit,
-)
-workflow.add_conditional_edges(
-    "reasoning",
-    check_for_tool_calls,
-)
-workflow.add_edge("tools", 'reasoning')
-
-graph = workflow.compile(checkpointer=utils.checkpointer)
+@lru_cache(maxsize=None)
+def get_graph():
+    """Build and compile the agent graph on first use"""
+    workflow = StateGraph(MessagesState)
+    workflow.add_node("feedback_and_wait_on_human_input", feedback_and_wait_on_human_input)
+    workflow.add_node("reasoning", RunnableLambda(reasoning, afunc=areasoning))
+    workflow.add_node("tools", ToolNode(tools))
+    workflow.set_entry_point("feedback_and_wait_on_human_input")
+    workflow.add_conditional_edges(
+        "feedback_and_wait_on_human_input",
+        check_for_exit,
+    )
+    workflow.add_conditional_edges(
+        "reasoning",
+        check_for_tool_calls,
+    )
+    workflow.add_edge("tools", 'reasoning')
+
+    return workflow.compile(checkpointer=utils.checkpointer)
 
 def isis(uuid: str):
     """The mystical weaver of magical knowledge and innovation."""
     print(f"Starting session with Vora AI (id:{uuid})")
     print("Type 'exit' to end the session.")
 
-    return graph.invoke(
+    return get_graph().invoke(
+        {"messages": [SystemMessage(system_prompt)]},
+        config={"configurable": {"thread_id": uuid}}
+    )
+
+async def aisis(uuid: str):
+    """Async `isis`: runs the same graph with `ainvoke`, awaiting model calls on the event loop."""
+    print(f"Starting session with Vora AI (id:{uuid})")
+    print("Type 'exit' to end the session.")
+
+    return await get_graph().ainvoke(
         {"messages": [SystemMessage(system_prompt)]},
         config={"configurable": {"thread_id": uuid}}
-    ) 
\ No newline at end of file
+    )
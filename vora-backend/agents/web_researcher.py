@@ -1,6 +1,8 @@
+from functools import lru_cache
 from typing import Literal
 
 from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import END, StateGraph, MessagesState
 from langgraph.prebuilt import ToolNode
 
@@ -20,8 +22,17 @@ tools = [duck_duck_go_web_search, fetch_web_page_content]
 def reasoning(state: MessagesState):
     print("web_researcher is thinking...")
     messages = state['messages']
-    tooled_up_model = config.default_langchain_model.bind_tools(tools)
-    response = tooled_up_model.invoke(messages)
+    tooled_up_model = config.get_tool_model(tools)
+    with config.llm_slot():
+        response = tooled_up_model.invoke(messages)
+    return {"messages": [response]}
+
+async def areasoning(state: MessagesState):
+    print("web_researcher is thinking...")
+    messages = state['messages']
+    tooled_up_model = config.get_tool_model(tools)
+    async with config.allm_slot():
+        response = await tooled_up_model.ainvoke(messages)
     return {"messages": [response]}
 
 def check_for_tool_calls(state: MessagesState) -> Literal["tools", END]:
@@ -39,23 +50,30 @@ def check_for_tool_calls(state: MessagesState) -> Literal["tools", END]:
     
     return END
 
-acting = ToolNode(tools)
+@lru_cache(maxsize=None)
+def get_graph():
+    """Build and compile the agent graph on first use"""
+    workflow = StateGraph(MessagesState)
+    workflow.add_node("reasoning", RunnableLambda(reasoning, afunc=areasoning))
+    workflow.add_node("tools", ToolNode(tools))
+    workflow.set_entry_point("reasoning")
+    workflow.add_conditional_edges(
+        "reasoning",
+        check_for_tool_calls,
+    )
+    workflow.add_edge("tools", 'reasoning')
 
-workflow = StateGraph(MessagesState)
-workflow.add_node("reasoning", reasoning)
-workflow.add_node("tools", acting)
-workflow.set_entry_point("reasoning")
-workflow.add_conditional_edges(
-    "reasoning",
-    check_for_tool_calls,
-)
-workflow.add_edge("tools", 'reasoning')
-
-graph = workflow.compile()
+    return workflow.compile()
 
 
 def web_researcher(task: str) -> str:
     """Researches the web."""
-    return graph.invoke(
+    return get_graph().invoke(
+        {"messages": [SystemMessage(system_prompt), HumanMessage(task)]}
+    )
+
+async def aweb_researcher(task: str) -> str:
+    """Async `web_researcher`: runs the same graph with `ainvoke`, awaiting model calls on the event loop."""
+    return await get_graph().ainvoke(
         {"messages": [SystemMessage(system_prompt), HumanMessage(task)]}
-    )
\ No newline at end of file
+    )
@@ -0,0 +1,6 @@
+"""
+Flux AI Benchmarks Package
+
+Standalone scripts for measuring kernel performance. Run them from the backend root,
+e.g. `python -m benchmarks.task_throughput`.
+"""
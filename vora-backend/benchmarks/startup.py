@@ -0,0 +1,98 @@
+"""
+Measure cold-start cost of the FluxKernel: import time broken down by module, and the
+time until a freshly started server answers /health.
+
+Import numbers come from `python -X importtime` run in a fresh interpreter, so nothing
+is cached from the current process.
+
+Usage:
+    python -m benchmarks.startup --top 15
+    python -m benchmarks.startup --module agents --warm-up
+    python -m benchmarks.startup --health --port 8765
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+from typing import List, Tuple
+
+import httpx
+
+def measure_imports(module: str, warm_up: bool) -> Tuple[float, List[Tuple[int, int, str]]]:
+    """
+    Import `module` in a fresh interpreter and return the wall time in seconds and
+    the (self_us, cumulative_us, name) rows reported by -X importtime.
+    """
+    statement = f"import {module}"
+    if warm_up:
+        statement += "; import agents; agents.warm_up()"
+
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        env={**os.environ, "TASK_DB_PATH": ""},
+    )
+    elapsed = time.perf_counter() - started
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1])
+
+    rows = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(self_us), int(cumulative_us), name.rstrip()))
+    return elapsed, rows
+
+def measure_health(port: int, timeout: float) -> float:
+    """
+    Start the kernel under uvicorn and return seconds until /health answers 200.
+    """
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "flux_kernel:app", "--port", str(port), "--log-level", "warning"],
+        env={**os.environ, "TASK_DB_PATH": ""},
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                if httpx.get(f"http://127.0.0.1:{port}/health", timeout=0.5).status_code == 200:
+                    return time.perf_counter() - started
+            except httpx.TransportError:
+                pass
+            time.sleep(0.02)
+        raise TimeoutError(f"/health did not answer within {timeout}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="flux_kernel", help="module to import")
+    parser.add_argument("--top", type=int, default=15, help="number of slowest imports to list")
+    parser.add_argument("--warm-up", action="store_true", help="also build every agent after importing")
+    parser.add_argument("--health", action="store_true", help="also time a server start until /health answers")
+    parser.add_argument("--port", type=int, default=8765, help="port for the --health server")
+    args = parser.parse_args()
+
+    elapsed, rows = measure_imports(args.module, args.warm_up)
+    total_us = sum(self_us for self_us, _, _ in rows)
+    print(f"import {args.module}{' + agent warm-up' if args.warm_up else ''}")
+    print(f"  interpreter wall time:  {elapsed:.3f}s")
+    print(f"  total import time:      {total_us / 1e6:.3f}s across {len(rows)} modules")
+
+    # Names are indented two spaces per nesting level; a cumulative time covers
+    # everything that module pulled in, so list the top level and its direct imports
+    shallow = [row for row in rows if len(row[2]) - len(row[2].lstrip()) <= 3]
+    print("  slowest imports (cumulative, two levels deep):")
+    for self_us, cumulative_us, name in sorted(shallow, key=lambda row: row[1], reverse=True)[:args.top]:
+        print(f"    {cumulative_us / 1000:9.1f}ms  {name[1:]}")
+
+    if args.health:
+        print(f"  server start to /health: {measure_health(args.port, timeout=60):.3f}s")
+
+if __name__ == "__main__":
+    main()
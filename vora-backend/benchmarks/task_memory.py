@@ -0,0 +1,79 @@
+"""
+Measure the heap cost of Task records and how fast they serialize.
+
+Builds `--tasks` tasks the way POST /tasks does, reports traced memory per task
+(with and without the cached JSON text), then times `to_dict`, a cold `to_json`
+and a cached `to_json` over the whole set.
+
+Usage:
+    python -m benchmarks.task_memory --tasks 100000
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, List
+
+from task_model import Task, TaskMetadata, TaskStatus
+
+def make_tasks(count: int) -> List[Task]:
+    base = datetime.now()
+    return [
+        Task(
+            id=str(uuid.uuid4()),
+            description=f"benchmark task {i}",
+            status=TaskStatus.PENDING,
+            agent_id="assistant",
+            priority=1,
+            created_at=base + timedelta(microseconds=i),
+            updated_at=base + timedelta(microseconds=i),
+            metadata=TaskMetadata(client_info="Address(host='127.0.0.1', port=50000)", tags=["bench"]),
+        )
+        for i in range(count)
+    ]
+
+def traced_bytes(build: Callable[[], object]) -> int:
+    """
+    Bytes still allocated after `build()` returns, keeping its result alive.
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return after - before
+
+def throughput(label: str, tasks: List[Task], serialize: Callable[[Task], object]) -> None:
+    started = time.perf_counter()
+    for task in tasks:
+        serialize(task)
+    elapsed = time.perf_counter() - started
+    print(f"  {label:<22} {len(tasks) / elapsed:>12,.0f} tasks/s")
+
+def run(count: int) -> None:
+    per_task = traced_bytes(lambda: make_tasks(count)) / count
+
+    tasks = make_tasks(count)
+    print(f"{count:,} tasks")
+    print(f"  memory per task:       {per_task:,.0f} bytes")
+    throughput("to_dict", tasks, Task.to_dict)
+    throughput("to_json (cold)", tasks, Task.to_json)
+    throughput("to_json (cached)", tasks, Task.to_json)
+
+    def with_json():
+        built = make_tasks(count)
+        for task in built:
+            task.to_json()
+        return built
+
+    print(f"  memory with JSON text: {traced_bytes(with_json) / count:,.0f} bytes")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=100_000, help="number of tasks to build")
+    args = parser.parse_args()
+    run(args.tasks)
@@ -0,0 +1,81 @@
+"""
+Measure task throughput of the FluxKernel execution engine under concurrent submissions.
+
+The real LLM call is replaced by an agent that waits for a fixed latency, so the numbers
+reflect queueing and worker overhead rather than model speed.
+
+Usage:
+    python -m benchmarks.task_throughput --tasks 100 --latency 0.2
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+import flux_kernel
+
+class SimulatedAgent:
+    """Stand-in for Gaia that waits like an LLM request, awaited or blocking."""
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+
+    def process_task(self, task_id: str, description: str) -> str:
+        time.sleep(self.latency)
+        return f"Processed {task_id}"
+
+    def stream_task(self, task_id: str, description: str):
+        time.sleep(self.latency)
+        yield f"Processed {task_id}"
+
+    async def aprocess_task(self, task_id: str, description: str) -> str:
+        await asyncio.sleep(self.latency)
+        return f"Processed {task_id}"
+
+    async def astream_task(self, task_id: str, description: str):
+        await asyncio.sleep(self.latency)
+        yield f"Processed {task_id}"
+
+async def run(tasks: int, latency: float) -> None:
+    flux_kernel.gaia = SimulatedAgent(latency)
+    flux_kernel.GAIA_AVAILABLE = True
+    kernel = flux_kernel.kernel
+
+    transport = httpx.ASGITransport(app=flux_kernel.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        started = time.perf_counter()
+        responses = await asyncio.gather(*[
+            client.post("/tasks", json={"description": f"benchmark task {i}"})
+            for i in range(tasks)
+        ])
+        accepted = time.perf_counter() - started
+
+        health_started = time.perf_counter()
+        await client.get("/health")
+        health_latency = time.perf_counter() - health_started
+
+        await kernel.executor.join()
+        finished = time.perf_counter() - started
+
+        metrics = (await client.get("/metrics")).json()
+
+    statuses = {}
+    for response in responses:
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    print(f"Submitted {tasks} tasks with {latency:.3f}s simulated agent latency")
+    print(f"  response codes:        {statuses}")
+    print(f"  all accepted after:    {accepted:.3f}s")
+    print(f"  /health under load:    {health_latency * 1000:.1f}ms")
+    print(f"  all completed after:   {finished:.3f}s")
+    print(f"  throughput:            {tasks / finished:.1f} tasks/s")
+    print(f"  executor metrics:      {metrics['executor']}")
+
+    await kernel.executor.stop()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=100, help="number of concurrent submissions")
+    parser.add_argument("--latency", type=float, default=0.2, help="simulated agent latency in seconds")
+    args = parser.parse_args()
+    asyncio.run(run(args.tasks, args.latency))
@@ -0,0 +1,105 @@
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+import hashlib
+import logging
+import mmap
+import os
+import tempfile
+import threading
+import zlib
+
+logger = logging.getLogger("flux.blobs")
+
+# ------------------------------------------------------
+# BlobStore: Content-Addressed Result Storage
+# ------------------------------------------------------
+class BlobStore:
+    """
+    Stores large payloads on local disk, zlib-compressed and addressed by the
+    SHA-256 of their content, so identical results are written once.
+
+    Blobs are memory-mapped and decompressed incrementally on read, which lets
+    a byte range be streamed without loading the whole payload.
+    """
+    def __init__(self, root: str, compress_level: int = 6, chunk_size: int = 64 * 1024) -> None:
+        self.root = Path(root)
+        self.compress_level = compress_level
+        self.chunk_size = chunk_size
+
+        self.writes: int = 0
+        self.deduplicated: int = 0
+        self.bytes_in: int = 0
+        self.bytes_stored: int = 0
+        self._lock = threading.Lock()
+
+    def path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest[2:]
+
+    def put(self, data: bytes) -> str:
+        """
+        Store `data` unless it is already present and return its digest.
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path(digest)
+        if path.exists():
+            with self._lock:
+                self.deduplicated += 1
+            return digest
+
+        compressed = zlib.compress(data, self.compress_level)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file and rename, so readers never see a partial blob
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(compressed)
+            os.replace(temp_path, path)
+        except BaseException:
+            Path(temp_path).unlink(missing_ok=True)
+            raise
+
+        with self._lock:
+            self.writes += 1
+            self.bytes_in += len(data)
+            self.bytes_stored += len(compressed)
+        return digest
+
+    def read(self, digest: str, start: int = 0, end: Optional[int] = None) -> Iterator[bytes]:
+        """
+        Yield the decompressed bytes of a blob from `start` up to, but not
+        including, `end` (the end of the blob by default).
+
+        Raises:
+            FileNotFoundError: If no blob with `digest` is stored.
+        """
+        with open(self.path(digest), "rb") as handle, \
+                mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            decompressor = zlib.decompressobj()
+            position = 0
+            for offset in range(0, len(mapped), self.chunk_size):
+                chunk = decompressor.decompress(mapped[offset:offset + self.chunk_size])
+                chunk_start, position = position, position + len(chunk)
+                if position <= start:
+                    continue
+                if end is not None and chunk_start >= end:
+                    return
+                yield chunk[max(0, start - chunk_start):None if end is None else end - chunk_start]
+            tail = decompressor.flush()
+            if tail and (end is None or position < end):
+                yield tail[max(0, start - position):None if end is None else end - position]
+
+    def read_all(self, digest: str) -> bytes:
+        return b"".join(self.read(digest))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Describe blob storage activity for JSON responses.
+        """
+        return {
+            "root": str(self.root),
+            "writes": self.writes,
+            "deduplicated": self.deduplicated,
+            "bytes_in": self.bytes_in,
+            "bytes_stored": self.bytes_stored,
+            "compression_ratio": self.bytes_stored / self.bytes_in if self.bytes_in else None,
+        }
@@ -0,0 +1,215 @@
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterator
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger("flux.browsers")
+
+CHROMEDRIVER_PATH = os.getenv("CHROMEDRIVER_PATH", "/usr/bin/chromedriver")
+CHROME_ARGUMENTS = ("--headless", "--disable-gpu", "--no-sandbox", "--disable-dev-shm-usage")
+
+class BrowserPoolTimeout(RuntimeError):
+    """
+    Raised when no browser session became free within the checkout timeout.
+    """
+
+def chrome_driver() -> Any:
+    """
+    Start a headless Chrome session through chromedriver.
+    """
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
+
+    options = Options()
+    for argument in CHROME_ARGUMENTS:
+        options.add_argument(argument)
+    return webdriver.Chrome(options=options, service=Service(CHROMEDRIVER_PATH))
+
+# ------------------------------------------------------
+# Browser Sessions
+# ------------------------------------------------------
+class BrowserSession:
+    """
+    A browser driver owned by a BrowserPool, with the number of pages it has loaded.
+    """
+    __slots__ = ("driver", "pages", "created_at")
+
+    def __init__(self, driver: Any) -> None:
+        self.driver = driver
+        self.pages = 0
+        self.created_at = time.monotonic()
+
+# ------------------------------------------------------
+# BrowserPool: Reusable Headless Browsers
+# ------------------------------------------------------
+class BrowserPool:
+    """
+    A bounded pool of long-lived browser sessions.
+
+    `checkout` lends a session for one page fetch and takes it back afterwards.
+    At most `size` sessions exist at once; callers beyond that wait up to
+    `checkout_timeout` seconds for one to be returned. Idle sessions are health
+    checked before they are lent out, and a session is quit and replaced after
+    `max_pages` fetches or when a fetch fails, so a crashed or bloated browser
+    never serves a second page. Every page load and script is bounded by
+    `page_timeout` seconds.
+    """
+    def __init__(
+        self,
+        factory: Callable[[], Any] = chrome_driver,
+        size: int = 2,
+        max_pages: int = 50,
+        page_timeout: float = 30.0,
+        checkout_timeout: float = 60.0,
+    ) -> None:
+        self.factory = factory
+        self.size = size
+        self.max_pages = max_pages
+        self.page_timeout = page_timeout
+        self.checkout_timeout = checkout_timeout
+
+        self.created: int = 0
+        self.recycled: int = 0
+        self.discarded: int = 0
+        self.checkouts: int = 0
+        self.waits: int = 0
+
+        self._idle: Deque[BrowserSession] = deque()
+        self._open = 0
+        self._closed = False
+        self._available = threading.Condition()
+
+    @property
+    def in_use(self) -> int:
+        return self._open - len(self._idle)
+
+    @contextmanager
+    def checkout(self) -> Iterator[Any]:
+        """
+        Lend a browser driver for the duration of the `with` block.
+
+        Raises:
+            BrowserPoolTimeout: If no session became free in time.
+        """
+        session = self._acquire()
+        failed = False
+        try:
+            yield session.driver
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            session.pages += 1
+            self._release(session, failed)
+
+    def close(self) -> None:
+        """
+        Quit all idle sessions; sessions still lent out are quit when returned.
+        """
+        with self._available:
+            self._closed = True
+            sessions = list(self._idle)
+            self._idle.clear()
+            self._open -= len(sessions)
+            self._available.notify_all()
+        for session in sessions:
+            self._quit(session)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Describe pool state for JSON responses.
+        """
+        return {
+            "size": self.size,
+            "open": self._open,
+            "idle": len(self._idle),
+            "in_use": self.in_use,
+            "created": self.created,
+            "recycled": self.recycled,
+            "discarded": self.discarded,
+            "checkouts": self.checkouts,
+            "waits": self.waits,
+        }
+
+    def _acquire(self) -> BrowserSession:
+        deadline = time.monotonic() + self.checkout_timeout
+        while True:
+            with self._available:
+                while not self._idle and self._open >= self.size:
+                    if self._closed:
+                        raise RuntimeError("Browser pool is closed")
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise BrowserPoolTimeout(f"No browser free after {self.checkout_timeout}s")
+                    self.waits += 1
+                    self._available.wait(remaining)
+                if self._closed:
+                    raise RuntimeError("Browser pool is closed")
+                self.checkouts += 1
+                # Most recently returned first: it is the session most likely to still respond
+                session = self._idle.pop() if self._idle else None
+                if session is None:
+                    self._open += 1
+
+            if session is None:
+                return self._start()
+            if self._healthy(session):
+                return session
+            logger.warning("Discarding unresponsive browser session")
+            self._discard(session)
+
+    def _start(self) -> BrowserSession:
+        try:
+            session = BrowserSession(self.factory())
+        except BaseException:
+            with self._available:
+                self._open -= 1
+                self._available.notify()
+            raise
+        self.created += 1
+        try:
+            session.driver.set_page_load_timeout(self.page_timeout)
+            session.driver.set_script_timeout(self.page_timeout)
+        except BaseException:
+            self._discard(session)
+            raise
+        return session
+
+    def _release(self, session: BrowserSession, failed: bool) -> None:
+        if failed or session.pages >= self.max_pages or self._closed:
+            if not failed and session.pages >= self.max_pages:
+                self.recycled += 1
+            self._discard(session)
+            return
+        try:
+            # Unload the page so its scripts and memory are not kept while idle
+            session.driver.get("about:blank")
+        except Exception:
+            self._discard(session)
+            return
+        with self._available:
+            self._idle.append(session)
+            self._available.notify()
+
+    def _discard(self, session: BrowserSession) -> None:
+        with self._available:
+            self._open -= 1
+            self.discarded += 1
+            self._available.notify()
+        self._quit(session)
+
+    def _healthy(self, session: BrowserSession) -> bool:
+        try:
+            return session.driver.execute_script("return 1;") == 1
+        except Exception:
+            return False
+
+    def _quit(self, session: BrowserSession) -> None:
+        try:
+            session.driver.quit()
+        except Exception as exc:
+            logger.warning(f"Failed to quit browser session: {exc}")
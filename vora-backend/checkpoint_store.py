@@ -0,0 +1,749 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
+import asyncio
+import atexit
+import logging
+import sqlite3
+import threading
+import time
+
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+)
+
+logger = logging.getLogger("flux.checkpoints")
+
+ThreadKey = Tuple[str, str]
+CheckpointKey = Tuple[str, str, str]
+WriteKey = Tuple[str, str, str, str, int]
+
+@dataclass(slots=True)
+class _LatestCheckpoint:
+    """
+    The newest checkpoint of a thread as written by `put`, with the writes
+    recorded against it, kept in memory until it is superseded or evicted.
+    """
+    checkpoint_id: str
+    checkpoint: Checkpoint
+    metadata: CheckpointMetadata
+    parent_id: Optional[str]
+    depth: int
+    writes: Dict[Tuple[str, int], Tuple[str, str, Any]] = field(default_factory=dict)
+
+# ------------------------------------------------------
+# SQLiteCheckpointer: LangGraph Checkpoint Storage
+# ------------------------------------------------------
+class SQLiteCheckpointer(BaseCheckpointSaver):
+    """
+    LangGraph checkpoint saver backed by SQLite in WAL mode.
+
+    Checkpoints are keyed by (thread_id, checkpoint_ns, checkpoint_id) and
+    stored in the serializer's binary form. `put` and `put_writes` only record
+    the row in a pending map; a background writer thread commits everything
+    pending in one transaction every `flush_interval` seconds, or sooner once
+    `batch_size` rows are waiting. Reads flush first, so a thread always sees
+    its own writes. Each thread uses its own connection.
+
+    A checkpoint whose list channels (such as `messages`) only extend those of
+    its parent is stored as a delta holding just the appended items. Every
+    `max_delta_chain` steps a full snapshot is written instead, which bounds
+    the rows read to rebuild a checkpoint. `compact` applies retention: threads
+    idle for `thread_ttl_seconds`, or beyond the `max_threads` most recently
+    active, are deleted, and each thread keeps its `keep_checkpoints` newest
+    checkpoints, with any delta that would lose its base folded into a
+    snapshot. The writer thread compacts every `compact_interval` seconds when
+    a retention limit is set.
+
+    The latest checkpoint of the `cache_size` most recently written threads is
+    also kept in memory, so resuming a hot thread is answered without touching
+    SQLite (or waiting for its write to commit). The async methods used by
+    `ainvoke` serve those hits inline and run misses on a small dedicated reader
+    pool, leaving disk writes to the writer thread.
+    """
+    def __init__(
+        self,
+        path: str,
+        flush_interval: float = 0.05,
+        batch_size: int = 256,
+        serde: Any = None,
+        max_delta_chain: int = 32,
+        keep_checkpoints: Optional[int] = None,
+        thread_ttl_seconds: Optional[float] = None,
+        max_threads: Optional[int] = None,
+        compact_interval: float = 300.0,
+        cache_size: int = 1024,
+        reader_threads: int = 4,
+    ) -> None:
+        super().__init__(serde=serde)
+        self.path = Path(path)
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_delta_chain = max_delta_chain
+        self.keep_checkpoints = keep_checkpoints
+        self.thread_ttl_seconds = thread_ttl_seconds
+        self.max_threads = max_threads
+        self.compact_interval = compact_interval
+        self.cache_size = cache_size
+
+        self.batches_written: int = 0
+        self.rows_written: int = 0
+        self.snapshots_written: int = 0
+        self.deltas_written: int = 0
+        self.compactions: int = 0
+        self.threads_pruned: int = 0
+        self.checkpoints_pruned: int = 0
+        self.deltas_folded: int = 0
+        self.cache_hits: int = 0
+        self.cache_misses: int = 0
+
+        # Write-behind cache of each thread's latest checkpoint, also diffed against by the next put
+        self._latest: "OrderedDict[ThreadKey, _LatestCheckpoint]" = OrderedDict()
+        self._reader = ThreadPoolExecutor(max_workers=reader_threads, thread_name_prefix="flux-checkpoint-reader")
+
+        self._pending_checkpoints: Dict[CheckpointKey, tuple] = {}
+        self._pending_writes: Dict[WriteKey, Tuple[bool, tuple]] = {}
+        self._lock = threading.Lock()
+        # Serializes flushes so batches commit in the order they were taken
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._writer: Optional[threading.Thread] = None
+        self._local = threading.local()
+        self._initialize_schema()
+
+    @property
+    def pending_rows(self) -> int:
+        return len(self._pending_checkpoints) + len(self._pending_writes)
+
+    # ------------------------------------------------------
+    # LangGraph Interface
+    # ------------------------------------------------------
+    def get_tuple(self, config: Dict[str, Any]) -> Optional[CheckpointTuple]:
+        """
+        The checkpoint named by `config`, or the latest one of its thread.
+        """
+        cached = self._cached_tuple(config)
+        if cached is not None:
+            return cached
+        return self._read_tuple(config)
+
+    async def aget_tuple(self, config: Dict[str, Any]) -> Optional[CheckpointTuple]:
+        """
+        Async `get_tuple`: cache hits return inline, misses are read on the reader pool.
+        """
+        cached = self._cached_tuple(config)
+        if cached is not None:
+            return cached
+        return await asyncio.get_running_loop().run_in_executor(self._reader, self._read_tuple, config)
+
+    def _read_tuple(self, config: Dict[str, Any]) -> Optional[CheckpointTuple]:
+        self.flush()
+        configurable = config["configurable"]
+        thread_id = str(configurable["thread_id"])
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        checkpoint_id = configurable.get("checkpoint_id")
+
+        connection = self._connection()
+        if checkpoint_id:
+            row = connection.execute(
+                f"{self._SELECT} WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                (thread_id, checkpoint_ns, checkpoint_id),
+            ).fetchone()
+        else:
+            row = connection.execute(
+                f"{self._SELECT} WHERE thread_id = ? AND checkpoint_ns = ? ORDER BY checkpoint_id DESC LIMIT 1",
+                (thread_id, checkpoint_ns),
+            ).fetchone()
+        return self._to_tuple(connection, row) if row else None
+
+    def list(
+        self,
+        config: Optional[Dict[str, Any]],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        """
+        Checkpoints matching `config`, newest first.
+        """
+        self.flush()
+        clauses, params = [], []
+        if config is not None:
+            configurable = config["configurable"]
+            clauses.append("thread_id = ?")
+            params.append(str(configurable["thread_id"]))
+            if configurable.get("checkpoint_ns") is not None:
+                clauses.append("checkpoint_ns = ?")
+                params.append(configurable["checkpoint_ns"])
+            if configurable.get("checkpoint_id"):
+                clauses.append("checkpoint_id = ?")
+                params.append(configurable["checkpoint_id"])
+        if before is not None:
+            clauses.append("checkpoint_id < ?")
+            params.append(before["configurable"]["checkpoint_id"])
+
+        query = self._SELECT
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY checkpoint_id DESC"
+
+        connection = self._connection()
+        returned = 0
+        for row in connection.execute(query, params).fetchall():
+            checkpoint_tuple = self._to_tuple(connection, row)
+            if checkpoint_tuple is None:
+                continue
+            if filter and any(checkpoint_tuple.metadata.get(key) != value for key, value in filter.items()):
+                continue
+            yield checkpoint_tuple
+            returned += 1
+            if limit is not None and returned >= limit:
+                return
+
+    async def alist(
+        self,
+        config: Optional[Dict[str, Any]],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        """
+        Async `list`, read in full on the reader pool.
+        """
+        items = await asyncio.get_running_loop().run_in_executor(
+            self._reader, lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for item in items:
+            yield item
+
+    def put(
+        self,
+        config: Dict[str, Any],
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> Dict[str, Any]:
+        """
+        Queue a checkpoint for the next group commit and return its config.
+        """
+        configurable = config["configurable"]
+        thread_id = str(configurable["thread_id"])
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        parent_id = configurable.get("checkpoint_id")
+        kind, depth, payload = self._encode((thread_id, checkpoint_ns), parent_id, checkpoint)
+        self._remember(
+            (thread_id, checkpoint_ns),
+            _LatestCheckpoint(checkpoint["id"], _copy_checkpoint(checkpoint), dict(metadata), parent_id, depth),
+        )
+        type_, data = self.serde.dumps_typed(payload)
+        metadata_type, metadata_data = self.serde.dumps_typed(dict(metadata))
+        row = (
+            thread_id,
+            checkpoint_ns,
+            checkpoint["id"],
+            parent_id,
+            kind,
+            depth,
+            type_,
+            sqlite3.Binary(data),
+            metadata_type,
+            sqlite3.Binary(metadata_data),
+            time.time(),
+        )
+        with self._lock:
+            self._pending_checkpoints[(thread_id, checkpoint_ns, checkpoint["id"])] = row
+            if kind == "delta":
+                self.deltas_written += 1
+            else:
+                self.snapshots_written += 1
+        self._after_enqueue()
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    async def aput(
+        self,
+        config: Dict[str, Any],
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> Dict[str, Any]:
+        """
+        Async `put`. Only queues the row, so it runs inline.
+        """
+        return self.put(config, checkpoint, metadata, new_versions)
+
+    def put_writes(
+        self,
+        config: Dict[str, Any],
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """
+        Queue intermediate writes linked to a checkpoint for the next group commit.
+        """
+        configurable = config["configurable"]
+        thread_id = str(configurable["thread_id"])
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        checkpoint_id = configurable["checkpoint_id"]
+        # Special channels (errors, interrupts) overwrite; ordinary writes keep the first value
+        replace = all(channel in WRITES_IDX_MAP for channel, _ in writes)
+        with self._lock:
+            latest = self._latest.get((thread_id, checkpoint_ns))
+            if latest is not None and latest.checkpoint_id != checkpoint_id:
+                latest = None
+            for index, (channel, value) in enumerate(writes):
+                idx = WRITES_IDX_MAP.get(channel, index)
+                key = (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+                if not replace and key in self._pending_writes:
+                    continue
+                if latest is not None and (replace or (task_id, idx) not in latest.writes):
+                    latest.writes[(task_id, idx)] = (task_id, channel, value)
+                type_, data = self.serde.dumps_typed(value)
+                self._pending_writes[key] = (replace, key + (channel, type_, sqlite3.Binary(data)))
+        self._after_enqueue()
+
+    async def aput_writes(
+        self,
+        config: Dict[str, Any],
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """
+        Async `put_writes`. Only queues the rows, so it runs inline.
+        """
+        self.put_writes(config, writes, task_id, task_path)
+
+    # ------------------------------------------------------
+    # Group Commit
+    # ------------------------------------------------------
+    def flush(self) -> None:
+        """
+        Commit all pending rows in one transaction on the calling thread.
+        """
+        with self._flush_lock:
+            with self._lock:
+                checkpoints, self._pending_checkpoints = self._pending_checkpoints, {}
+                writes, self._pending_writes = self._pending_writes, {}
+            if not checkpoints and not writes:
+                return
+
+            replaced = [row for replace, row in writes.values() if replace]
+            kept = [row for replace, row in writes.values() if not replace]
+            connection = self._connection()
+            try:
+                with connection:
+                    connection.executemany(
+                        """
+                        INSERT OR REPLACE INTO thread_checkpoints (
+                            thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, kind, depth,
+                            type, checkpoint, metadata_type, metadata, created_at
+                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                        """,
+                        list(checkpoints.values()),
+                    )
+                    connection.executemany(f"INSERT OR REPLACE {self._INSERT_WRITE}", replaced)
+                    connection.executemany(f"INSERT OR IGNORE {self._INSERT_WRITE}", kept)
+            except Exception:
+                # Put the batch back unless a newer version arrived meanwhile
+                with self._lock:
+                    for key, row in checkpoints.items():
+                        self._pending_checkpoints.setdefault(key, row)
+                    for key, entry in writes.items():
+                        self._pending_writes.setdefault(key, entry)
+                raise
+            self.batches_written += 1
+            self.rows_written += len(checkpoints) + len(writes)
+
+    def compact(self) -> Dict[str, int]:
+        """
+        Apply thread TTL, thread count and per-thread history retention, folding
+        retained deltas whose base is removed into snapshots.
+        """
+        self.flush()
+        pruned_threads: List[str] = []
+        folded = removed = 0
+        with self._flush_lock:
+            connection = self._connection()
+            threads = connection.execute(
+                "SELECT thread_id, MAX(created_at) FROM thread_checkpoints GROUP BY thread_id ORDER BY 2 DESC"
+            ).fetchall()
+            expired_before = time.time() - self.thread_ttl_seconds if self.thread_ttl_seconds else None
+            for index, (thread_id, last_written) in enumerate(threads):
+                if (expired_before is not None and last_written < expired_before) or (
+                    self.max_threads and index >= self.max_threads
+                ):
+                    pruned_threads.append(thread_id)
+
+            with connection:
+                for thread_id in pruned_threads:
+                    connection.execute("DELETE FROM thread_checkpoints WHERE thread_id = ?", (thread_id,))
+                    connection.execute("DELETE FROM checkpoint_writes WHERE thread_id = ?", (thread_id,))
+                if self.keep_checkpoints:
+                    long_threads = connection.execute(
+                        """
+                        SELECT thread_id, checkpoint_ns FROM thread_checkpoints
+                        GROUP BY thread_id, checkpoint_ns HAVING COUNT(*) > ?
+                        """,
+                        (self.keep_checkpoints,),
+                    ).fetchall()
+                    for thread_id, checkpoint_ns in long_threads:
+                        thread_folded, thread_removed = self._trim_thread(connection, thread_id, checkpoint_ns)
+                        folded += thread_folded
+                        removed += thread_removed
+
+        if pruned_threads:
+            pruned = set(pruned_threads)
+            with self._lock:
+                for key in [key for key in self._latest if key[0] in pruned]:
+                    del self._latest[key]
+
+        self.compactions += 1
+        self.threads_pruned += len(pruned_threads)
+        self.checkpoints_pruned += removed
+        self.deltas_folded += folded
+        result = {"threads_pruned": len(pruned_threads), "checkpoints_pruned": removed, "deltas_folded": folded}
+        if pruned_threads or removed:
+            logger.info(f"Compacted checkpoints: {result}")
+        return result
+
+    def stop(self) -> None:
+        """
+        Flush pending rows and stop the writer and reader threads.
+        """
+        self._reader.shutdown(wait=False)
+        if self._writer is None:
+            return
+
+        self._stopping.set()
+        self._wakeup.set()
+        self._writer.join()
+        self._writer = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Describe writer state for JSON responses.
+        """
+        return {
+            "path": str(self.path),
+            "pending_rows": self.pending_rows,
+            "batches_written": self.batches_written,
+            "rows_written": self.rows_written,
+            "snapshots_written": self.snapshots_written,
+            "deltas_written": self.deltas_written,
+            "compactions": self.compactions,
+            "threads_pruned": self.threads_pruned,
+            "checkpoints_pruned": self.checkpoints_pruned,
+            "deltas_folded": self.deltas_folded,
+            "cached_threads": len(self._latest),
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+        }
+
+    _SELECT = """
+        SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id,
+               kind, type, checkpoint, metadata_type, metadata
+        FROM thread_checkpoints
+    """
+
+    _INSERT_WRITE = """
+        INTO checkpoint_writes (
+            thread_id, checkpoint_ns, checkpoint_id, task_id, idx, channel, type, value
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
+    def _encode(self, thread: ThreadKey, parent_id: Optional[str], checkpoint: Checkpoint) -> Tuple[str, int, Any]:
+        """
+        The kind ("snapshot" or "delta"), delta depth and payload to store for a checkpoint.
+        """
+        values = checkpoint["channel_values"]
+        with self._lock:
+            parent = self._latest.get(thread)
+
+        appended = {}
+        depth = 0
+        if parent is not None and parent_id is not None and parent.checkpoint_id == parent_id \
+                and parent.depth < self.max_delta_chain:
+            parent_values = parent.checkpoint["channel_values"]
+            for channel, value in values.items():
+                base = parent_values.get(channel)
+                if not isinstance(value, list) or not isinstance(base, list) or len(value) < len(base):
+                    continue
+                if all(old is new or old == new for old, new in zip(base, value)):
+                    appended[channel] = value[len(base):]
+            if appended:
+                depth = parent.depth + 1
+
+        if not appended:
+            return "snapshot", 0, checkpoint
+        delta = {
+            **checkpoint,
+            "channel_values": {channel: value for channel, value in values.items() if channel not in appended},
+        }
+        return "delta", depth, {"checkpoint": delta, "appended": appended}
+
+    def _remember(self, thread: ThreadKey, latest: _LatestCheckpoint) -> None:
+        with self._lock:
+            self._latest[thread] = latest
+            self._latest.move_to_end(thread)
+            while len(self._latest) > self.cache_size:
+                self._latest.popitem(last=False)
+
+    def _cached_tuple(self, config: Dict[str, Any]) -> Optional[CheckpointTuple]:
+        """
+        The checkpoint named by `config` if it is its thread's cached latest one.
+        """
+        configurable = config["configurable"]
+        thread_id = str(configurable["thread_id"])
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        checkpoint_id = configurable.get("checkpoint_id")
+        with self._lock:
+            latest = self._latest.get((thread_id, checkpoint_ns))
+            if latest is None or (checkpoint_id and checkpoint_id != latest.checkpoint_id):
+                self.cache_misses += 1
+                return None
+            self.cache_hits += 1
+            self._latest.move_to_end((thread_id, checkpoint_ns))
+            writes = [latest.writes[key] for key in sorted(latest.writes)]
+
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": latest.checkpoint_id,
+                }
+            },
+            checkpoint=_copy_checkpoint(latest.checkpoint),
+            metadata=dict(latest.metadata),
+            parent_config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": latest.parent_id,
+                }
+            } if latest.parent_id else None,
+            pending_writes=writes,
+        )
+
+    def _load_checkpoint(self, connection: sqlite3.Connection, row: tuple) -> Optional[Checkpoint]:
+        """
+        Decode a checkpoint row, replaying deltas onto their nearest snapshot.
+        """
+        thread_id, checkpoint_ns, checkpoint_id, parent_id, kind, type_, data = row[:7]
+        deltas = []
+        while kind == "delta":
+            deltas.append(self.serde.loads_typed((type_, data)))
+            base = connection.execute(
+                """
+                SELECT parent_checkpoint_id, kind, type, checkpoint FROM thread_checkpoints
+                WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?
+                """,
+                (thread_id, checkpoint_ns, parent_id),
+            ).fetchone()
+            if base is None:
+                logger.warning(f"Checkpoint {checkpoint_id} of thread {thread_id} lost its base {parent_id}")
+                return None
+            parent_id, kind, type_, data = base
+
+        checkpoint = self.serde.loads_typed((type_, data))
+        for delta in reversed(deltas):
+            values = dict(delta["checkpoint"]["channel_values"])
+            for channel, items in delta["appended"].items():
+                values[channel] = list(checkpoint["channel_values"].get(channel, [])) + list(items)
+            checkpoint = {**delta["checkpoint"], "channel_values": values}
+        return checkpoint
+
+    def _trim_thread(self, connection: sqlite3.Connection, thread_id: str, checkpoint_ns: str) -> Tuple[int, int]:
+        """
+        Keep the newest `keep_checkpoints` checkpoints of a thread, returning how
+        many deltas were folded into snapshots and how many checkpoints were removed.
+        """
+        cutoff = connection.execute(
+            """
+            SELECT checkpoint_id FROM thread_checkpoints
+            WHERE thread_id = ? AND checkpoint_ns = ? ORDER BY checkpoint_id DESC LIMIT 1 OFFSET ?
+            """,
+            (thread_id, checkpoint_ns, self.keep_checkpoints - 1),
+        ).fetchone()[0]
+
+        orphans = connection.execute(
+            f"""{self._SELECT}
+            WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id >= ?
+              AND kind = 'delta' AND parent_checkpoint_id < ?
+            """,
+            (thread_id, checkpoint_ns, cutoff, cutoff),
+        ).fetchall()
+        folded = 0
+        for row in orphans:
+            checkpoint = self._load_checkpoint(connection, row)
+            if checkpoint is None:
+                continue
+            type_, data = self.serde.dumps_typed(checkpoint)
+            connection.execute(
+                """
+                UPDATE thread_checkpoints SET kind = 'snapshot', depth = 0, type = ?, checkpoint = ?
+                WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?
+                """,
+                (type_, sqlite3.Binary(data), thread_id, checkpoint_ns, row[2]),
+            )
+            folded += 1
+
+        removed = connection.execute(
+            "DELETE FROM thread_checkpoints WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id < ?",
+            (thread_id, checkpoint_ns, cutoff),
+        ).rowcount
+        connection.execute(
+            "DELETE FROM checkpoint_writes WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id < ?",
+            (thread_id, checkpoint_ns, cutoff),
+        )
+        return folded, removed
+
+    def _to_tuple(self, connection: sqlite3.Connection, row: tuple) -> Optional[CheckpointTuple]:
+        checkpoint = self._load_checkpoint(connection, row)
+        if checkpoint is None:
+            return None
+        thread_id, checkpoint_ns, checkpoint_id, parent_id = row[:4]
+        metadata_type, metadata = row[7:]
+        writes = connection.execute(
+            """
+            SELECT task_id, channel, type, value FROM checkpoint_writes
+            WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?
+            ORDER BY task_id, idx
+            """,
+            (thread_id, checkpoint_ns, checkpoint_id),
+        ).fetchall()
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            },
+            checkpoint=checkpoint,
+            metadata=self.serde.loads_typed((metadata_type, metadata)),
+            parent_config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": parent_id,
+                }
+            } if parent_id else None,
+            pending_writes=[
+                (task_id, channel, self.serde.loads_typed((value_type, value)))
+                for task_id, channel, value_type, value in writes
+            ],
+        )
+
+    def _after_enqueue(self) -> None:
+        if self._writer is None:
+            self._start_writer()
+        if self.pending_rows >= self.batch_size:
+            self._wakeup.set()
+
+    def _start_writer(self) -> None:
+        with self._lock:
+            if self._writer is not None:
+                return
+            self._stopping.clear()
+            self._writer = threading.Thread(target=self._run_writer, name="flux-checkpoint-writer", daemon=True)
+            self._writer.start()
+        atexit.register(self.stop)
+
+    def _run_writer(self) -> None:
+        retention = self.keep_checkpoints or self.thread_ttl_seconds or self.max_threads
+        last_compaction = time.monotonic()
+        while not self._stopping.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+                if retention and time.monotonic() - last_compaction >= self.compact_interval:
+                    last_compaction = time.monotonic()
+                    self.compact()
+            except Exception as exc:
+                logger.error(f"Failed to write checkpoints: {exc}")
+        self.flush()
+
+    def _initialize_schema(self) -> None:
+        connection = self._connection()
+        with connection:
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS thread_checkpoints (
+                    thread_id TEXT NOT NULL,
+                    checkpoint_ns TEXT NOT NULL DEFAULT '',
+                    checkpoint_id TEXT NOT NULL,
+                    parent_checkpoint_id TEXT,
+                    kind TEXT NOT NULL DEFAULT 'snapshot',
+                    depth INTEGER NOT NULL DEFAULT 0,
+                    type TEXT,
+                    checkpoint BLOB NOT NULL,
+                    metadata_type TEXT,
+                    metadata BLOB,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+                ) WITHOUT ROWID
+            """)
+            columns = {row[1] for row in connection.execute("PRAGMA table_info(thread_checkpoints)")}
+            if "kind" not in columns:
+                connection.execute("ALTER TABLE thread_checkpoints ADD COLUMN kind TEXT NOT NULL DEFAULT 'snapshot'")
+                connection.execute("ALTER TABLE thread_checkpoints ADD COLUMN depth INTEGER NOT NULL DEFAULT 0")
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_thread_checkpoints_created ON thread_checkpoints (created_at)"
+            )
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS checkpoint_writes (
+                    thread_id TEXT NOT NULL,
+                    checkpoint_ns TEXT NOT NULL DEFAULT '',
+                    checkpoint_id TEXT NOT NULL,
+                    task_id TEXT NOT NULL,
+                    idx INTEGER NOT NULL,
+                    channel TEXT NOT NULL,
+                    type TEXT,
+                    value BLOB,
+                    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+                ) WITHOUT ROWID
+            """)
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(str(self.path))
+            connection.execute("PRAGMA journal_mode=WAL")
+            # In WAL mode NORMAL syncs at WAL checkpoints instead of on every commit
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("PRAGMA busy_timeout=5000")
+            self._local.connection = connection
+        return connection
+
+def _copy_checkpoint(checkpoint: Checkpoint) -> Checkpoint:
+    """
+    A copy of `checkpoint` whose channel values and list channels can be
+    changed without touching the original.
+    """
+    return {
+        **checkpoint,
+        "channel_values": {
+            channel: list(value) if isinstance(value, list) else value
+            for channel, value in checkpoint["channel_values"].items()
+        },
+        "channel_versions": dict(checkpoint["channel_versions"]),
+        "versions_seen": {node: dict(versions) for node, versions in checkpoint["versions_seen"].items()},
+    }
@@ -1,40 +1,255 @@
+import logging
 import os
+import threading
+from typing import Any, Dict, Optional, Sequence, Tuple
 from dotenv import load_dotenv
 
-# Import LangChain chat models
-from langchain_openai import ChatOpenAI
-from langchain_anthropic import ChatAnthropic
+from browser_pool import BrowserPool
+from model_factory import SUPPORTED_MODEL_PROVIDERS, ModelFactory
+from provider_limiter import ProviderLimiter
+from response_cache import ResponseCache
+from web_fetch import DEFAULT_HEADERS, PageFetcher
 
 # Load environment variables from a .env file if present
 load_dotenv()
 
+logger = logging.getLogger("flux.config")
+
+def _parse_provider_concurrency(value: str) -> Dict[str, int]:
+    """
+    Parse "OPENAI=8,ANTHROPIC=4" into per-provider limits, skipping malformed
+    or non-positive entries.
+    """
+    limits = {}
+    for entry in value.split(","):
+        if not entry.strip():
+            continue
+        provider, separator, limit = entry.partition("=")
+        try:
+            if not separator or not provider.strip() or int(limit) <= 0:
+                raise ValueError(entry)
+            limits[provider.strip().upper()] = int(limit)
+        except ValueError:
+            logger.warning(f"Ignoring malformed LLM_PROVIDER_CONCURRENCY entry {entry!r}")
+    return limits
+
 # -------------------------------------------------------------------
 # Configuration & Defaults
 # -------------------------------------------------------------------
-default_model_temperature = int(os.getenv("DEFAULT_MODEL_TEMPERATURE", "0"))
+default_model_temperature = float(os.getenv("DEFAULT_MODEL_TEMPERATURE", "0"))
 default_model_provider = os.getenv("DEFAULT_MODEL_PROVIDER", "OPENAI").upper()
 default_model_name = os.getenv("DEFAULT_MODEL_NAME", "gpt-4")
 
+# Connection pool shared by every OpenAI-compatible client
+llm_max_connections = int(os.getenv("LLM_MAX_CONNECTIONS", "100"))
+llm_max_keepalive_connections = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "20"))
+
+# Concurrent in-flight requests allowed per provider ("OPENAI=8,ANTHROPIC=4"); unset means 16
+llm_provider_concurrency = _parse_provider_concurrency(os.getenv("LLM_PROVIDER_CONCURRENCY", ""))
+
+# Model response cache, used for temperature 0 calls (RESPONSE_CACHE_SIZE=0 disables it)
+response_cache_size = int(os.getenv("RESPONSE_CACHE_SIZE", "1024"))
+response_cache_ttl_seconds = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "3600"))
+response_cache_db_path = os.getenv("RESPONSE_CACHE_DB_PATH", "")
+response_cache_semantic = os.getenv("RESPONSE_CACHE_SEMANTIC", "false").lower() in ("1", "true", "yes")
+response_cache_similarity = float(os.getenv("RESPONSE_CACHE_SIMILARITY", "0.95"))
+response_cache_embedding_model = os.getenv("RESPONSE_CACHE_EMBEDDING_MODEL", "text-embedding-3-small")
+
+# Headless browsers shared by the web page tools
+browser_pool_size = int(os.getenv("BROWSER_POOL_SIZE", "2"))
+browser_max_pages = int(os.getenv("BROWSER_MAX_PAGES", "50"))
+browser_page_timeout_seconds = float(os.getenv("BROWSER_PAGE_TIMEOUT_SECONDS", "30"))
+browser_checkout_timeout_seconds = float(os.getenv("BROWSER_CHECKOUT_TIMEOUT_SECONDS", "60"))
+
+# Web page fetching: "auto" tries plain HTTP and only uses a browser for script-rendered pages
+web_fetch_mode = os.getenv("WEB_FETCH_MODE", "auto").lower()
+web_fetch_timeout_seconds = float(os.getenv("WEB_FETCH_TIMEOUT_SECONDS", "10"))
+web_fetch_min_text_chars = int(os.getenv("WEB_FETCH_MIN_TEXT_CHARS", "200"))
+web_fetch_max_connections = int(os.getenv("WEB_FETCH_MAX_CONNECTIONS", "50"))
+
+# -------------------------------------------------------------------
+# Shared HTTP Connection Pools
+# -------------------------------------------------------------------
+_http_clients: Optional[Tuple[Any, Any]] = None
+_http_lock = threading.Lock()
+
+def get_http_clients() -> Tuple[Any, Any]:
+    """
+    The (sync, async) httpx clients shared by all OpenAI-compatible models, so
+    connections and TLS sessions are reused across agents.
+    """
+    global _http_clients
+    with _http_lock:
+        if _http_clients is None:
+            import httpx
+            limits = httpx.Limits(
+                max_connections=llm_max_connections,
+                max_keepalive_connections=llm_max_keepalive_connections,
+            )
+            timeout = httpx.Timeout(600.0, connect=10.0)
+            _http_clients = (
+                httpx.Client(limits=limits, timeout=timeout),
+                httpx.AsyncClient(limits=limits, timeout=timeout),
+            )
+        return _http_clients
+
+# -------------------------------------------------------------------
+# Model Factory & Per-Provider Concurrency Limits
 # -------------------------------------------------------------------
-# Choose a model based on provider
-# -------------------------------------------------------------------
-if default_model_provider == "OPENAI":
-    default_langchain_model = ChatOpenAI(
-        model_name=default_model_name,
-        temperature=default_model_temperature
-    )
-elif default_model_provider == "ANTHROPIC":
-    default_langchain_model = ChatAnthropic(
-        model_name=default_model_name,
-        temperature=default_model_temperature
-    )
-elif default_model_provider == "OLLAMA":
-    # OLLAMA is used as an example of a custom base. Provide a dummy key.
-    default_langchain_model = ChatOpenAI(
-        model_name=default_model_name,
-        temperature=default_model_temperature,
-        openai_api_key="ollama",  
-        openai_api_base="http://IPADDRESS:11434/v1",  # Replace with actual host if needed
-    )
-else:
-    raise ValueError(f"Unsupported model provider: {default_model_provider}")
+model_factory = ModelFactory(
+    default_model_provider,
+    default_model_name,
+    default_model_temperature,
+    get_http_clients,
+)
+
+def get_model(
+    provider: Optional[str] = None,
+    model_name: Optional[str] = None,
+    temperature: Optional[float] = None,
+    **kwargs: Any
+):
+    """
+    Return the shared chat model for these settings, building it on first use.
+    Unspecified settings fall back to the configured defaults.
+    """
+    return model_factory.get_model(provider, model_name, temperature, **kwargs)
+
+def get_tool_model(tools: Sequence[Any], provider: Optional[str] = None, **settings: Any):
+    """
+    Return the shared model bound to `tools`, binding once per distinct tool set
+    instead of on every reasoning step.
+    """
+    return model_factory.get_tool_model(tools, provider, **settings)
+
+def __getattr__(name):
+    # `config.default_langchain_model` is built on first access (PEP 562)
+    if name == "default_langchain_model":
+        return get_model()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+provider_limiters = {
+    provider: ProviderLimiter(llm_provider_concurrency.get(provider, 16))
+    for provider in SUPPORTED_MODEL_PROVIDERS
+}
+
+def llm_slot(provider: Optional[str] = None):
+    """
+    Context manager held around a model call; blocks while the provider is at
+    its concurrency limit.
+    """
+    return provider_limiters[(provider or default_model_provider).upper()].slot()
+
+def allm_slot(provider: Optional[str] = None):
+    """
+    Async context manager held around an awaited model call; waits without
+    blocking the event loop while the provider is at its concurrency limit.
+    """
+    return provider_limiters[(provider or default_model_provider).upper()].aslot()
+
+# -------------------------------------------------------------------
+# Response Cache
+# -------------------------------------------------------------------
+_response_cache: Optional[ResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """The process-wide model response cache, or None when caching is disabled"""
+    global _response_cache
+    if response_cache_size <= 0:
+        return None
+    with _response_cache_lock:
+        if _response_cache is None:
+            embed = None
+            if response_cache_semantic:
+                from langchain_openai import OpenAIEmbeddings
+                http_client, http_async_client = get_http_clients()
+                embed = OpenAIEmbeddings(
+                    model=response_cache_embedding_model,
+                    http_client=http_client,
+                    http_async_client=http_async_client,
+                ).embed_query
+            _response_cache = ResponseCache(
+                max_entries=response_cache_size,
+                ttl_seconds=response_cache_ttl_seconds,
+                db_path=response_cache_db_path or None,
+                embed=embed,
+                similarity_threshold=response_cache_similarity,
+            )
+        return _response_cache
+
+# -------------------------------------------------------------------
+# Browser Pool
+# -------------------------------------------------------------------
+_browser_pool: Optional[BrowserPool] = None
+_browser_pool_lock = threading.Lock()
+
+def get_browser_pool() -> BrowserPool:
+    """The process-wide pool of headless browsers used to fetch web pages"""
+    global _browser_pool
+    with _browser_pool_lock:
+        if _browser_pool is None:
+            _browser_pool = BrowserPool(
+                size=browser_pool_size,
+                max_pages=browser_max_pages,
+                page_timeout=browser_page_timeout_seconds,
+                checkout_timeout=browser_checkout_timeout_seconds,
+            )
+        return _browser_pool
+
+def close_browser_pool() -> None:
+    """Quit the pooled browsers, if any were started"""
+    if _browser_pool is not None:
+        _browser_pool.close()
+
+def browser_stats() -> Optional[Dict[str, Any]]:
+    """Describe the browser pool for JSON responses, or None if it was never used"""
+    return _browser_pool.to_dict() if _browser_pool is not None else None
+
+# -------------------------------------------------------------------
+# Web Page Fetcher
+# -------------------------------------------------------------------
+_page_fetcher: Optional[PageFetcher] = None
+_page_fetcher_lock = threading.Lock()
+
+def get_page_fetcher() -> PageFetcher:
+    """
+    The process-wide page fetcher of the web tools. Its keep-alive HTTP clients
+    are separate from the model clients, with short timeouts and redirects
+    followed; the browser pool is only started if a page needs it.
+    """
+    global _page_fetcher
+    with _page_fetcher_lock:
+        if _page_fetcher is None:
+            import httpx
+            settings = dict(
+                headers=DEFAULT_HEADERS,
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=web_fetch_max_connections, max_keepalive_connections=20),
+                timeout=httpx.Timeout(web_fetch_timeout_seconds),
+            )
+            _page_fetcher = PageFetcher(
+                httpx.Client(**settings),
+                httpx.AsyncClient(**settings),
+                _LazyBrowserPool(),
+                mode=web_fetch_mode,
+                min_text_chars=web_fetch_min_text_chars,
+            )
+        return _page_fetcher
+
+class _LazyBrowserPool:
+    """Stands in for the browser pool so it is created on the first checkout"""
+    def checkout(self):
+        return get_browser_pool().checkout()
+
+def web_fetch_stats() -> Optional[Dict[str, Any]]:
+    """Describe the page fetcher for JSON responses, or None if it was never used"""
+    return _page_fetcher.to_dict() if _page_fetcher is not None else None
+
+def llm_stats() -> Dict[str, Any]:
+    """Describe model cache, response cache and provider limiter state for JSON responses"""
+    return {
+        **model_factory.to_dict(),
+        "providers": {name: limiter.to_dict() for name, limiter in provider_limiters.items()},
+        "response_cache": _response_cache.to_dict() if _response_cache is not None else None,
+    }
@@ -0,0 +1,202 @@
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple
+import asyncio
+import itertools
+import json
+import logging
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger("flux.events")
+
+Topic = Tuple[str, str]
+
+def encode_json(message: Any) -> str:
+    """
+    Encode a message as compact JSON text, using orjson when it is installed.
+    """
+    if orjson is not None:
+        return orjson.dumps(message, default=str).decode()
+    return json.dumps(message, separators=(",", ":"), default=str)
+
+def event_topics(data: Any) -> Set[Topic]:
+    """
+    Topics an event belongs to, derived from the task or agent fields of its data.
+    """
+    topics = set()
+    if not isinstance(data, dict):
+        return topics
+    task_id = data.get("task_id") or data.get("id")
+    if task_id:
+        topics.add(("task", str(task_id)))
+    if data.get("agent_id"):
+        topics.add(("agent", str(data["agent_id"])))
+    metadata = data.get("metadata")
+    if isinstance(metadata, dict):
+        topics.update(("tag", str(tag)) for tag in metadata.get("tags") or [])
+    return topics
+
+# ------------------------------------------------------
+# Event
+# ------------------------------------------------------
+class Event:
+    """
+    A published event. Its JSON payload is encoded at most once and shared by every
+    transport that delivers it.
+    """
+    __slots__ = ("id", "type", "data", "topics", "timestamp", "_payload")
+
+    def __init__(self, event_id: int, event_type: str, data: Any, topics: Set[Topic]) -> None:
+        self.id = event_id
+        self.type = event_type
+        self.data = data
+        self.topics = topics
+        self.timestamp = datetime.now().isoformat()
+        self._payload: Optional[str] = None
+
+    @property
+    def payload(self) -> str:
+        if self._payload is None:
+            self._payload = encode_json({
+                "id": self.id,
+                "type": self.type,
+                "data": self.data,
+                "timestamp": self.timestamp,
+            })
+        return self._payload
+
+    @property
+    def task_ids(self) -> List[str]:
+        return [value for kind, value in self.topics if kind == "task"]
+
+# ------------------------------------------------------
+# EventBus: Publish/Subscribe with Bounded Replay
+# ------------------------------------------------------
+class EventBus:
+    """
+    Fans published events out to subscriber callbacks and keeps recent events for
+    resumption.
+
+    Event ids increase monotonically. The bus keeps the last `history_size` events
+    overall and the last `task_history_size` events for each of the
+    `max_tracked_tasks` most recently active tasks, so a reconnecting client can
+    resume from its last seen id.
+    """
+    def __init__(self, history_size: int = 2048, task_history_size: int = 256, max_tracked_tasks: int = 1000) -> None:
+        self.task_history_size = task_history_size
+        self.max_tracked_tasks = max_tracked_tasks
+
+        self._ids = itertools.count(1)
+        self._history: Deque[Event] = deque(maxlen=history_size)
+        self._task_history: "OrderedDict[str, Deque[Event]]" = OrderedDict()
+        self._subscribers: List[Callable[[Event], None]] = []
+
+    @property
+    def last_event_id(self) -> int:
+        return self._history[-1].id if self._history else 0
+
+    def subscribe(self, callback: Callable[[Event], None]) -> None:
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[Event], None]) -> None:
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def publish(self, event_type: str, data: Any, topics: Optional[Iterable[Topic]] = None) -> Event:
+        """
+        Record an event and hand it to every subscriber. `topics` defaults to those
+        derived from the event data.
+        """
+        event = Event(next(self._ids), event_type, data, set(event_topics(data) if topics is None else topics))
+        self._history.append(event)
+        for task_id in event.task_ids:
+            history = self._task_history.get(task_id)
+            if history is None:
+                history = self._task_history[task_id] = deque(maxlen=self.task_history_size)
+                if len(self._task_history) > self.max_tracked_tasks:
+                    self._task_history.popitem(last=False)
+            else:
+                self._task_history.move_to_end(task_id)
+            history.append(event)
+
+        for callback in list(self._subscribers):
+            try:
+                callback(event)
+            except Exception as e:
+                logger.error(f"Event subscriber failed: {e}")
+        return event
+
+    def replay(self, after_id: int, task_id: Optional[str] = None) -> Tuple[List[Event], bool]:
+        """
+        Events newer than `after_id`, from the given task's buffer or the global one.
+
+        The flag is False when older events the caller has not seen were already
+        evicted, meaning the replay is incomplete.
+        """
+        if task_id is None:
+            history: Iterable[Event] = self._history
+        else:
+            history = self._task_history.get(task_id, ())
+
+        events = [event for event in history if event.id > after_id]
+        if task_id is None:
+            oldest = self._history[0].id if self._history else self.last_event_id + 1
+            complete = after_id >= oldest - 1
+        else:
+            # Per-task buffers are sparse in ids, so only a full or evicted buffer can have lost events
+            buffer = self._task_history.get(task_id)
+            complete = buffer is not None and (
+                len(buffer) < self.task_history_size or after_id >= buffer[0].id
+            )
+        return events, complete
+
+# ------------------------------------------------------
+# Server-Sent Events
+# ------------------------------------------------------
+def format_sse(event: Event) -> str:
+    """
+    Render an event as a Server-Sent Events frame carrying its id for resumption.
+    """
+    return f"id: {event.id}\nevent: {event.type}\ndata: {event.payload}\n\n"
+
+class EventSubscription:
+    """
+    A bounded queue of bus events matching `accept`, consumed by one streaming client.
+
+    If the client falls `max_queue` events behind, the subscription stops accepting
+    events and `get` returns None once the backlog is drained; the client is expected
+    to reconnect and resume from its last event id.
+    """
+    def __init__(self, bus: EventBus, accept: Callable[[Event], bool], max_queue: int = 256) -> None:
+        self.bus = bus
+        self.accept = accept
+        self.overflowed = False
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        bus.subscribe(self._on_event)
+
+    def _on_event(self, event: Event) -> None:
+        if self.overflowed or not self.accept(event):
+            return
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def get(self, timeout: float) -> Optional[Event]:
+        """
+        Next matching event, or None after `timeout` seconds or once an overflowed
+        subscription has been drained.
+        """
+        if self.overflowed and self._queue.empty():
+            return None
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self) -> None:
+        self.bus.unsubscribe(self._on_event)
@@ -1,25 +1,93 @@
-from dataclasses import dataclass, field
 from datetime import datetime
-from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 import asyncio
+import importlib.util
 import json
 import logging
 import os
+import time
 import uuid
 
-from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect, Response
+from fastapi import FastAPI, HTTPException, Query, Request, WebSocket, WebSocketDisconnect, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from starlette.websockets import WebSocketState
 import uvicorn
 from dotenv import load_dotenv
 
+import config
+from blob_store import BlobStore
+from event_bus import EventBus, EventSubscription, encode_json, format_sse
+from single_flight import Flight, SingleFlight, normalize_prompt
+from task_executor import QueueFullError, TaskExecutor
+from task_model import TASK_FIELD_VALUES, Task, TaskMetadata, TaskStatus
+from task_repository import TaskRepository
+from task_store import TaskStore, decode_cursor, encode_cursor
+from websocket_manager import DeltaBatcher, WebSocketManager
+
 # Load environment variables from .env file
 load_dotenv()
 
 # Get port from environment variable (for Railway)
 PORT = int(os.getenv("PORT", "8000"))
 
+# Task execution engine sizing
+TASK_WORKER_COUNT = int(os.getenv("TASK_WORKER_COUNT", "4"))
+TASK_MAX_QUEUE_DEPTH = int(os.getenv("TASK_MAX_QUEUE_DEPTH", "1000"))
+TASK_MAX_CONCURRENCY = int(os.getenv("TASK_MAX_CONCURRENCY", "8"))
+
+# Durable task storage (empty TASK_DB_PATH keeps tasks in memory only)
+TASK_DB_PATH = os.getenv("TASK_DB_PATH", "tasks.sqlite")
+TASK_DB_FLUSH_INTERVAL = float(os.getenv("TASK_DB_FLUSH_INTERVAL", "0.5"))
+
+# WebSocket backpressure: per-client queue size and what to do when it fills up
+# ("coalesce", "drop_oldest" or "disconnect")
+WS_SEND_QUEUE_SIZE = int(os.getenv("WS_SEND_QUEUE_SIZE", "256"))
+WS_SLOW_CONSUMER_POLICY = os.getenv("WS_SLOW_CONSUMER_POLICY", "coalesce")
+
+# Event replay for Server-Sent Events resumption, and SSE keepalive interval
+EVENT_HISTORY_SIZE = int(os.getenv("EVENT_HISTORY_SIZE", "2048"))
+EVENT_TASK_HISTORY_SIZE = int(os.getenv("EVENT_TASK_HISTORY_SIZE", "256"))
+SSE_KEEPALIVE_SECONDS = float(os.getenv("SSE_KEEPALIVE_SECONDS", "15"))
+
+# Stream agent output as batched task_delta events, flushed at most once per window
+TASK_STREAMING = os.getenv("TASK_STREAMING", "true").lower() in ("1", "true", "yes")
+TASK_STREAM_WINDOW_MS = int(os.getenv("TASK_STREAM_WINDOW_MS", "100"))
+
+# Results larger than TASK_RESULT_INLINE_BYTES are offloaded to a compressed blob store
+# under TASK_RESULT_DIR (empty keeps every result inline) and replaced by a preview
+TASK_RESULT_DIR = os.getenv("TASK_RESULT_DIR", "task_results")
+TASK_RESULT_INLINE_BYTES = int(os.getenv("TASK_RESULT_INLINE_BYTES", "8192"))
+TASK_RESULT_PREVIEW_CHARS = int(os.getenv("TASK_RESULT_PREVIEW_CHARS", "512"))
+
+# Largest number of tasks accepted by one POST /tasks/batch request
+TASK_BATCH_MAX_SIZE = int(os.getenv("TASK_BATCH_MAX_SIZE", "5000"))
+
+# Agents to import and build at startup instead of on first use ("gaia", "indra,pan" or "all")
+AGENT_WARMUP = [name.strip() for name in os.getenv("AGENT_WARMUP", "").split(",") if name.strip()]
+
+# Scheduling: seconds of waiting worth one priority level, and per-agent caps ("engineer=2,researcher=4")
+TASK_PRIORITY_AGING_SECONDS = float(os.getenv("TASK_PRIORITY_AGING_SECONDS", "30"))
+
+def _parse_agent_concurrency(value: str) -> Dict[str, int]:
+    """
+    Parse "engineer=2,researcher=4" into per-agent limits, skipping malformed entries.
+    """
+    limits = {}
+    for entry in value.split(","):
+        if not entry.strip():
+            continue
+        agent_id, separator, limit = entry.partition("=")
+        try:
+            if not separator or not agent_id.strip():
+                raise ValueError(entry)
+            limits[agent_id.strip()] = int(limit)
+        except ValueError:
+            logging.getLogger("flux.kernel").warning(f"Ignoring malformed TASK_AGENT_CONCURRENCY entry {entry!r}")
+    return limits
+
+TASK_AGENT_CONCURRENCY = _parse_agent_concurrency(os.getenv("TASK_AGENT_CONCURRENCY", ""))
+
 # ------------------------------------------------------
 # Configure Logging (Structured Format)
 # ------------------------------------------------------
@@ -29,69 +97,6 @@ logging.basicConfig(
 )
 logger = logging.getLogger("flux.kernel")
 
-# ------------------------------------------------------
-# WebSocket Manager
-# ------------------------------------------------------
-class WebSocketManager:
-    """
-    Manages active WebSocket connections and enables server-side broadcast to clients.
-    """
-    def __init__(self) -> None:
-        self.active_connections: List[WebSocket] = []
-
-    async def connect(self, websocket: WebSocket) -> None:
-        """
-        Accept and register a new WebSocket connection.
-        """
-        await websocket.accept()
-        self.active_connections.append(websocket)
-        logger.info(f"WebSocket connected. Total active connections: {len(self.active_connections)}")
-
-    def disconnect(self, websocket: WebSocket) -> None:
-        """
-        Unregister a WebSocket connection.
-        """
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
-            logger.info(f"WebSocket disconnected. Remaining connections: {len(self.active_connections)}")
-
-    async def broadcast(self, event_type: str, data: Any) -> None:
-        """
-        Broadcast a JSON message to all connected clients.
-        """
-        message = {
-            "type": event_type,
-            "data": data,
-            "timestamp": datetime.now().isoformat()
-        }
-        
-        disconnected = []
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(message)
-            except Exception as e:
-                logger.error(f"Failed to send message to client: {e}")
-                disconnected.append(connection)
-        
-        # Clean up disconnected clients
-        for connection in disconnected:
-            self.disconnect(connection)
-
-    async def broadcast_agent_activity(self, agent_id: str, activity: str, details: Dict[str, Any] = None) -> None:
-        await self.broadcast("agent_activity", {
-            "agent_id": agent_id,
-            "activity": activity,
-            "details": details or {},
-        })
-
-    async def broadcast_task_progress(self, task_id: str, progress: float, status: str, current_action: str = None) -> None:
-        await self.broadcast("task_progress", {
-            "task_id": task_id,
-            "progress": progress,
-            "status": status,
-            "current_action": current_action,
-        })
-
 # ------------------------------------------------------
 # FastAPI App Configuration
 # ------------------------------------------------------
@@ -128,8 +133,9 @@ app.add_middleware(
     max_age=3600,  # Cache preflight requests for 1 hour
 )
 
-# WebSocket Manager instance
-ws_manager = WebSocketManager()
+# Event bus shared by WebSocket and Server-Sent Events delivery
+event_bus = EventBus(history_size=EVENT_HISTORY_SIZE, task_history_size=EVENT_TASK_HISTORY_SIZE)
+ws_manager = WebSocketManager(max_queue=WS_SEND_QUEUE_SIZE, policy=WS_SLOW_CONSUMER_POLICY, bus=event_bus)
 
 @app.on_event("startup")
 async def startup_event():
@@ -145,82 +151,159 @@ async def startup_event():
     logger.info(f"OpenAI API Key present: {openai_key}")
     logger.info(f"Anthropic API Key present: {anthropic_key}")
 
+    kernel.executor.start()
+    if kernel.repository is not None:
+        await asyncio.get_running_loop().run_in_executor(None, kernel.repository.start)
+        asyncio.create_task(kernel.warm_tasks())
+    if AGENT_WARMUP:
+        asyncio.create_task(kernel.warm_agents(AGENT_WARMUP))
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background task workers, flush pending task writes and quit pooled browsers"""
+    await kernel.executor.stop()
+    if kernel.repository is not None:
+        await asyncio.get_running_loop().run_in_executor(None, kernel.repository.stop)
+    await asyncio.get_running_loop().run_in_executor(None, config.close_browser_pool)
+
 # ------------------------------------------------------
-# Attempt Dynamic Agent Import
+# Lazy Agent Import
 # ------------------------------------------------------
-if os.getenv("OPENAI_API_KEY"):
-    try:
-        from agents.gaia import gaia
-        GAIA_AVAILABLE = True
-        logger.info("Successfully imported Gaia agent")
-    except ImportError as e:
-        GAIA_AVAILABLE = False
-        logger.error(f"Unable to import 'gaia' agent: {str(e)}")
-        logger.warning("Task processing features may be limited.")
-else:
+# Gaia and its model client are imported on first use (or by the AGENT_WARMUP
+# hook), so the kernel serves /health without paying for LangChain imports.
+gaia = None
+
+if not os.getenv("OPENAI_API_KEY"):
     GAIA_AVAILABLE = False
     logger.warning("OpenAI API key not found - agent features disabled")
+elif importlib.util.find_spec("langchain_openai") is None:
+    GAIA_AVAILABLE = False
+    logger.error("Unable to import 'gaia' agent: langchain_openai is not installed")
+    logger.warning("Task processing features may be limited.")
+else:
+    GAIA_AVAILABLE = True
 
-# ------------------------------------------------------
-# Enum Definitions
-# ------------------------------------------------------
-class TaskStatus(str, Enum):
+def load_gaia():
+    """Import the Gaia agent on first use"""
+    global gaia
+    if gaia is None:
+        from agents.gaia import gaia as agent
+        gaia = agent
+        logger.info("Successfully imported Gaia agent")
+    return gaia
+
+def _warm_up_agents(names: List[str]) -> None:
+    import agents
+    agents.warm_up(None if "all" in names else names)
+    if GAIA_AVAILABLE and ("all" in names or "gaia" in names):
+        load_gaia()
+
+def task_topics(task: Task) -> Set[Tuple[str, str]]:
     """
-    Describes the different stages a task can be in.
+    WebSocket subscription topics that events about a task are delivered to.
     """
-    PENDING = "pending"
-    IN_PROGRESS = "in_progress"
-    COMPLETED = "completed"
-    FAILED = "failed"
+    topics = {("task", task.id), ("agent", task.agent_id)}
+    topics.update(("tag", tag) for tag in task.metadata.tags)
+    return topics
 
-# ------------------------------------------------------
-# Data Classes
-# ------------------------------------------------------
-@dataclass
-class TaskMetadata:
+def _resume_from(request: Request, last_event_id: Optional[int]) -> Optional[int]:
     """
-    Metadata for tracking additional information about a task.
+    Event id an SSE client wants to resume after, from the Last-Event-ID header or query.
     """
-    client_info: str
-    source: str = "api"
-    tags: List[str] = field(default_factory=list)
+    header = request.headers.get("last-event-id")
+    if header:
+        try:
+            return int(header)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Last-Event-ID must be an integer")
+    return last_event_id
 
-@dataclass
-class Task:
+async def _read_task_batch(request: Request) -> List[Any]:
     """
-    The core representation of a Task within the Flux AI system.
+    Read task payloads from a JSON array (or {"tasks": [...]}) body, or from an
+    NDJSON body with one payload per line, parsed as the body streams in.
     """
-    id: str
-    description: str
-    status: TaskStatus
-    agent_id: str
-    priority: int
-    created_at: datetime
-    updated_at: datetime
-    result: Optional[str] = None
-    metadata: TaskMetadata = field(default_factory=TaskMetadata)
-    archived: bool = False
+    content_type = request.headers.get("content-type", "")
+    if "ndjson" in content_type or "jsonl" in content_type:
+        payloads = []
+        pending = b""
+        line_number = 0
 
-    def to_dict(self) -> Dict[str, Any]:
-        """
-        Convert the Task object into a dictionary for JSON serialization.
-        """
-        return {
-            "id": self.id,
-            "description": self.description,
-            "status": self.status,
-            "result": self.result,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat(),
-            "agent_id": self.agent_id,
-            "priority": self.priority,
-            "metadata": {
-                "client_info": self.metadata.client_info,
-                "source": self.metadata.source,
-                "tags": self.metadata.tags
-            },
-            "archived": self.archived
-        }
+        def parse(line: bytes) -> None:
+            nonlocal line_number
+            line_number += 1
+            if not line.strip():
+                return
+            if len(payloads) >= TASK_BATCH_MAX_SIZE:
+                raise HTTPException(status_code=413, detail=f"A batch holds at most {TASK_BATCH_MAX_SIZE} tasks")
+            try:
+                payloads.append(json.loads(line))
+            except ValueError:
+                raise HTTPException(status_code=400, detail=f"Invalid JSON on line {line_number}")
+
+        async for chunk in request.stream():
+            *lines, pending = (pending + chunk).split(b"\n")
+            for line in lines:
+                parse(line)
+        parse(pending)
+        return payloads
+
+    try:
+        body = await request.json()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Request body must be a JSON array of tasks")
+    if isinstance(body, dict):
+        body = body.get("tasks")
+    if not isinstance(body, list):
+        raise HTTPException(status_code=400, detail="Request body must be a JSON array of tasks")
+    if len(body) > TASK_BATCH_MAX_SIZE:
+        raise HTTPException(status_code=413, detail=f"A batch holds at most {TASK_BATCH_MAX_SIZE} tasks")
+    return body
+
+def _parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single `bytes=` Range header into a half-open (start, end) span of a
+    `size`-byte body, or None when the whole body is wanted.
+    """
+    if not header:
+        return None
+    unit, _, spec = header.partition("=")
+    if unit.strip() != "bytes" or "," in spec:
+        return None
+    first, _, last = spec.strip().partition("-")
+    try:
+        if first:
+            start = int(first)
+            end = int(last) + 1 if last else size
+        else:
+            start, end = max(0, size - int(last)), size
+    except ValueError:
+        return None
+    end = min(end, size)
+    if start >= end:
+        raise HTTPException(status_code=416, detail="Requested range not satisfiable",
+                            headers={"Content-Range": f"bytes */{size}"})
+    return start, end
+
+# Top-level keys of Task.to_dict(), accepted by the `fields` projection of GET /tasks
+TASK_FIELDS = tuple(TASK_FIELD_VALUES)
+
+# Activity announced when each agent picks up a task, and the prefix of its result
+AGENT_PERSONAS = {
+    "assistant": ("Gaia is analyzing your task with Earth's wisdom", ""),
+    "coordinator": ("Indra is coordinating your task from the celestial realm", "Indra's celestial wisdom: "),
+    "architect": ("Thoth is applying divine knowledge to your solution", "Thoth's sacred guidance: "),
+    "engineer": ("Pan is channeling nature's creative forces", "Pan's wild innovation: "),
+    "researcher": ("Isis is weaving magical knowledge", "Isis's mystical insight: "),
+}
+
+def _local_naive(value: Optional[datetime]) -> Optional[datetime]:
+    """
+    Convert a timezone-aware datetime to naive local time, matching Task timestamps.
+    """
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone().replace(tzinfo=None)
 
 # ------------------------------------------------------
 # System Metrics
@@ -233,6 +316,15 @@ class SystemMetrics:
         self.tasks_completed: int = 0
         self.tasks_failed: int = 0
         self.uptime_start: datetime = datetime.now()
+        self.first_token_count: int = 0
+        self.first_token_seconds_total: float = 0.0
+
+    def record_first_token(self, seconds: float) -> None:
+        """
+        Record how long a streamed task waited for its first token.
+        """
+        self.first_token_count += 1
+        self.first_token_seconds_total += seconds
 
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -241,6 +333,9 @@ class SystemMetrics:
         return {
             "tasks_completed": self.tasks_completed,
             "tasks_failed": self.tasks_failed,
+            "avg_time_to_first_token": (
+                self.first_token_seconds_total / self.first_token_count if self.first_token_count else None
+            ),
             "uptime_seconds": (datetime.now() - self.uptime_start).total_seconds()
         }
 
@@ -252,8 +347,24 @@ class FluxKernel:
     Manages the entire lifecycle of tasks and agent interactions via the FastAPI application.
     """
     def __init__(self):
-        self.tasks: List[Task] = []
+        self.repository = (
+            TaskRepository(TASK_DB_PATH, flush_interval=TASK_DB_FLUSH_INTERVAL)
+            if TASK_DB_PATH else None
+        )
+        self.tasks = TaskStore(on_change=self._persist_task)
+        self.results = BlobStore(TASK_RESULT_DIR) if TASK_RESULT_DIR else None
+        self.warmed = self.repository is None
         self.metrics = SystemMetrics()
+        self.executor = TaskExecutor(
+            self._run_task,
+            worker_count=TASK_WORKER_COUNT,
+            max_queue_depth=TASK_MAX_QUEUE_DEPTH,
+            max_concurrency=TASK_MAX_CONCURRENCY,
+            aging_seconds=TASK_PRIORITY_AGING_SECONDS,
+            agent_limits=TASK_AGENT_CONCURRENCY,
+        )
+        # Identical tasks running at the same time share one agent execution
+        self.flights = SingleFlight()
         self._register_routes()
 
     def _register_routes(self) -> None:
@@ -275,9 +386,122 @@ class FluxKernel:
             logger.debug("Health check called")
             return {"status": "healthy"}
 
+        @app.get("/metrics")
+        async def get_metrics():
+            """System metrics including task execution engine load"""
+            return {
+                **self.metrics.to_dict(),
+                "executor": self.executor.to_dict(),
+                "repository": self.repository.to_dict() if self.repository else None,
+                "results": self.results.to_dict() if self.results else None,
+                "websocket": ws_manager.to_dict(),
+                "single_flight": self.flights.to_dict(),
+                "llm": config.llm_stats(),
+                "browsers": config.browser_stats(),
+                "web_fetch": config.web_fetch_stats(),
+            }
+
         @app.get("/tasks")
-        async def fetch_all_tasks():
-            return {"tasks": [task.to_dict() for task in self.tasks]}
+        async def list_tasks(
+            limit: int = Query(100, ge=1, le=500),
+            cursor: Optional[str] = None,
+            order: str = Query("desc", pattern="^(asc|desc)$"),
+            status: Optional[TaskStatus] = None,
+            agent_id: Optional[str] = None,
+            archived: Optional[bool] = None,
+            tag: Optional[str] = None,
+            created_after: Optional[datetime] = None,
+            created_before: Optional[datetime] = None,
+            fields: Optional[str] = None,
+        ):
+            """List tasks page by page, newest first unless `order=asc`, with filters and optional field projection"""
+            try:
+                after = decode_cursor(cursor) if cursor else None
+            except ValueError as exc:
+                raise HTTPException(status_code=400, detail=str(exc))
+
+            projection = None
+            if fields:
+                projection = [name.strip() for name in fields.split(",") if name.strip()]
+                unknown = set(projection) - set(TASK_FIELDS)
+                if unknown:
+                    raise HTTPException(status_code=422, detail=f"Unknown task fields: {sorted(unknown)}")
+
+            matches = self.tasks.query(
+                status=status,
+                agent_id=agent_id,
+                archived=archived,
+                tag=tag,
+                created_after=_local_naive(created_after),
+                created_before=_local_naive(created_before),
+                after=after,
+                reverse=order == "desc",
+            )
+
+            page = []
+            next_cursor = None
+            for task in matches:
+                if len(page) == limit:
+                    next_cursor = encode_cursor(page[-1])
+                    break
+                page.append(task)
+
+            # Full tasks are spliced in from their cached JSON text instead of re-encoded
+            if projection is None:
+                serialized = ",".join(task.to_json() for task in page)
+            else:
+                serialized = ",".join(encode_json(task.project(projection)) for task in page)
+            return Response(
+                content=f'{{"tasks":[{serialized}],"next_cursor":{encode_json(next_cursor)}}}',
+                media_type="application/json",
+            )
+
+        @app.get("/tasks/{task_id}")
+        async def get_task(task_id: str):
+            """Get a single task"""
+            task = await self._find_task(task_id)
+            if task is None:
+                raise HTTPException(status_code=404, detail="Task not found")
+            return Response(content=task.to_json(), media_type="application/json")
+
+        @app.get("/tasks/{task_id}/result")
+        async def get_task_result(task_id: str, request: Request):
+            """Full task result as plain text, honoring a single byte Range"""
+            task = await self._find_task(task_id)
+            if task is None:
+                raise HTTPException(status_code=404, detail="Task not found")
+            if task.result is None:
+                raise HTTPException(status_code=404, detail="Task has no result yet")
+
+            if task.result_ref is None:
+                body = task.result.encode()
+                size = len(body)
+            elif self.results is None:
+                raise HTTPException(status_code=503, detail="Task result storage is not configured")
+            else:
+                size = task.result_size
+            byte_range = _parse_range(request.headers.get("range"), size)
+            start, end = byte_range or (0, size)
+            headers = {"Accept-Ranges": "bytes", "Content-Length": str(end - start)}
+            if byte_range is not None:
+                headers["Content-Range"] = f"bytes {start}-{end - 1}/{size}"
+            status_code = 206 if byte_range is not None else 200
+
+            if task.result_ref is None:
+                return Response(
+                    content=body[start:end],
+                    status_code=status_code,
+                    headers=headers,
+                    media_type="text/plain; charset=utf-8",
+                )
+            if not self.results.path(task.result_ref).exists():
+                raise HTTPException(status_code=410, detail="Task result is no longer stored")
+            return StreamingResponse(
+                self.results.read(task.result_ref, start, end),
+                status_code=status_code,
+                headers=headers,
+                media_type="text/plain; charset=utf-8",
+            )
 
         @app.post("/tasks")
         async def create_new_task(request: Request):
@@ -291,6 +515,41 @@ class FluxKernel:
             new_task = await self._spawn_task(payload, request)
             return new_task.to_dict()
 
+        @app.post("/tasks/batch")
+        async def create_task_batch(request: Request):
+            """Create many tasks from a JSON array or an NDJSON body, returning their ids"""
+            if not GAIA_AVAILABLE:
+                raise HTTPException(
+                    status_code=503,
+                    detail="Task processing functionality is unavailable at this moment."
+                )
+
+            payloads = await _read_task_batch(request)
+            tasks = await self._spawn_tasks(payloads, request)
+            return {"task_ids": [task.id for task in tasks], "count": len(tasks)}
+
+        @app.get("/queue")
+        async def get_queue():
+            """Tasks waiting for a worker, in dispatch order"""
+            scheduler = self.executor.scheduler
+            now = datetime.now().timestamp()
+            waiting = [
+                {
+                    "position": position,
+                    "task_id": entry.item.id,
+                    "agent_id": entry.agent_id,
+                    "priority": entry.priority,
+                    "effective_priority": round(scheduler.effective_priority(entry, now), 3),
+                    "waiting_seconds": round(max(0.0, now - entry.created_at), 3),
+                }
+                for position, entry in enumerate(scheduler.snapshot())
+            ]
+            return {
+                "waiting": waiting,
+                "running_by_agent": scheduler.running(),
+                "agent_limits": scheduler.agent_limits,
+            }
+
         @app.get("/agents")
         async def list_agents():
             """List all available agents"""
@@ -336,114 +595,432 @@ class FluxKernel:
             except Exception as e:
                 raise HTTPException(status_code=500, detail=str(e))
 
+        @app.get("/tasks/{task_id}/events")
+        async def stream_task_events(task_id: str, request: Request, last_event_id: Optional[int] = None):
+            """Server-Sent Events stream for one task, resumable via Last-Event-ID"""
+            task = await self._find_task(task_id)
+            if task is None:
+                raise HTTPException(status_code=404, detail="Task not found")
+
+            topic = ("task", task_id)
+            return self._event_stream(
+                lambda event: topic in event.topics,
+                _resume_from(request, last_event_id),
+                task=task,
+            )
+
+        @app.get("/events")
+        async def stream_events(
+            request: Request,
+            last_event_id: Optional[int] = None,
+            task_id: Optional[str] = None,
+            agent_id: Optional[str] = None,
+            tag: Optional[str] = None,
+        ):
+            """Server-Sent Events stream of all events, optionally filtered by task, agent or tag"""
+            wanted = set()
+            if task_id:
+                wanted.add(("task", task_id))
+            if agent_id:
+                wanted.add(("agent", agent_id))
+            if tag:
+                wanted.add(("tag", tag))
+
+            return self._event_stream(
+                (lambda event: not wanted.isdisjoint(event.topics)) if wanted else (lambda event: True),
+                _resume_from(request, last_event_id),
+            )
+
         @app.post("/tasks/{task_id}/archive")
         async def archive_task(task_id: str):
             """Archive a task"""
-            if task_id not in self.tasks:
+            if await self._find_task(task_id) is None:
                 raise HTTPException(status_code=404, detail="Task not found")
             
-            task = self.tasks[task_id]
-            task.archived = True
+            self.tasks.update(task_id, archived=True, updated_at=datetime.now())
             return {"status": "success", "message": "Task archived"}
 
         @app.post("/tasks/{task_id}/unarchive")
         async def unarchive_task(task_id: str):
             """Unarchive a task"""
-            if task_id not in self.tasks:
+            if await self._find_task(task_id) is None:
                 raise HTTPException(status_code=404, detail="Task not found")
             
-            task = self.tasks[task_id]
-            task.archived = False
+            self.tasks.update(task_id, archived=False, updated_at=datetime.now())
             return {"status": "success", "message": "Task unarchived"}
 
-        @app.get("/tasks")
-        async def get_tasks(archived: bool = False):
-            """Get all tasks with optional archive filtering"""
-            tasks = []
-            for task in self.tasks:
-                if task.archived == archived:
-                    tasks.append(task.to_dict())
-            return tasks
+    def _persist_task(self, task: Task) -> None:
+        """
+        Hand a changed task to the repository's background writer.
+        """
+        if self.repository is not None:
+            self.repository.save(task.to_dict())
 
-    async def _spawn_task(self, task_data: Dict[str, Any], request: Request) -> Task:
+    async def _find_task(self, task_id: str) -> Optional[Task]:
         """
-        Create and process a new Task, then return the completed Task object.
+        Look up a task in memory, falling back to disk while the store is still warming up.
         """
-        generated_id = str(uuid.uuid4())
-        current_time = datetime.now()
+        task = self.tasks.get(task_id)
+        if task is not None or self.warmed:
+            return task
+
+        data = await asyncio.get_running_loop().run_in_executor(None, self.repository.load, task_id)
+        if data is None:
+            return None
+        return self.tasks.get(task_id) or self._restore_task(data)
+
+    def _restore_task(self, data: Dict[str, Any]) -> Task:
+        """
+        Add a persisted task to the store. Tasks left pending or in progress by a
+        previous process can no longer finish and are marked as failed.
+        """
+        task = Task.from_dict(data)
+        self.tasks.add(task, notify=False)
+        if task.status in (TaskStatus.PENDING, TaskStatus.IN_PROGRESS):
+            self.tasks.update(
+                task.id,
+                status=TaskStatus.FAILED,
+                result="Task was interrupted by a server restart",
+                updated_at=datetime.now(),
+            )
+        return task
+
+    async def warm_tasks(self, page_size: int = 1000) -> None:
+        """
+        Load persisted tasks into memory page by page, newest first, without blocking requests.
+        """
+        loop = asyncio.get_running_loop()
+        before = None
+        loaded = 0
+        try:
+            while True:
+                page = await loop.run_in_executor(None, self.repository.load_page, before, page_size)
+                if not page:
+                    break
+                for data in page:
+                    if data["id"] in self.tasks:
+                        continue
+                    self._restore_task(data)
+                    loaded += 1
+                before = (page[-1]["created_at"], page[-1]["id"])
+        except Exception as exc:
+            logger.error(f"Failed to load persisted tasks: {exc}")
+        finally:
+            self.warmed = True
+        logger.info(f"Loaded {loaded} persisted tasks")
+
+    def _event_stream(self, accept, after_id: Optional[int], task: Optional[Task] = None) -> StreamingResponse:
+        """
+        Build a Server-Sent Events response fed by the event bus.
 
-        task = Task(
-            id=generated_id,
+        Events after `after_id` are replayed from the bus history first. A task
+        stream opens with a `task_snapshot` of the task's current state when there is
+        nothing to resume from or the history no longer reaches back far enough; the
+        global stream sends `resync` in that case so the client knows to refetch.
+        """
+        async def generate():
+            # Subscribe before replaying so no event falls between the two
+            subscription = EventSubscription(event_bus, accept)
+            try:
+                yield "retry: 3000\n\n"
+                last_sent = after_id or 0
+                events, complete = [], False
+                if after_id is not None:
+                    events, complete = event_bus.replay(after_id, task.id if task else None)
+                if not complete:
+                    if task is not None:
+                        snapshot = encode_json({"type": "task_snapshot", "data": task.to_dict()})
+                        yield f"event: task_snapshot\ndata: {snapshot}\n\n"
+                    elif after_id is not None:
+                        yield "event: resync\ndata: {}\n\n"
+                for event in events:
+                    if accept(event):
+                        yield format_sse(event)
+                        last_sent = event.id
+
+                while True:
+                    event = await subscription.get(timeout=SSE_KEEPALIVE_SECONDS)
+                    if event is None:
+                        if subscription.overflowed:
+                            break
+                        yield ": keepalive\n\n"
+                        continue
+                    if event.id <= last_sent:
+                        continue
+                    last_sent = event.id
+                    yield format_sse(event)
+            finally:
+                subscription.close()
+
+        return StreamingResponse(
+            generate(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    def _new_task(self, task_data: Dict[str, Any], client_info: str, current_time: datetime) -> Task:
+        """
+        Build a PENDING Task from a request payload.
+
+        Missing or null `agent_id`, `source` and `tags` take their defaults, and a
+        single tag string becomes a one-tag list.
+
+        Raises:
+            ValueError: If the payload is not an object, its priority is not an
+                integer, or `agent_id`, `source` or `tags` has the wrong type.
+        """
+        if not isinstance(task_data, dict):
+            raise ValueError("Task payload must be a JSON object")
+        priority = task_data.get("priority", 1)
+        if isinstance(priority, float) and priority.is_integer():
+            priority = int(priority)
+        elif isinstance(priority, str):
+            try:
+                priority = int(priority)
+            except ValueError:
+                pass
+        # bool is an int subclass, but `true` is not a priority
+        if isinstance(priority, bool) or not isinstance(priority, int):
+            raise ValueError("Task priority must be an integer")
+
+        agent_id = task_data.get("agent_id")
+        if agent_id is None:
+            agent_id = "assistant"
+        elif not isinstance(agent_id, str) or not agent_id:
+            raise ValueError("Task agent_id must be a non-empty string")
+        source = task_data.get("source")
+        if source is None:
+            source = "api"
+        elif not isinstance(source, str):
+            raise ValueError("Task source must be a string")
+        tags = task_data.get("tags")
+        if tags is None:
+            tags = []
+        elif isinstance(tags, str):
+            tags = [tags]
+        elif not isinstance(tags, list) or not all(isinstance(tag, str) for tag in tags):
+            raise ValueError("Task tags must be a list of strings")
+
+        return Task(
+            id=str(uuid.uuid4()),
             description=task_data.get("description", ""),
-            status=TaskStatus.IN_PROGRESS,
+            status=TaskStatus.PENDING,
             created_at=current_time,
             updated_at=current_time,
-            agent_id=task_data.get("agent_id", "assistant"),
-            priority=task_data.get("priority", 1),
+            agent_id=agent_id,
+            priority=priority,
             metadata=TaskMetadata(
-                client_info=str(request.client),
-                source=task_data.get("source", "api"),
-                tags=task_data.get("tags", [])
+                client_info=client_info,
+                source=source,
+                tags=tags
             )
         )
 
-        self.tasks.append(task)
-        
+    async def _spawn_task(self, task_data: Dict[str, Any], request: Request) -> Task:
+        """
+        Create a new Task and queue it for background processing, returning it while still PENDING.
+        """
+        try:
+            task = self._new_task(task_data, str(request.client), datetime.now())
+        except ValueError as exc:
+            raise HTTPException(status_code=422, detail=str(exc))
+
+        try:
+            self.executor.submit(
+                task,
+                priority=task.priority,
+                agent_id=task.agent_id,
+                created_at=task.created_at.timestamp(),
+            )
+        except QueueFullError as exc:
+            logger.warning(f"Rejected task {task.id}: {exc}")
+            raise HTTPException(status_code=429, detail=str(exc))
+
+        self.tasks.add(task)
+
         # Broadcast task creation immediately
         await ws_manager.broadcast("task_created", task.to_dict())
         await ws_manager.broadcast_task_progress(
-            task.id, 0.1, "started", "Initializing task processing"
+            task.id, 0.0, "queued", "Waiting for an available worker", topics=task_topics(task)
+        )
+
+        return task
+
+    async def _spawn_tasks(self, payloads: List[Dict[str, Any]], request: Request) -> List[Task]:
+        """
+        Create and queue a batch of tasks in one pass. The batch is accepted or
+        rejected as a whole. Each task is announced by its own `task_created`
+        event under its own topics, so subscribers only hear about their tasks;
+        the per-task `queued` progress events are left out.
+        """
+        client_info = str(request.client)
+        current_time = datetime.now()
+        tasks = []
+        for index, payload in enumerate(payloads):
+            try:
+                tasks.append(self._new_task(payload, client_info, current_time))
+            except ValueError as exc:
+                raise HTTPException(status_code=422, detail=f"Task {index}: {exc}")
+
+        try:
+            self.executor.submit_many([
+                (task, task.priority, task.agent_id, current_time.timestamp()) for task in tasks
+            ])
+        except QueueFullError as exc:
+            logger.warning(f"Rejected batch of {len(tasks)} tasks: {exc}")
+            raise HTTPException(status_code=429, detail=str(exc))
+
+        for task in tasks:
+            self.tasks.add(task)
+        for task in tasks:
+            await ws_manager.broadcast("task_created", task.to_dict(), task_topics(task))
+        return tasks
+
+    async def _run_task(self, task: Task) -> None:
+        """
+        Execute a queued Task on a worker, reporting progress and the final result over WebSocket.
+        """
+        self.tasks.update(task.id, status=TaskStatus.IN_PROGRESS, updated_at=datetime.now())
+        topics = task_topics(task)
+        await ws_manager.broadcast_task_progress(
+            task.id, 0.1, "started", "Initializing task processing", topics=topics
         )
 
         try:
             # Log which agent processes the task
             logger.info(f"Processing task {task.id} via {task.agent_id}")
-            
-            # Process task based on agent type
-            if task.agent_id == "assistant":
-                await ws_manager.broadcast_agent_activity(task.agent_id, "Gaia is analyzing your task with Earth's wisdom")
-                result_text = gaia.process_task(task.id, task.description)
-            elif task.agent_id == "coordinator":
-                await ws_manager.broadcast_agent_activity(task.agent_id, "Indra is coordinating your task from the celestial realm")
-                result_text = "Indra's celestial wisdom: " + gaia.process_task(task.id, task.description)
-            elif task.agent_id == "architect":
-                await ws_manager.broadcast_agent_activity(task.agent_id, "Thoth is applying divine knowledge to your solution")
-                result_text = "Thoth's sacred guidance: " + gaia.process_task(task.id, task.description)
-            elif task.agent_id == "engineer":
-                await ws_manager.broadcast_agent_activity(task.agent_id, "Pan is channeling nature's creative forces")
-                result_text = "Pan's wild innovation: " + gaia.process_task(task.id, task.description)
-            elif task.agent_id == "researcher":
-                await ws_manager.broadcast_agent_activity(task.agent_id, "Isis is weaving magical knowledge")
-                result_text = "Isis's mystical insight: " + gaia.process_task(task.id, task.description)
-            else:
-                result_text = gaia.process_task(task.id, task.description)
+            result_text = await self._execute_agent(task, topics)
             
             # Update task with result
-            task.result = result_text
-            task.status = TaskStatus.COMPLETED
-            task.updated_at = datetime.now()
+            self.tasks.update(
+                task.id,
+                **await self._store_result(task, result_text),
+                status=TaskStatus.COMPLETED,
+                updated_at=datetime.now(),
+            )
             self.metrics.tasks_completed += 1
             
-            # Send completion progress and task update
+            # Send completion progress and task update. An offloaded result is only
+            # sent as its preview with `result_ref`; clients read the full text from
+            # GET /tasks/{id}/result, which keeps events and their replay history small.
             await ws_manager.broadcast_task_progress(
-                task.id, 1.0, "completed", "Task completed successfully"
+                task.id, 1.0, "completed", "Task completed successfully", topics=topics
             )
             await ws_manager.broadcast("task_update", task.to_dict())
             
         except Exception as exc:
             logger.error(f"Failed to process task {task.id}: {exc}")
-            task.result = str(exc)
-            task.status = TaskStatus.FAILED
-            task.updated_at = datetime.now()
+            self.tasks.update(
+                task.id,
+                result=str(exc),
+                status=TaskStatus.FAILED,
+                updated_at=datetime.now(),
+            )
             self.metrics.tasks_failed += 1
             
             # Send failure progress and task update
             await ws_manager.broadcast_task_progress(
-                task.id, 1.0, "failed", f"Task failed: {str(exc)}"
+                task.id, 1.0, "failed", f"Task failed: {str(exc)}", topics=topics
             )
             await ws_manager.broadcast("task_update", task.to_dict())
 
-        return task
+    async def _store_result(self, task: Task, result_text: str) -> Dict[str, Any]:
+        """
+        Task fields for a finished result: the text itself, or for a large result a
+        preview plus a reference to the full text in the blob store.
+        """
+        data = result_text.encode()
+        if self.results is None or len(data) <= TASK_RESULT_INLINE_BYTES:
+            return {"result": result_text}
+
+        try:
+            digest = await self.executor.run_sync(self.results.put, data)
+        except Exception as exc:
+            logger.error(f"Failed to offload result of task {task.id}, keeping it inline: {exc}")
+            return {"result": result_text}
+        return {
+            "result": result_text[:TASK_RESULT_PREVIEW_CHARS],
+            "result_ref": digest,
+            "result_size": len(data),
+        }
+
+    async def _execute_agent(self, task: Task, topics: Set[Tuple[str, str]]) -> str:
+        """
+        Run the agent for a task and return its full result.
+
+        Concurrent tasks for the same agent with the same normalized description
+        share one agent execution; each still receives its own events and result.
+        The agent's prompt does not carry the task id, so the shared answer fits
+        every task. The agent is awaited on the event loop rather than on a worker thread.
+        In streaming mode, tokens are forwarded as batched `task_delta` events while
+        the agent is still generating, and the time to the first token is recorded.
+        """
+        persona = AGENT_PERSONAS.get(task.agent_id)
+        prefix = ""
+        if persona is not None:
+            activity, prefix = persona
+            await ws_manager.broadcast_agent_activity(task.agent_id, activity, topics=topics)
+
+        agent = gaia or await self.executor.run_sync(load_gaia)
+        key = (task.agent_id, normalize_prompt(task.description))
+        if self.flights.joinable(key):
+            await ws_manager.broadcast_task_progress(
+                task.id, 0.2, "coalesced", "Sharing the result of an identical running task", topics=topics
+            )
+
+        if not TASK_STREAMING:
+            async def run_agent(flight: Flight) -> str:
+                return await agent.aprocess_task(task.id, task.description)
+
+            return prefix + await self.flights.run(key, run_agent)
+
+        started_at = time.monotonic()
+        first_token_at = None
+
+        async def publish_delta(delta: str, offset: int) -> None:
+            await ws_manager.broadcast("task_delta", {
+                "task_id": task.id,
+                "delta": delta,
+                "offset": offset,
+            }, topics)
+
+        batcher = DeltaBatcher(publish_delta, window=TASK_STREAM_WINDOW_MS / 1000)
+        batcher.add(prefix)
+
+        def on_chunk(chunk: str) -> None:
+            nonlocal first_token_at
+            if first_token_at is None:
+                first_token_at = time.monotonic()
+            batcher.add(chunk)
+
+        async def stream_agent(flight: Flight) -> str:
+            chunks = []
+            async for chunk in agent.astream_task(task.id, task.description):
+                chunks.append(chunk)
+                flight.emit(chunk)
+            return "".join(chunks)
+
+        try:
+            return prefix + await self.flights.run(key, stream_agent, on_chunk)
+        finally:
+            await batcher.close()
+            if first_token_at is not None:
+                time_to_first_token = first_token_at - started_at
+                self.tasks.update(task.id, time_to_first_token=round(time_to_first_token, 4))
+                self.metrics.record_first_token(time_to_first_token)
+
+    async def warm_agents(self, names: List[str]) -> None:
+        """
+        Import the named agents and build their model clients and graphs in the
+        background, so the first task does not pay for it.
+        """
+        started_at = time.monotonic()
+        try:
+            await self.executor.run_sync(_warm_up_agents, names)
+        except Exception as e:
+            logger.error(f"Agent warm-up failed: {str(e)}")
+            return
+        logger.info(f"Warmed up agents {names} in {time.monotonic() - started_at:.2f}s")
 
     def run(self, port: int = None) -> None:
         """
@@ -483,21 +1060,6 @@ async def cors_middleware(request: Request, call_next):
             )
         return Response(status_code=400)
 
-    # Handle WebSocket upgrade requests
-    if request.headers.get("upgrade", "").lower() == "websocket":
-        origin = request.headers.get("origin")
-        if origin in allowed_origins:
-            return Response(
-                status_code=101,  # Switching Protocols
-                headers={
-                    "Access-Control-Allow-Origin": origin,
-                    "Access-Control-Allow-Credentials": "true",
-                    "Connection": "Upgrade",
-                    "Upgrade": "websocket",
-                    "Sec-WebSocket-Accept": request.headers.get("sec-websocket-key", ""),
-                }
-            )
-    
     # Handle regular requests
     response = await call_next(request)
     
@@ -529,7 +1091,7 @@ async def websocket_endpoint(websocket: WebSocket):
         logger.info(f"New WebSocket client connected from {origin}")
         
         # Send initial connection success message
-        await websocket.send_json({
+        ws_manager.send(websocket, {
             "type": "connection_status",
             "data": {
                 "status": "connected",
@@ -543,9 +1105,8 @@ async def websocket_endpoint(websocket: WebSocket):
                 data = await websocket.receive_json()
                 logger.debug(f"Received WebSocket message: {data}")
                 
-                # Handle application messages
-                if isinstance(data, dict) and "type" in data:
-                    await ws_manager.broadcast(data["type"], data.get("data", {}))
+                # Handle subscription and keepalive messages
+                await ws_manager.handle_message(websocket, data)
             
             except WebSocketDisconnect:
                 logger.info("WebSocket client disconnected normally")
@@ -0,0 +1,130 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+import threading
+
+# An unsupported provider raises ValueError when its first model is built
+SUPPORTED_MODEL_PROVIDERS = ("OPENAI", "ANTHROPIC", "OLLAMA")
+
+HttpClients = Callable[[], Tuple[Any, Any]]
+
+def build_model(provider: str, model_name: str, temperature: float, http_clients: HttpClients, **kwargs: Any):
+    """
+    Construct a chat model for a provider. The LangChain integrations are
+    imported here so importing this module stays cheap; `http_clients` returns
+    the shared (sync, async) httpx clients of OpenAI-compatible models.
+    """
+    if provider == "OPENAI":
+        from langchain_openai import ChatOpenAI
+        http_client, http_async_client = http_clients()
+        return ChatOpenAI(
+            model_name=model_name,
+            temperature=temperature,
+            http_client=http_client,
+            http_async_client=http_async_client,
+            **kwargs
+        )
+    elif provider == "ANTHROPIC":
+        # ChatAnthropic keeps its own client per instance; caching the model reuses it
+        from langchain_anthropic import ChatAnthropic
+        return ChatAnthropic(
+            model_name=model_name,
+            temperature=temperature,
+            **kwargs
+        )
+    elif provider == "OLLAMA":
+        from langchain_openai import ChatOpenAI
+        http_client, http_async_client = http_clients()
+        # OLLAMA is used as an example of a custom base. Provide a dummy key.
+        return ChatOpenAI(
+            model_name=model_name,
+            temperature=temperature,
+            openai_api_key="ollama",
+            openai_api_base="http://IPADDRESS:11434/v1",  # Replace with actual host if needed
+            http_client=http_client,
+            http_async_client=http_async_client,
+            **kwargs
+        )
+    raise ValueError(f"Unsupported model provider: {provider}")
+
+# ------------------------------------------------------
+# ModelFactory: Shared Chat Models
+# ------------------------------------------------------
+class ModelFactory:
+    """
+    Builds each distinct chat model once and shares it between agents, together
+    with an LRU of the last `tool_cache_size` models bound to a tool set, so a
+    reasoning step never rebuilds a client or rebinds its tools.
+
+    Unspecified settings fall back to `default_provider`, `default_model_name`
+    and `default_temperature`.
+    """
+    def __init__(
+        self,
+        default_provider: str,
+        default_model_name: str,
+        default_temperature: float,
+        http_clients: HttpClients,
+        build: Callable[..., Any] = build_model,
+        tool_cache_size: int = 64,
+    ) -> None:
+        self.default_provider = default_provider
+        self.default_model_name = default_model_name
+        self.default_temperature = default_temperature
+        self.http_clients = http_clients
+        self.build = build
+        self.tool_cache_size = tool_cache_size
+
+        self._models: Dict[Tuple, Any] = {}
+        self._tool_models: "OrderedDict[Tuple, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_model(
+        self,
+        provider: Optional[str] = None,
+        model_name: Optional[str] = None,
+        temperature: Optional[float] = None,
+        **kwargs: Any
+    ):
+        """
+        Return the shared chat model for these settings, building it on first use.
+        """
+        provider = (provider or self.default_provider).upper()
+        model_name = model_name or self.default_model_name
+        temperature = self.default_temperature if temperature is None else temperature
+        key = (provider, model_name, temperature, tuple(sorted(kwargs.items())))
+
+        model = self._models.get(key)
+        if model is None:
+            with self._lock:
+                model = self._models.get(key)
+                if model is None:
+                    model = self._models[key] = self.build(
+                        provider, model_name, temperature, self.http_clients, **kwargs
+                    )
+        return model
+
+    def get_tool_model(self, tools: Sequence[Any], provider: Optional[str] = None, **settings: Any):
+        """
+        Return the shared model bound to `tools`, binding once per distinct tool set
+        instead of on every reasoning step.
+        """
+        model = self.get_model(provider, **settings)
+        key = (id(model), tuple((getattr(tool, "name", None), id(tool)) for tool in tools))
+        with self._lock:
+            bound = self._tool_models.get(key)
+            if bound is not None:
+                self._tool_models.move_to_end(key)
+                return bound
+
+        bound = model.bind_tools(tools)
+        with self._lock:
+            self._tool_models[key] = bound
+            if len(self._tool_models) > self.tool_cache_size:
+                self._tool_models.popitem(last=False)
+        return bound
+
+    def to_dict(self) -> Dict[str, int]:
+        return {
+            "models": len(self._models),
+            "tool_models": len(self._tool_models),
+        }
@@ -0,0 +1,108 @@
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Iterator, Optional
+import asyncio
+import threading
+
+# ------------------------------------------------------
+# Queue Entries
+# ------------------------------------------------------
+class _SlotWaiter:
+    """A queued caller of ProviderLimiter, woken by `wake` once a slot is handed to it"""
+    __slots__ = ("wake", "granted")
+
+    def __init__(self, wake: Callable[[], Any]) -> None:
+        self.wake = wake
+        self.granted = False
+
+def _resolve(future: "asyncio.Future") -> None:
+    if not future.done():
+        future.set_result(None)
+
+# ------------------------------------------------------
+# ProviderLimiter: Per-Provider Concurrency Limits
+# ------------------------------------------------------
+class ProviderLimiter:
+    """
+    Caps in-flight requests to one provider and counts how they queue. Threads
+    and coroutines draw from the same slots and wait in one FIFO queue: a
+    released slot is handed to the longest waiter, so new callers cannot
+    overtake it, and each waiter is woken exactly once.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_flight = 0
+        self.waiting = 0
+        self.calls = 0
+        self._free = limit
+        self._waiters: Deque[_SlotWaiter] = deque()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        event = threading.Event()
+        if self._enqueue(event.set) is not None:
+            event.wait()
+        try:
+            yield
+        finally:
+            self._release()
+
+    @asynccontextmanager
+    async def aslot(self) -> AsyncIterator[None]:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        waiter = self._enqueue(lambda: loop.call_soon_threadsafe(_resolve, future))
+        if waiter is not None:
+            try:
+                await future
+            except asyncio.CancelledError:
+                with self._lock:
+                    granted = waiter.granted
+                    if not granted:
+                        self._waiters.remove(waiter)
+                        self.waiting -= 1
+                # A slot handed over just as the wait was cancelled goes to the next waiter
+                if granted:
+                    self._release()
+                raise
+        try:
+            yield
+        finally:
+            self._release()
+
+    def _enqueue(self, wake: Callable[[], Any]) -> Optional[_SlotWaiter]:
+        """
+        Take a free slot and return None, or queue and return a waiter.
+        """
+        with self._lock:
+            if self._free and not self._waiters:
+                self._free -= 1
+                self.in_flight += 1
+                self.calls += 1
+                return None
+            waiter = _SlotWaiter(wake)
+            self._waiters.append(waiter)
+            self.waiting += 1
+            return waiter
+
+    def _release(self) -> None:
+        with self._lock:
+            if not self._waiters:
+                self.in_flight -= 1
+                self._free += 1
+                return
+            waiter = self._waiters.popleft()
+            waiter.granted = True
+            self.waiting -= 1
+            self.calls += 1
+            waiter.wake()
+
+    def to_dict(self) -> Dict[str, int]:
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "calls": self.calls,
+        }
@@ -0,0 +1,282 @@
+from collections import OrderedDict
+from operator import mul
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger("flux.cache")
+
+Embedder = Callable[[str], Sequence[float]]
+
+def cache_key(model_name: str, temperature: float, system_prompt: str, content: str) -> str:
+    """
+    Stable key for a model response, derived from everything that shapes it.
+    """
+    raw = json.dumps([model_name, float(temperature), system_prompt, content], separators=(",", ":"))
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+# ------------------------------------------------------
+# Cache Tiers
+# ------------------------------------------------------
+class MemoryTier:
+    """
+    In-process LRU of responses with a time-to-live.
+    """
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key: str, value: str) -> None:
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+class SQLiteTier:
+    """
+    Durable response store shared across restarts and processes on one host.
+    Expired rows are ignored on read and replaced on write.
+    """
+    def __init__(self, path: str, ttl_seconds: float) -> None:
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self._local = threading.local()
+        with self._connection() as connection:
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS response_cache (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            """)
+
+    def get(self, key: str) -> Optional[str]:
+        row = self._connection().execute(
+            "SELECT value FROM response_cache WHERE key = ? AND expires_at > ?", (key, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def put(self, key: str, value: str) -> None:
+        with self._connection() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO response_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, time.time() + self.ttl_seconds),
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(str(self.path))
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+class SemanticTier:
+    """
+    Near-duplicate lookup by cosine similarity of prompt embeddings.
+
+    Entries are grouped by scope (model, temperature and system prompt), so a
+    prompt only ever matches responses produced under the same settings.
+    """
+    def __init__(self, embed: Embedder, threshold: float, max_entries: int, ttl_seconds: float) -> None:
+        self.embed = embed
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: List[Tuple[str, List[float], str, float]] = []
+        self._vectors: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, scope: str, text: str) -> Optional[str]:
+        vector = self._normalized(text)
+        now = time.monotonic()
+        best, best_score = None, self.threshold
+        with self._lock:
+            self._entries = [entry for entry in self._entries if entry[3] > now]
+            for entry_scope, entry_vector, value, _ in self._entries:
+                if entry_scope != scope:
+                    continue
+                score = sum(map(mul, vector, entry_vector))
+                if score >= best_score:
+                    best, best_score = value, score
+        return best
+
+    def put(self, scope: str, text: str, value: str) -> None:
+        vector = self._normalized(text)
+        with self._lock:
+            self._entries.append((scope, vector, value, time.monotonic() + self.ttl_seconds))
+            if len(self._entries) > self.max_entries:
+                del self._entries[0]
+
+    def _normalized(self, text: str) -> List[float]:
+        # A miss is usually followed by a put of the same text; embed it only once
+        with self._lock:
+            vector = self._vectors.get(text)
+        if vector is not None:
+            return vector
+
+        vector = [float(value) for value in self.embed(text)]
+        norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+        vector = [value / norm for value in vector]
+        with self._lock:
+            self._vectors[text] = vector
+            if len(self._vectors) > 64:
+                self._vectors.popitem(last=False)
+        return vector
+
+# ------------------------------------------------------
+# ResponseCache: Tiered Model Response Cache
+# ------------------------------------------------------
+class ResponseCache:
+    """
+    Caches model responses in up to three tiers, consulted in order: an
+    in-memory LRU with TTL, an optional SQLite table, and an opt-in embedding
+    similarity index for near-duplicate prompts. Hits from slower tiers are
+    copied into the memory tier.
+
+    Callers should only cache deterministic calls (temperature 0).
+    """
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 3600.0,
+        db_path: Optional[str] = None,
+        embed: Optional[Embedder] = None,
+        similarity_threshold: float = 0.95,
+        max_semantic_entries: int = 1000,
+    ) -> None:
+        self.memory = MemoryTier(max_entries, ttl_seconds)
+        self.sqlite = SQLiteTier(db_path, ttl_seconds) if db_path else None
+        self.semantic = (
+            SemanticTier(embed, similarity_threshold, max_semantic_entries, ttl_seconds) if embed else None
+        )
+
+        self.hits: Dict[str, int] = {"memory": 0, "sqlite": 0, "semantic": 0}
+        self.misses: int = 0
+        self.stores: int = 0
+        self.errors: int = 0
+
+    def get(self, key: str, scope: str = "", text: Optional[str] = None) -> Optional[str]:
+        """
+        Look up a response by exact key, falling back to similarity on `text`
+        within `scope` when the semantic tier is enabled.
+        """
+        value = self.memory.get(key)
+        if value is not None:
+            self.hits["memory"] += 1
+            return value
+
+        return self._record(key, *self._lookup_slow(key, scope, text))
+
+    async def aget(self, key: str, scope: str = "", text: Optional[str] = None) -> Optional[str]:
+        """
+        Like `get`, but consults the SQLite and semantic tiers on a worker
+        thread so the event loop never waits on disk or an embedding call.
+        """
+        value = self.memory.get(key)
+        if value is not None:
+            self.hits["memory"] += 1
+            return value
+        if not self._has_slow_tiers(text):
+            self.misses += 1
+            return None
+
+        return self._record(key, *await asyncio.to_thread(self._lookup_slow, key, scope, text))
+
+    def put(self, key: str, value: str, scope: str = "", text: Optional[str] = None) -> None:
+        """
+        Store a response in every enabled tier.
+        """
+        self.memory.put(key, value)
+        self.stores += 1
+        self._store_slow(key, value, scope, text)
+
+    async def aput(self, key: str, value: str, scope: str = "", text: Optional[str] = None) -> None:
+        """
+        Like `put`, writing the SQLite and semantic tiers on a worker thread.
+        """
+        self.memory.put(key, value)
+        self.stores += 1
+        if self._has_slow_tiers(text):
+            await asyncio.to_thread(self._store_slow, key, value, scope, text)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Describe cache size and hit rates for JSON responses.
+        """
+        hits = sum(self.hits.values())
+        lookups = hits + self.misses
+        return {
+            "entries": len(self.memory),
+            "semantic_entries": len(self.semantic) if self.semantic is not None else None,
+            "sqlite": str(self.sqlite.path) if self.sqlite is not None else None,
+            "hits": dict(self.hits),
+            "misses": self.misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "stores": self.stores,
+            "errors": self.errors,
+        }
+
+    def _has_slow_tiers(self, text: Optional[str]) -> bool:
+        return self.sqlite is not None or (self.semantic is not None and text is not None)
+
+    def _record(self, key: str, tier: str, value: Optional[str]) -> Optional[str]:
+        if value is None:
+            self.misses += 1
+            return None
+
+        self.hits[tier] += 1
+        self.memory.put(key, value)
+        return value
+
+    def _store_slow(self, key: str, value: str, scope: str, text: Optional[str]) -> None:
+        try:
+            if self.sqlite is not None:
+                self.sqlite.put(key, value)
+            if self.semantic is not None and text is not None:
+                self.semantic.put(scope, text, value)
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Failed to store cached response: {e}")
+
+    def _lookup_slow(self, key: str, scope: str, text: Optional[str]) -> Tuple[str, Optional[str]]:
+        # A failing durable or embedding tier degrades to a miss rather than failing the call
+        try:
+            if self.sqlite is not None:
+                value = self.sqlite.get(key)
+                if value is not None:
+                    return "sqlite", value
+            if self.semantic is not None and text is not None:
+                return "semantic", self.semantic.get(scope, text)
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Response cache lookup failed: {e}")
+        return "", None
@@ -0,0 +1,116 @@
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+import asyncio
+import logging
+import threading
+
+logger = logging.getLogger("flux.singleflight")
+
+Listener = Callable[[str], None]
+
+def normalize_prompt(text: str) -> str:
+    """
+    Collapse whitespace and case so trivially different submissions share a key.
+    """
+    return " ".join(text.split()).casefold()
+
+# ------------------------------------------------------
+# Flight: One Shared Execution
+# ------------------------------------------------------
+class Flight:
+    """
+    An execution shared by every caller with the same key.
+
+    Output chunks emitted by the execution (from any thread) are forwarded to
+    every attached listener; a listener attached late first receives the chunks
+    it missed, so each caller sees the complete output.
+    """
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.future: asyncio.Future = loop.create_future()
+        self.callers: int = 0
+        self._chunks: List[str] = []
+        self._listeners: List[Listener] = []
+        self._lock = threading.Lock()
+
+    def attach(self, listener: Optional[Listener]) -> None:
+        with self._lock:
+            self.callers += 1
+            if listener is None:
+                return
+            for chunk in self._chunks:
+                listener(chunk)
+            self._listeners.append(listener)
+
+    def emit(self, chunk: str) -> None:
+        with self._lock:
+            self._chunks.append(chunk)
+            listeners = list(self._listeners)
+        for listener in listeners:
+            listener(chunk)
+
+# ------------------------------------------------------
+# SingleFlight: In-Flight Request Coalescing
+# ------------------------------------------------------
+class SingleFlight:
+    """
+    Deduplicates concurrent executions by key: the first caller runs the work,
+    callers arriving while it is in flight attach to it and share its result
+    or exception. Nothing is remembered once the execution finishes.
+    """
+    def __init__(self) -> None:
+        self.executions: int = 0
+        self.coalesced: int = 0
+        self._flights: Dict[Hashable, Flight] = {}
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    def joinable(self, key: Hashable) -> bool:
+        return key in self._flights
+
+    async def run(
+        self,
+        key: Hashable,
+        work: Callable[[Flight], Awaitable[Any]],
+        listener: Optional[Listener] = None,
+    ) -> Any:
+        """
+        Run `work(flight)` unless an execution for `key` is already in flight,
+        in which case wait for that one. `work` should pass its output chunks to
+        `flight.emit` so every caller's `listener` receives them.
+        """
+        flight = self._flights.get(key)
+        if flight is not None:
+            self.coalesced += 1
+            flight.attach(listener)
+            # Shield so a cancelled follower does not cancel the shared execution
+            return await asyncio.shield(flight.future)
+
+        flight = Flight(asyncio.get_running_loop())
+        flight.attach(listener)
+        self._flights[key] = flight
+        self.executions += 1
+        try:
+            result = await work(flight)
+        except asyncio.CancelledError:
+            flight.future.cancel()
+            raise
+        except BaseException as exc:
+            flight.future.set_exception(exc)
+            # Mark the exception retrieved; followers still receive it when awaiting
+            flight.future.exception()
+            raise
+        else:
+            flight.future.set_result(result)
+            return result
+        finally:
+            del self._flights[key]
+
+    def to_dict(self) -> Dict[str, int]:
+        """
+        Describe coalescing activity for JSON responses.
+        """
+        return {
+            "in_flight": len(self._flights),
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+        }
@@ -0,0 +1,219 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+import asyncio
+import functools
+import logging
+import time
+
+from task_scheduler import QueueFullError, ScheduledEntry, TaskScheduler
+
+logger = logging.getLogger("flux.executor")
+
+# ------------------------------------------------------
+# Executor Statistics
+# ------------------------------------------------------
+class ExecutorStats:
+    """
+    Counters describing queue behaviour and task throughput of a TaskExecutor.
+    """
+    def __init__(self) -> None:
+        self.submitted: int = 0
+        self.rejected: int = 0
+        self.started: int = 0
+        self.finished: int = 0
+        self.total_wait_seconds: float = 0.0
+        self.total_run_seconds: float = 0.0
+        self.first_submitted_at: Optional[float] = None
+        self.last_finished_at: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert statistics to a dictionary for JSON responses.
+        """
+        throughput = 0.0
+        if self.first_submitted_at is not None and self.last_finished_at is not None:
+            elapsed = self.last_finished_at - self.first_submitted_at
+            if elapsed > 0:
+                throughput = self.finished / elapsed
+
+        return {
+            "submitted": self.submitted,
+            "rejected": self.rejected,
+            "started": self.started,
+            "finished": self.finished,
+            "avg_wait_seconds": self.total_wait_seconds / self.started if self.started else 0.0,
+            "avg_run_seconds": self.total_run_seconds / self.finished if self.finished else 0.0,
+            "throughput_per_second": throughput,
+        }
+
+# ------------------------------------------------------
+# TaskExecutor: Bounded Worker Pool
+# ------------------------------------------------------
+class TaskExecutor:
+    """
+    Runs submitted work items on a fixed pool of asyncio workers fed by a bounded
+    priority scheduler.
+
+    Agents are awaited on the event loop; the remaining blocking work (agent
+    imports, warm-up) is pushed onto a dedicated thread pool via `run_sync` so it
+    never stalls the loop.
+    """
+    def __init__(
+        self,
+        handler: Callable[[Any], Awaitable[None]],
+        worker_count: int = 4,
+        max_queue_depth: int = 1000,
+        max_concurrency: int = 8,
+        aging_seconds: float = 30.0,
+        agent_limits: Optional[Dict[str, int]] = None,
+    ) -> None:
+        if worker_count < 1:
+            raise ValueError("worker_count must be at least 1")
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
+        self.handler = handler
+        self.worker_count = worker_count
+        self.max_queue_depth = max_queue_depth
+        self.max_concurrency = max_concurrency
+        self.stats = ExecutorStats()
+
+        self.scheduler = TaskScheduler(
+            maxsize=max_queue_depth,
+            aging_seconds=aging_seconds,
+            agent_limits=agent_limits,
+        )
+        self._workers: List[asyncio.Task] = []
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self._in_flight: int = 0
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    @property
+    def queue_depth(self) -> int:
+        return self.scheduler.qsize()
+
+    def start(self) -> None:
+        """
+        Spawn the worker coroutines on the running event loop. Safe to call repeatedly.
+        """
+        if self.running:
+            return
+
+        self._thread_pool = ThreadPoolExecutor(
+            max_workers=self.max_concurrency,
+            thread_name_prefix="flux-agent",
+        )
+        loop = asyncio.get_running_loop()
+        self._workers = [
+            loop.create_task(self._worker(index), name=f"flux-worker-{index}")
+            for index in range(self.worker_count)
+        ]
+        logger.info(
+            f"Task executor started with {self.worker_count} workers, "
+            f"queue depth {self.max_queue_depth}, concurrency {self.max_concurrency}"
+        )
+
+    async def stop(self) -> None:
+        """
+        Cancel all workers and release the thread pool.
+        """
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+        if self._thread_pool is not None:
+            self._thread_pool.shutdown(wait=False, cancel_futures=True)
+            self._thread_pool = None
+        logger.info("Task executor stopped")
+
+    def submit(self, item: Any, priority: int = 0, agent_id: str = "", created_at: Optional[float] = None) -> ScheduledEntry:
+        """
+        Enqueue an item for background processing without waiting for it to run.
+
+        Raises:
+            QueueFullError: If the queue already holds `max_queue_depth` items.
+        """
+        self.start()
+        try:
+            entry = self.scheduler.put_nowait(item, priority=priority, agent_id=agent_id, created_at=created_at)
+        except QueueFullError:
+            self.stats.rejected += 1
+            raise
+
+        self.stats.submitted += 1
+        if self.stats.first_submitted_at is None:
+            self.stats.first_submitted_at = time.monotonic()
+        return entry
+
+    def submit_many(self, items: Sequence[Tuple[Any, int, str, Optional[float]]]) -> List[ScheduledEntry]:
+        """
+        Enqueue several `(item, priority, agent_id, created_at)` tuples, all or none.
+
+        Raises:
+            QueueFullError: If the queue cannot take every item.
+        """
+        if self.max_queue_depth > 0 and self.queue_depth + len(items) > self.max_queue_depth:
+            self.stats.rejected += len(items)
+            raise QueueFullError(
+                f"Task queue cannot take {len(items)} more tasks "
+                f"({self.queue_depth} of {self.max_queue_depth} pending)"
+            )
+        return [
+            self.submit(item, priority=priority, agent_id=agent_id, created_at=created_at)
+            for item, priority, agent_id, created_at in items
+        ]
+
+    async def join(self) -> None:
+        """
+        Wait until every submitted item has been processed.
+        """
+        await self.scheduler.join()
+
+    async def run_sync(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Run a blocking callable on the executor's thread pool and await its result.
+        """
+        self.start()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._thread_pool, functools.partial(func, *args, **kwargs)
+        )
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            entry = await self.scheduler.get()
+            started_at = time.monotonic()
+            self.stats.started += 1
+            self.stats.total_wait_seconds += started_at - entry.enqueued_at
+            self._in_flight += 1
+            try:
+                await self.handler(entry.item)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.error(f"Worker {index} failed to process item: {exc}")
+            finally:
+                finished_at = time.monotonic()
+                self._in_flight -= 1
+                self.stats.finished += 1
+                self.stats.total_run_seconds += finished_at - started_at
+                self.stats.last_finished_at = finished_at
+                self.scheduler.task_done(entry)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Describe executor configuration and live load for JSON responses.
+        """
+        return {
+            "workers": self.worker_count,
+            "max_queue_depth": self.max_queue_depth,
+            "max_concurrency": self.max_concurrency,
+            "queue_depth": self.queue_depth,
+            "in_flight": self._in_flight,
+            "running_by_agent": self.scheduler.running(),
+            **self.stats.to_dict(),
+        }
@@ -0,0 +1,142 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+import sys
+
+from event_bus import encode_json
+
+# ------------------------------------------------------
+# Enum Definitions
+# ------------------------------------------------------
+class TaskStatus(str, Enum):
+    """
+    Describes the different stages a task can be in.
+    """
+    PENDING = "pending"
+    IN_PROGRESS = "in_progress"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+# ------------------------------------------------------
+# Data Classes
+# ------------------------------------------------------
+@dataclass(frozen=True, slots=True)
+class TaskMetadata:
+    """
+    Metadata for tracking additional information about a task. Immutable, so
+    tasks created from the same request can share one instance.
+    """
+    client_info: str
+    source: str = "api"
+    tags: Tuple[str, ...] = ()
+
+    def __post_init__(self) -> None:
+        # Repeated values such as "api" are interned so 100k tasks hold one copy
+        object.__setattr__(self, "client_info", sys.intern(str(self.client_info)))
+        object.__setattr__(self, "source", sys.intern(str(self.source)))
+        tags = self.tags
+        if isinstance(tags, str):
+            tags = (tags,)
+        object.__setattr__(self, "tags", tuple(sys.intern(str(tag)) for tag in tags))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "client_info": self.client_info,
+            "source": self.source,
+            "tags": list(self.tags),
+        }
+
+@dataclass(slots=True)
+class Task:
+    """
+    The core representation of a Task within the Flux AI system.
+    """
+    id: str
+    description: str
+    status: TaskStatus
+    agent_id: str
+    priority: int
+    created_at: datetime
+    updated_at: datetime
+    result: Optional[str] = None
+    metadata: TaskMetadata = field(default_factory=lambda: TaskMetadata(client_info=""))
+    archived: bool = False
+    time_to_first_token: Optional[float] = None
+    # Set when the full result was offloaded to the blob store; `result` then holds a preview
+    result_ref: Optional[str] = None
+    result_size: Optional[int] = None
+    _json: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "agent_id", sys.intern(self.agent_id))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        if name != "_json":
+            object.__setattr__(self, "_json", None)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the Task object into a new dictionary for JSON serialization.
+        """
+        return {name: value(self) for name, value in TASK_FIELD_VALUES.items()}
+
+    def project(self, fields: Iterable[str]) -> Dict[str, Any]:
+        """
+        The `to_dict` entries named by `fields`, computing only those values.
+        """
+        return {name: TASK_FIELD_VALUES[name](self) for name in fields}
+
+    def to_json(self) -> str:
+        """
+        The task encoded as compact JSON text, cached until any attribute of the
+        task is reassigned. Only the text is kept, which is smaller than the dict
+        it is built from.
+        """
+        if self._json is None:
+            self._json = encode_json(self.to_dict())
+        return self._json
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Task":
+        """
+        Rebuild a Task from the output of `to_dict`.
+        """
+        metadata = data.get("metadata") or {}
+        return cls(
+            id=data["id"],
+            description=data["description"],
+            status=TaskStatus(data["status"]),
+            agent_id=data["agent_id"],
+            priority=data["priority"],
+            created_at=datetime.fromisoformat(data["created_at"]),
+            updated_at=datetime.fromisoformat(data["updated_at"]),
+            result=data.get("result"),
+            metadata=TaskMetadata(
+                client_info=metadata.get("client_info", ""),
+                source=metadata.get("source", "api"),
+                tags=metadata.get("tags", ()),
+            ),
+            archived=data.get("archived", False),
+            time_to_first_token=data.get("time_to_first_token"),
+            result_ref=data.get("result_ref"),
+            result_size=data.get("result_size"),
+        )
+
+# JSON value of each top-level key of Task.to_dict(), in output order
+TASK_FIELD_VALUES: Dict[str, Callable[[Task], Any]] = {
+    "id": lambda task: task.id,
+    "description": lambda task: task.description,
+    "status": lambda task: task.status.value,
+    "result": lambda task: task.result,
+    "created_at": lambda task: task.created_at.isoformat(),
+    "updated_at": lambda task: task.updated_at.isoformat(),
+    "agent_id": lambda task: task.agent_id,
+    "priority": lambda task: task.priority,
+    "metadata": lambda task: task.metadata.to_dict(),
+    "archived": lambda task: task.archived,
+    "time_to_first_token": lambda task: task.time_to_first_token,
+    "result_ref": lambda task: task.result_ref,
+    "result_size": lambda task: task.result_size,
+}
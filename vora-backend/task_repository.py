@@ -0,0 +1,202 @@
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import json
+import logging
+import sqlite3
+import threading
+
+logger = logging.getLogger("flux.repository")
+
+# ------------------------------------------------------
+# TaskRepository: Durable SQLite Task Storage
+# ------------------------------------------------------
+class TaskRepository:
+    """
+    Persists serialized tasks to SQLite in WAL mode.
+
+    `save` never touches the disk: it records the latest version of a task in a
+    pending map and a background writer thread flushes everything pending in a
+    single transaction every `flush_interval` seconds, or sooner once
+    `batch_size` tasks are waiting. Several updates to one task between flushes
+    collapse into one row write.
+    """
+    def __init__(self, path: str, flush_interval: float = 0.5, batch_size: int = 500) -> None:
+        self.path = Path(path)
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+
+        self.batches_written: int = 0
+        self.rows_written: int = 0
+
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._writer: Optional[threading.Thread] = None
+        self._local = threading.local()
+
+    @property
+    def pending_writes(self) -> int:
+        return len(self._pending)
+
+    def start(self) -> None:
+        """
+        Create the schema and start the background writer thread.
+        """
+        if self._writer is not None:
+            return
+
+        self._initialize_schema()
+        self._stopping.clear()
+        self._writer = threading.Thread(target=self._run_writer, name="flux-task-writer", daemon=True)
+        self._writer.start()
+        logger.info(f"Task repository writing to {self.path} every {self.flush_interval}s")
+
+    def stop(self) -> None:
+        """
+        Flush pending writes and stop the writer thread.
+        """
+        if self._writer is None:
+            return
+
+        self._stopping.set()
+        self._wakeup.set()
+        self._writer.join()
+        self._writer = None
+
+    def save(self, data: Dict[str, Any]) -> None:
+        """
+        Schedule a serialized task for writing. Never blocks on disk I/O.
+        """
+        with self._lock:
+            self._pending[data["id"]] = data
+            pending = len(self._pending)
+        if pending >= self.batch_size:
+            self._wakeup.set()
+
+    def flush(self) -> None:
+        """
+        Write all pending tasks in one transaction on the calling thread.
+        """
+        with self._lock:
+            batch, self._pending = self._pending, {}
+        if not batch:
+            return
+
+        rows = [
+            (
+                data["id"],
+                data["status"],
+                data["agent_id"],
+                int(bool(data["archived"])),
+                data["created_at"],
+                data["updated_at"],
+                json.dumps(data),
+            )
+            for data in batch.values()
+        ]
+        connection = self._connection()
+        try:
+            with connection:
+                connection.executemany(
+                    """
+                    INSERT OR REPLACE INTO tasks (id, status, agent_id, archived, created_at, updated_at, data)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    rows,
+                )
+        except Exception:
+            # Put the batch back unless a newer version arrived meanwhile
+            with self._lock:
+                for task_id, data in batch.items():
+                    self._pending.setdefault(task_id, data)
+            raise
+        self.batches_written += 1
+        self.rows_written += len(rows)
+
+    def load(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Read one serialized task by id, preferring a not-yet-flushed version.
+        """
+        with self._lock:
+            pending = self._pending.get(task_id)
+        if pending is not None:
+            return pending
+
+        row = self._connection().execute(
+            "SELECT data FROM tasks WHERE id = ?", (task_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def load_page(self, before: Optional[Tuple[str, str]] = None, limit: int = 1000) -> List[Dict[str, Any]]:
+        """
+        Read up to `limit` serialized tasks, newest first, strictly older than the
+        (created_at, id) key `before`.
+        """
+        if before is None:
+            rows = self._connection().execute(
+                "SELECT data FROM tasks ORDER BY created_at DESC, id DESC LIMIT ?", (limit,)
+            ).fetchall()
+        else:
+            rows = self._connection().execute(
+                """
+                SELECT data FROM tasks
+                WHERE (created_at, id) < (?, ?)
+                ORDER BY created_at DESC, id DESC LIMIT ?
+                """,
+                (*before, limit),
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Describe writer activity for JSON responses.
+        """
+        return {
+            "path": str(self.path),
+            "pending_writes": self.pending_writes,
+            "batches_written": self.batches_written,
+            "rows_written": self.rows_written,
+        }
+
+    def _connection(self) -> sqlite3.Connection:
+        # One connection per thread; WAL lets readers proceed while the writer commits
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(str(self.path))
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def _initialize_schema(self) -> None:
+        connection = self._connection()
+        with connection:
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS tasks (
+                    id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    agent_id TEXT NOT NULL,
+                    archived INTEGER NOT NULL DEFAULT 0,
+                    created_at TEXT NOT NULL,
+                    updated_at TEXT NOT NULL,
+                    data TEXT NOT NULL
+                )
+            """)
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_tasks_created_at ON tasks (created_at, id)"
+            )
+
+    def _run_writer(self) -> None:
+        while not self._stopping.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as exc:
+                logger.error(f"Failed to write task batch: {exc}")
+
+        try:
+            self.flush()
+        except Exception as exc:
+            logger.error(f"Failed to write final task batch: {exc}")
@@ -0,0 +1,189 @@
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import heapq
+import itertools
+import time
+
+# ------------------------------------------------------
+# Exceptions
+# ------------------------------------------------------
+class QueueFullError(Exception):
+    """
+    Raised when a task is submitted while the execution queue is at capacity.
+    """
+
+# ------------------------------------------------------
+# Queue Entries
+# ------------------------------------------------------
+class ScheduledEntry:
+    """
+    A queued work item together with the attributes the scheduler orders it by.
+    """
+    __slots__ = ("item", "priority", "agent_id", "created_at", "enqueued_at", "key", "seq")
+
+    def __init__(self, item: Any, priority: int, agent_id: str, created_at: float, key: Tuple[float, ...], seq: int) -> None:
+        self.item = item
+        self.priority = priority
+        self.agent_id = agent_id
+        self.created_at = created_at
+        self.enqueued_at = time.monotonic()
+        self.key = key
+        self.seq = seq
+
+    def __lt__(self, other: "ScheduledEntry") -> bool:
+        return (self.key, self.seq) < (other.key, other.seq)
+
+# ------------------------------------------------------
+# TaskScheduler: Priority Queue with Aging and Per-Agent Caps
+# ------------------------------------------------------
+class TaskScheduler:
+    """
+    Async priority queue that hands work to executor workers.
+
+    Higher `priority` values run first. Aging is built into the heap key: an entry's
+    effective priority grows by one level every `aging_seconds` it waits, which is
+    equivalent to ordering by `created_at - priority * aging_seconds`. That key never
+    changes after insertion, so low-priority work is guaranteed to surface without
+    re-heapifying. With `aging_seconds` <= 0 entries are ordered strictly by
+    priority, then by creation time.
+
+    Each agent with waiting work gets its own heap so that an agent at its
+    concurrency cap is skipped in O(number of agents) instead of rescanning blocked
+    entries. Heaps and running counts are dropped once empty, so arbitrary agent ids
+    do not accumulate.
+    """
+    def __init__(
+        self,
+        maxsize: int = 0,
+        aging_seconds: float = 30.0,
+        agent_limits: Optional[Dict[str, int]] = None,
+    ) -> None:
+        self.maxsize = maxsize
+        self.aging_seconds = aging_seconds
+        self.agent_limits: Dict[str, int] = dict(agent_limits or {})
+
+        self._heaps: Dict[str, List[ScheduledEntry]] = {}
+        self._running: Dict[str, int] = {}
+        self._size = 0
+        self._unfinished = 0
+        self._counter = itertools.count()
+        self._getters: List[asyncio.Future] = []
+        self._finished = asyncio.Event()
+        self._finished.set()
+
+    def qsize(self) -> int:
+        return self._size
+
+    def put_nowait(self, item: Any, priority: int = 0, agent_id: str = "", created_at: Optional[float] = None) -> ScheduledEntry:
+        """
+        Insert an item without blocking.
+
+        Raises:
+            QueueFullError: If `maxsize` entries are already waiting.
+        """
+        if self.maxsize > 0 and self._size >= self.maxsize:
+            raise QueueFullError(f"Task queue is full ({self.maxsize} pending)")
+
+        created_at = time.time() if created_at is None else created_at
+        entry = ScheduledEntry(
+            item=item,
+            priority=priority,
+            agent_id=agent_id,
+            created_at=created_at,
+            key=self._key(priority, created_at),
+            seq=next(self._counter),
+        )
+        heapq.heappush(self._heaps.setdefault(agent_id, []), entry)
+        self._size += 1
+        self._unfinished += 1
+        self._finished.clear()
+        self._wakeup()
+        return entry
+
+    async def get(self) -> ScheduledEntry:
+        """
+        Wait for the best eligible entry and reserve a concurrency slot for its agent.
+        """
+        while True:
+            entry = self._pop_eligible()
+            if entry is not None:
+                return entry
+
+            getter = asyncio.get_running_loop().create_future()
+            self._getters.append(getter)
+            try:
+                await getter
+            finally:
+                if getter in self._getters:
+                    self._getters.remove(getter)
+
+    def task_done(self, entry: ScheduledEntry) -> None:
+        """
+        Release the agent slot held by an entry returned from `get`.
+        """
+        remaining = self._running.get(entry.agent_id, 0) - 1
+        if remaining > 0:
+            self._running[entry.agent_id] = remaining
+        else:
+            self._running.pop(entry.agent_id, None)
+        self._unfinished -= 1
+        if self._unfinished == 0:
+            self._finished.set()
+        self._wakeup()
+
+    async def join(self) -> None:
+        """
+        Wait until every inserted entry has been marked done.
+        """
+        await self._finished.wait()
+
+    def effective_priority(self, entry: ScheduledEntry, now: Optional[float] = None) -> float:
+        """
+        Priority of an entry including the boost it has earned by waiting.
+        """
+        now = time.time() if now is None else now
+        if self.aging_seconds <= 0:
+            return float(entry.priority)
+        return entry.priority + max(0.0, now - entry.created_at) / self.aging_seconds
+
+    def snapshot(self) -> List[ScheduledEntry]:
+        """
+        All waiting entries in the order they would be dispatched if no agent were capped.
+        """
+        return sorted(entry for heap in self._heaps.values() for entry in heap)
+
+    def running(self) -> Dict[str, int]:
+        return dict(self._running)
+
+    def _key(self, priority: int, created_at: float) -> Tuple[float, ...]:
+        if self.aging_seconds <= 0:
+            return (-priority, created_at)
+        return (created_at - priority * self.aging_seconds,)
+
+    def _has_capacity(self, agent_id: str) -> bool:
+        limit = self.agent_limits.get(agent_id)
+        return limit is None or self._running.get(agent_id, 0) < limit
+
+    def _pop_eligible(self) -> Optional[ScheduledEntry]:
+        best_agent = None
+        for agent_id, heap in self._heaps.items():
+            if not self._has_capacity(agent_id):
+                continue
+            if best_agent is None or heap[0] < self._heaps[best_agent][0]:
+                best_agent = agent_id
+
+        if best_agent is None:
+            return None
+
+        heap = self._heaps[best_agent]
+        entry = heapq.heappop(heap)
+        if not heap:
+            del self._heaps[best_agent]
+        self._size -= 1
+        self._running[best_agent] = self._running.get(best_agent, 0) + 1
+        return entry
+
+    def _wakeup(self) -> None:
+        for getter in self._getters:
+            if not getter.done():
+                getter.set_result(None)
@@ -0,0 +1,213 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+import json
+
+# Task attributes with a secondary index (metadata tags are indexed separately)
+INDEXED_FIELDS = ("status", "agent_id", "archived")
+
+# ------------------------------------------------------
+# Pagination Cursors
+# ------------------------------------------------------
+def encode_cursor(task: Any) -> str:
+    """
+    Encode a task's ordering key as an opaque, URL-safe pagination cursor.
+    """
+    raw = json.dumps([task.created_at.isoformat(), task.id], separators=(",", ":"))
+    return urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """
+    Decode a cursor produced by `encode_cursor` back into a (created_at, id) key.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, task_id = json.loads(urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), str(task_id)
+    except Exception as exc:
+        raise ValueError(f"Invalid cursor: {cursor}") from exc
+
+# ------------------------------------------------------
+# TaskStore: Indexed In-Memory Task Collection
+# ------------------------------------------------------
+class TaskStore:
+    """
+    Holds Task objects with O(1) lookup by id and secondary indexes on status,
+    agent_id, archived flag and metadata tags.
+
+    Iteration is ordered by `created_at` (ties broken by id). Indexed attributes
+    must be changed through `update` so the indexes stay consistent.
+
+    `on_change`, if given, is called with the task after every `add` and `update`.
+    """
+    def __init__(self, on_change: Optional[Callable[[Any], None]] = None) -> None:
+        self.on_change = on_change
+        self._tasks: Dict[str, Any] = {}
+        self._order: List[Tuple[datetime, str]] = []
+        self._indexes: Dict[str, Dict[Any, Set[str]]] = {
+            name: defaultdict(set) for name in INDEXED_FIELDS + ("tags",)
+        }
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def __contains__(self, task_id: object) -> bool:
+        return task_id in self._tasks
+
+    def __iter__(self) -> Iterator[Any]:
+        for _, task_id in self._order:
+            yield self._tasks[task_id]
+
+    def get(self, task_id: str) -> Optional[Any]:
+        return self._tasks.get(task_id)
+
+    def add(self, task: Any, notify: bool = True) -> None:
+        """
+        Insert a task, replacing any existing task with the same id.
+
+        Pass `notify=False` when loading tasks that are already persisted.
+        """
+        if task.id in self._tasks:
+            self.remove(task.id)
+
+        self._tasks[task.id] = task
+        key = (task.created_at, task.id)
+        if not self._order or self._order[-1] < key:
+            self._order.append(key)
+        else:
+            insort(self._order, key)
+        self._index(task)
+        if notify and self.on_change is not None:
+            self.on_change(task)
+
+    def remove(self, task_id: str) -> Optional[Any]:
+        """
+        Drop a task from the store and all indexes, returning it if present.
+        """
+        task = self._tasks.pop(task_id, None)
+        if task is None:
+            return None
+
+        self._unindex(task)
+        position = bisect_left(self._order, (task.created_at, task.id))
+        if position < len(self._order) and self._order[position][1] == task_id:
+            del self._order[position]
+        return task
+
+    def update(self, task_id: str, **changes: Any) -> Any:
+        """
+        Apply attribute changes to a stored task and refresh the affected indexes.
+
+        Raises:
+            KeyError: If no task with `task_id` is stored.
+        """
+        task = self._tasks[task_id]
+        reindex = any(name in INDEXED_FIELDS or name == "metadata" for name in changes)
+        if reindex:
+            self._unindex(task)
+        for name, value in changes.items():
+            setattr(task, name, value)
+        if reindex:
+            self._index(task)
+        if self.on_change is not None:
+            self.on_change(task)
+        return task
+
+    def reindex(self, task_id: str) -> None:
+        """
+        Rebuild index entries for a task whose tags were mutated in place.
+        """
+        task = self._tasks[task_id]
+        self._unindex(task)
+        self._index(task)
+
+    def count(self, **filters: Any) -> int:
+        """
+        Number of tasks matching the given index filters.
+        """
+        candidates = self._candidates(**filters)
+        return len(self._tasks) if candidates is None else len(candidates)
+
+    def query(
+        self,
+        status: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        archived: Optional[bool] = None,
+        tag: Optional[str] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        after: Optional[Tuple[datetime, str]] = None,
+        reverse: bool = False,
+    ) -> Iterator[Any]:
+        """
+        Iterate tasks matching every given filter, ordered by `created_at`.
+
+        `created_after` is inclusive and `created_before` exclusive. `after` is a
+        (created_at, id) key of a previously returned task; iteration resumes
+        strictly past it in the requested direction, which makes it usable as a
+        pagination cursor.
+        """
+        candidates = self._candidates(status=status, agent_id=agent_id, archived=archived, tag=tag)
+        if candidates is None:
+            keys = self._order
+        elif len(candidates) * 4 < len(self._order):
+            # Sorting a small candidate set beats walking the full ordering
+            keys = sorted((self._tasks[task_id].created_at, task_id) for task_id in candidates)
+        else:
+            keys = self._order
+
+        lo, hi = 0, len(keys)
+        if created_after is not None:
+            lo = bisect_left(keys, (created_after, ""))
+        if created_before is not None:
+            hi = bisect_left(keys, (created_before, ""))
+        if after is not None:
+            if reverse:
+                hi = min(hi, bisect_left(keys, after))
+            else:
+                lo = max(lo, bisect_right(keys, after))
+
+        positions = range(hi - 1, lo - 1, -1) if reverse else range(lo, hi)
+        for position in positions:
+            task_id = keys[position][1]
+            if candidates is None or task_id in candidates:
+                yield self._tasks[task_id]
+
+    def _candidates(self, **filters: Any) -> Optional[Set[str]]:
+        sets = []
+        for name, value in filters.items():
+            if value is None:
+                continue
+            index_name = "tags" if name == "tag" else name
+            sets.append(self._indexes[index_name].get(value, set()))
+        if not sets:
+            return None
+
+        sets.sort(key=len)
+        return sets[0].intersection(*sets[1:])
+
+    def _index(self, task: Any) -> None:
+        for name in INDEXED_FIELDS:
+            self._indexes[name][getattr(task, name)].add(task.id)
+        for tag in task.metadata.tags:
+            self._indexes["tags"][tag].add(task.id)
+
+    def _unindex(self, task: Any) -> None:
+        for name in INDEXED_FIELDS:
+            self._discard(name, getattr(task, name), task.id)
+        for tag in task.metadata.tags:
+            self._discard("tags", tag, task.id)
+
+    def _discard(self, index_name: str, value: Any, task_id: str) -> None:
+        index = self._indexes[index_name]
+        members = index.get(value)
+        if members is None:
+            return
+        members.discard(task_id)
+        if not members:
+            del index[value]
@@ -0,0 +1,7 @@
+from agents.gaia import GaiaAgent
+
+def test_task_prompt_does_not_name_the_task():
+    """Test that the task prompt depends on the description alone, so shared answers fit every task"""
+    messages = GaiaAgent()._task_messages("Plan the migration")
+    assert "Task ID" not in messages[1].content
+    assert "Task Description: Plan the migration" in messages[1].content
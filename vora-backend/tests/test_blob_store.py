@@ -0,0 +1,22 @@
+from blob_store import BlobStore
+
+def test_blobs_are_deduplicated_and_compressed(tmp_path):
+    """Test that identical payloads are stored once, compressed, under their digest"""
+    store = BlobStore(str(tmp_path))
+    data = b"the same long answer " * 1000
+
+    digest = store.put(data)
+    assert store.put(data) == digest
+    assert store.writes == 1
+    assert store.deduplicated == 1
+    assert store.path(digest).stat().st_size < len(data)
+    assert store.read_all(digest) == data
+
+def test_ranges_match_slices_across_chunks(tmp_path):
+    """Test that ranged reads return the same bytes as slicing the payload"""
+    store = BlobStore(str(tmp_path), chunk_size=64)
+    data = bytes(range(256)) * 40
+    digest = store.put(data)
+
+    for start, end in ((0, 10), (100, 5000), (5000, None), (len(data) - 1, None), (300, 301)):
+        assert b"".join(store.read(digest, start, end)) == data[start:end]
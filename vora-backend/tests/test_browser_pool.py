@@ -0,0 +1,84 @@
+import threading
+
+import pytest
+
+from browser_pool import BrowserPool, BrowserPoolTimeout
+
+class FakeDriver:
+    def __init__(self):
+        self.pages = []
+        self.quit_called = False
+        self.responsive = True
+
+    def set_page_load_timeout(self, seconds):
+        self.page_timeout = seconds
+
+    def set_script_timeout(self, seconds):
+        self.script_timeout = seconds
+
+    def get(self, url):
+        self.pages.append(url)
+
+    def execute_script(self, script):
+        if not self.responsive:
+            raise RuntimeError("browser crashed")
+        return 1
+
+    def quit(self):
+        self.quit_called = True
+
+def test_sessions_are_reused_and_recycled():
+    """Test that a returned browser serves the next fetch until it reaches max_pages"""
+    drivers = []
+    pool = BrowserPool(factory=lambda: drivers.append(FakeDriver()) or drivers[-1], size=1, max_pages=2, page_timeout=5)
+
+    for _ in range(3):
+        with pool.checkout() as driver:
+            driver.get("https://example.com")
+
+    assert len(drivers) == 2
+    assert drivers[0].quit_called and not drivers[1].quit_called
+    assert drivers[0].page_timeout == 5
+    assert pool.recycled == 1
+    pool.close()
+    assert drivers[1].quit_called
+    assert pool.to_dict()["open"] == 0
+
+def test_failed_and_unresponsive_sessions_are_replaced():
+    """Test that a browser is discarded when a fetch raises or its health check fails"""
+    drivers = []
+    pool = BrowserPool(factory=lambda: drivers.append(FakeDriver()) or drivers[-1], size=1)
+
+    with pytest.raises(ValueError):
+        with pool.checkout():
+            raise ValueError("page failed")
+    with pool.checkout() as driver:
+        driver.responsive = False
+    with pool.checkout() as driver:
+        assert driver is drivers[2]
+
+    assert drivers[0].quit_called and drivers[1].quit_called
+    assert pool.discarded == 2
+
+def test_checkout_waits_for_a_free_session():
+    """Test that callers beyond the pool size wait, and time out if nothing is returned"""
+    pool = BrowserPool(factory=FakeDriver, size=1, checkout_timeout=0.05)
+    released = threading.Event()
+
+    with pool.checkout() as held:
+        with pytest.raises(BrowserPoolTimeout):
+            with pool.checkout():
+                pass
+
+        def borrow():
+            with pool.checkout() as driver:
+                assert driver is held
+                released.set()
+
+        pool.checkout_timeout = 5
+        waiter = threading.Thread(target=borrow)
+        waiter.start()
+        assert not released.wait(0.05)
+    waiter.join()
+    assert released.is_set()
+    assert pool.created == 1
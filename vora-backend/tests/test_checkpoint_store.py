@@ -0,0 +1,155 @@
+import asyncio
+import operator
+import threading
+from typing import Annotated, TypedDict
+
+from langgraph.graph import END, StateGraph
+
+from checkpoint_store import SQLiteCheckpointer
+
+class CounterState(TypedDict):
+    steps: Annotated[list, operator.add]
+
+def build_graph(checkpointer):
+    workflow = StateGraph(CounterState)
+    workflow.add_node("step", lambda state: {"steps": [len(state["steps"])]})
+    workflow.set_entry_point("step")
+    workflow.add_edge("step", END)
+    return workflow.compile(checkpointer=checkpointer)
+
+def test_threads_resume_from_their_latest_checkpoint(tmp_path):
+    """Test that a graph continues each thread's state, also after reopening the database"""
+    path = str(tmp_path / "checkpoints.sqlite")
+    checkpointer = SQLiteCheckpointer(path, flush_interval=60)
+    graph = build_graph(checkpointer)
+    one = {"configurable": {"thread_id": "one"}}
+    two = {"configurable": {"thread_id": "two"}}
+
+    graph.invoke({"steps": []}, one)
+    graph.invoke({"steps": []}, one)
+    graph.invoke({"steps": []}, two)
+    assert graph.get_state(one).values == {"steps": [0, 1]}
+    checkpointer.stop()
+
+    reopened = SQLiteCheckpointer(path)
+    assert build_graph(reopened).get_state(one).values == {"steps": [0, 1]}
+    history = list(reopened.list(one))
+    assert [item.config["configurable"]["checkpoint_id"] for item in history] == sorted(
+        (item.config["configurable"]["checkpoint_id"] for item in history), reverse=True
+    )
+    assert history[0].parent_config["configurable"]["checkpoint_id"] == history[1].config["configurable"]["checkpoint_id"]
+    assert len(list(reopened.list(one, limit=2))) == 2
+
+def test_writes_are_group_committed(tmp_path):
+    """Test that checkpoints of several threads are queued and committed by one flush"""
+    checkpointer = SQLiteCheckpointer(str(tmp_path / "checkpoints.sqlite"), flush_interval=60)
+    graph = build_graph(checkpointer)
+    for thread in range(5):
+        graph.invoke({"steps": []}, {"configurable": {"thread_id": str(thread)}})
+
+    pending = checkpointer.pending_rows
+    checkpointer.flush()
+    assert pending > 0
+    assert checkpointer.pending_rows == 0
+    assert checkpointer.rows_written >= pending
+    checkpointer.stop()
+
+def stored_kinds(checkpointer, thread_id):
+    checkpointer.flush()
+    return [
+        kind for kind, in checkpointer._connection().execute(
+            "SELECT kind FROM thread_checkpoints WHERE thread_id = ? ORDER BY checkpoint_id", (thread_id,)
+        )
+    ]
+
+def test_appended_lists_are_stored_as_deltas(tmp_path):
+    """Test that growing list channels are stored as deltas and rebuilt exactly"""
+    checkpointer = SQLiteCheckpointer(str(tmp_path / "checkpoints.sqlite"), flush_interval=60, max_delta_chain=3)
+    graph = build_graph(checkpointer)
+    config = {"configurable": {"thread_id": "one"}}
+    for _ in range(5):
+        graph.invoke({"steps": []}, config)
+
+    kinds = stored_kinds(checkpointer, "one")
+    assert "delta" in kinds
+    assert "snapshot" in kinds[1:]
+    assert graph.get_state(config).values == {"steps": [0, 1, 2, 3, 4]}
+    for item in checkpointer.list(config):
+        steps = item.checkpoint["channel_values"].get("steps", [])
+        assert steps == list(range(len(steps)))
+    checkpointer.stop()
+
+    reopened = SQLiteCheckpointer(str(tmp_path / "checkpoints.sqlite"))
+    assert build_graph(reopened).get_state(config).values == {"steps": [0, 1, 2, 3, 4]}
+
+def test_compaction_keeps_recent_history(tmp_path):
+    """Test that trimming a thread folds deltas whose base is removed into snapshots"""
+    checkpointer = SQLiteCheckpointer(str(tmp_path / "checkpoints.sqlite"), flush_interval=60, keep_checkpoints=2)
+    graph = build_graph(checkpointer)
+    config = {"configurable": {"thread_id": "one"}}
+    for _ in range(4):
+        graph.invoke({"steps": []}, config)
+
+    result = checkpointer.compact()
+    assert result["checkpoints_pruned"] > 0
+    assert result["deltas_folded"] > 0
+    assert len(stored_kinds(checkpointer, "one")) == 2
+    assert graph.get_state(config).values == {"steps": [0, 1, 2, 3]}
+
+    graph.invoke({"steps": []}, config)
+    assert graph.get_state(config).values == {"steps": [0, 1, 2, 3, 4]}
+    checkpointer.stop()
+
+def test_compaction_prunes_idle_and_excess_threads(tmp_path):
+    """Test that threads past the TTL or beyond the thread limit are deleted"""
+    checkpointer = SQLiteCheckpointer(str(tmp_path / "checkpoints.sqlite"), flush_interval=60, max_threads=2)
+    graph = build_graph(checkpointer)
+    for thread in ("old", "middle", "new"):
+        graph.invoke({"steps": []}, {"configurable": {"thread_id": thread}})
+
+    assert checkpointer.compact()["threads_pruned"] == 1
+    assert checkpointer.get_tuple({"configurable": {"thread_id": "old"}}) is None
+    assert checkpointer.get_tuple({"configurable": {"thread_id": "new"}}) is not None
+
+    checkpointer.max_threads = None
+    checkpointer.thread_ttl_seconds = 60
+    with checkpointer._connection() as connection:
+        connection.execute("UPDATE thread_checkpoints SET created_at = 0 WHERE thread_id = 'middle'")
+    assert checkpointer.compact()["threads_pruned"] == 1
+    assert checkpointer.get_tuple({"configurable": {"thread_id": "middle"}}) is None
+    assert checkpointer.threads_pruned == 2
+    checkpointer.stop()
+
+def test_async_graphs_resume_from_the_cache(tmp_path):
+    """Test that ainvoke works on many threads at once and hot threads are read from memory"""
+    path = str(tmp_path / "checkpoints.sqlite")
+    checkpointer = SQLiteCheckpointer(path, flush_interval=60)
+    graph = build_graph(checkpointer)
+
+    async def run_thread(thread):
+        config = {"configurable": {"thread_id": str(thread)}}
+        for _ in range(3):
+            await graph.ainvoke({"steps": []}, config)
+        return (await graph.aget_state(config)).values
+
+    async def run_all():
+        return await asyncio.gather(*(run_thread(thread) for thread in range(20)))
+
+    assert asyncio.run(run_all()) == [{"steps": [0, 1, 2]}] * 20
+    assert checkpointer.cache_hits > 0
+    assert checkpointer.pending_rows > 0
+    checkpointer.stop()
+
+    async def history():
+        return [item async for item in reopened.alist({"configurable": {"thread_id": "7"}})]
+
+    reopened = SQLiteCheckpointer(path)
+    assert build_graph(reopened).get_state({"configurable": {"thread_id": "7"}}).values == {"steps": [0, 1, 2]}
+    assert reopened.cache_misses == 1
+    assert len(asyncio.run(history())) > 3
+
+    reopened.stop()
+    for saver in (checkpointer, reopened):
+        for thread in list(saver._reader._threads):
+            thread.join(timeout=1)
+    assert not [thread for thread in threading.enumerate() if thread.name.startswith("flux-checkpoint-reader")]
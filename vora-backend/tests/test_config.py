@@ -0,0 +1,8 @@
+import config
+
+def test_provider_concurrency_skips_malformed_entries():
+    """Test that entries without '=', with a non-integer or non-positive limit are ignored"""
+    assert config._parse_provider_concurrency("OPENAI, anthropic=4 ,ollama=0,openai=x,=3, OLLAMA=-1") == {
+        "ANTHROPIC": 4,
+    }
+    assert config._parse_provider_concurrency("openai=8,ANTHROPIC=2") == {"OPENAI": 8, "ANTHROPIC": 2}
@@ -0,0 +1,57 @@
+import asyncio
+
+from event_bus import EventBus, EventSubscription, format_sse
+
+def test_replay_resumes_after_last_event_id():
+    """Test that replay returns only events newer than the given id"""
+    bus = EventBus(history_size=10)
+    first = bus.publish("task_update", {"id": "t1"})
+    bus.publish("task_update", {"id": "t2"})
+    third = bus.publish("task_update", {"id": "t1"})
+
+    events, complete = bus.replay(first.id)
+    assert complete
+    assert [event.id for event in events] == [first.id + 1, third.id]
+
+    events, complete = bus.replay(first.id, task_id="t1")
+    assert complete
+    assert [event.id for event in events] == [third.id]
+
+def test_replay_reports_evicted_history():
+    """Test that replay is flagged incomplete once unseen events were evicted"""
+    bus = EventBus(history_size=3, task_history_size=2, max_tracked_tasks=1)
+    for _ in range(4):
+        bus.publish("task_delta", {"task_id": "t1"})
+
+    assert not bus.replay(0)[1]
+    assert not bus.replay(1, task_id="t1")[1]
+    assert bus.replay(3, task_id="t1")[1]
+
+    bus.publish("task_delta", {"task_id": "t2"})
+    assert bus.replay(4, task_id="t1") == ([], False)
+
+def test_subscription_filters_and_overflows():
+    """Test that a subscription queues matching events and stops when it falls behind"""
+    async def scenario():
+        bus = EventBus()
+        subscription = EventSubscription(bus, lambda event: ("task", "t1") in event.topics, max_queue=2)
+        bus.publish("task_update", {"id": "t2"})
+        for _ in range(3):
+            bus.publish("task_update", {"id": "t1"})
+
+        assert subscription.overflowed
+        received = [await subscription.get(timeout=0.1) for _ in range(3)]
+        subscription.close()
+        return received, bus
+
+    received, bus = asyncio.run(scenario())
+    assert [event.id for event in received[:2]] == [2, 3]
+    assert received[2] is None
+    assert bus._subscribers == []
+
+def test_format_sse_frames_event_with_id():
+    """Test that SSE frames carry the event id and type"""
+    event = EventBus().publish("task_created", {"id": "t1"})
+    frame = format_sse(event)
+    assert frame.startswith("id: 1\nevent: task_created\ndata: {")
+    assert frame.endswith("\n\n")
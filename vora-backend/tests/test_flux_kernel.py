@@ -0,0 +1,396 @@
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Keep tasks in memory and results in a scratch directory for the kernel under test
+os.environ["TASK_DB_PATH"] = ""
+os.environ["TASK_RESULT_DIR"] = tempfile.mkdtemp(prefix="flux-results-")
+
+import pytest
+from fastapi.testclient import TestClient
+
+import flux_kernel
+from flux_kernel import kernel
+from event_bus import EventBus, EventSubscription
+from task_executor import QueueFullError
+from task_model import Task, TaskMetadata, TaskStatus
+from task_repository import TaskRepository
+
+@pytest.fixture
+def broadcasts(monkeypatch):
+    sent = []
+
+    async def record(event_type, data, topics=None):
+        sent.append((event_type, data, topics))
+
+    monkeypatch.setattr(flux_kernel.ws_manager, "broadcast", record)
+    return sent
+
+@pytest.fixture
+def client(monkeypatch):
+    # The executor is not started, so accepted tasks stay queued and no agent runs
+    monkeypatch.setattr(flux_kernel, "GAIA_AVAILABLE", True)
+    return TestClient(flux_kernel.app)
+
+def test_kernel_imports_with_a_fractional_temperature(tmp_path):
+    """Test that DEFAULT_MODEL_TEMPERATURE=0.7 does not stop the kernel from loading"""
+    root = str(Path(__file__).parent.parent)
+    env = {
+        **os.environ,
+        "DEFAULT_MODEL_TEMPERATURE": "0.7",
+        "PYTHONPATH": os.pathsep.join(filter(None, [root, os.environ.get("PYTHONPATH")])),
+    }
+    result = subprocess.run(
+        [sys.executable, "-c", "import flux_kernel, config; print(config.default_model_temperature)"],
+        cwd=tmp_path,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "0.7"
+
+def test_agent_concurrency_skips_malformed_entries():
+    """Test that entries without '=' or with a non-integer limit are ignored"""
+    assert flux_kernel._parse_agent_concurrency("engineer=2, researcher ,pan=x,=3, isis=4") == {
+        "engineer": 2,
+        "isis": 4,
+    }
+
+@pytest.mark.parametrize("priority, expected", [(3, 3), (2.0, 2), ("5", 5)])
+def test_integral_priorities_are_accepted(client, priority, expected):
+    """Test that integers, integral floats and integer strings are valid priorities"""
+    response = client.post("/tasks", json={"description": "work", "priority": priority})
+    assert response.status_code == 200
+    assert response.json()["priority"] == expected
+
+@pytest.mark.parametrize("priority", [2.9, "high", True, None])
+def test_non_integral_priorities_are_rejected(client, priority):
+    """Test that fractional and non-numeric priorities answer 422 instead of being truncated"""
+    response = client.post("/tasks", json={"description": "work", "priority": priority})
+    assert response.status_code == 422
+
+def test_stale_tasks_read_before_warm_up_are_failed(client, monkeypatch, tmp_path):
+    """Test that a pending task of a previous process fetched by id during warm-up is marked failed"""
+    repository = TaskRepository(str(tmp_path / "tasks.sqlite"))
+    repository.start()
+    stale = Task(
+        id=str(uuid.uuid4()),
+        description="left behind",
+        status=TaskStatus.PENDING,
+        agent_id="assistant",
+        priority=1,
+        created_at=datetime.now(),
+        updated_at=datetime.now(),
+    )
+    repository.save(stale.to_dict())
+    repository.flush()
+    monkeypatch.setattr(kernel, "repository", repository)
+    monkeypatch.setattr(kernel, "warmed", False)
+
+    response = client.get(f"/tasks/{stale.id}")
+    assert response.json()["status"] == "failed"
+    asyncio.run(kernel.warm_tasks())
+    assert kernel.tasks.get(stale.id).status == TaskStatus.FAILED
+    repository.stop()
+    assert TaskRepository(str(tmp_path / "tasks.sqlite")).load(stale.id)["status"] == "failed"
+
+@pytest.mark.parametrize("body", [
+    [{"description": "one", "agent_id": "engineer"}, {"description": "two", "tags": ["billing"]}],
+    {"tasks": [{"description": "one", "agent_id": "engineer"}, {"description": "two", "tags": ["billing"]}]},
+])
+def test_batch_accepts_json_bodies(client, broadcasts, body):
+    """Test that a JSON array or {"tasks": [...]} body creates every task, each announced under its own topics"""
+    response = client.post("/tasks/batch", json=body)
+    assert response.status_code == 200
+    task_ids = response.json()["task_ids"]
+    assert response.json()["count"] == 2
+    assert [kernel.tasks.get(task_id).description for task_id in task_ids] == ["one", "two"]
+
+    assert [(event_type, data["id"]) for event_type, data, _ in broadcasts] == [
+        ("task_created", task_id) for task_id in task_ids
+    ]
+    assert broadcasts[0][2] == {("task", task_ids[0]), ("agent", "engineer")}
+    assert broadcasts[1][2] == {("task", task_ids[1]), ("agent", "assistant"), ("tag", "billing")}
+
+def test_batch_accepts_ndjson_bodies(client, broadcasts):
+    """Test that NDJSON bodies are read line by line, skipping blank lines"""
+    body = b'{"description": "one"}\n\n{"description": "two"}\n{"description": "three"}'
+    response = client.post("/tasks/batch", content=body, headers={"content-type": "application/x-ndjson"})
+    assert response.status_code == 200
+    assert response.json()["count"] == 3
+    assert [data["description"] for _, data, _ in broadcasts] == ["one", "two", "three"]
+
+def test_batch_reports_the_line_of_invalid_ndjson(client, broadcasts):
+    """Test that an invalid NDJSON line is reported by its line number in the body"""
+    body = b'{"description": "one"}\n\n\n{"description": '
+    response = client.post("/tasks/batch", content=body, headers={"content-type": "application/x-ndjson"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid JSON on line 4"
+    assert broadcasts == []
+
+def test_batch_rejects_oversized_batches(client, broadcasts, monkeypatch):
+    """Test that JSON and NDJSON batches beyond TASK_BATCH_MAX_SIZE answer 413"""
+    monkeypatch.setattr(flux_kernel, "TASK_BATCH_MAX_SIZE", 2)
+    assert client.post("/tasks/batch", json=[{"description": "x"}] * 3).status_code == 413
+    body = b'{"description": "x"}\n' * 3
+    response = client.post("/tasks/batch", content=body, headers={"content-type": "application/x-ndjson"})
+    assert response.status_code == 413
+    assert broadcasts == []
+
+def test_batch_names_the_invalid_entry(client, broadcasts):
+    """Test that one invalid entry rejects the batch with 422 naming its index"""
+    depth = kernel.executor.queue_depth
+    response = client.post("/tasks/batch", json=[{"description": "ok"}, {"priority": "high"}])
+    assert response.status_code == 422
+    assert response.json()["detail"].startswith("Task 1:")
+    assert kernel.executor.queue_depth == depth
+    assert broadcasts == []
+
+def test_batch_is_rejected_as_a_whole_when_the_queue_is_full(client, broadcasts, monkeypatch):
+    """Test that a batch that does not fit the queue answers 429 and stores no task"""
+    def full(items):
+        raise QueueFullError("Task queue is full")
+
+    monkeypatch.setattr(kernel.executor, "submit_many", full)
+    stored = len(kernel.tasks)
+    response = client.post("/tasks/batch", json=[{"description": "one"}, {"description": "two"}])
+    assert response.status_code == 429
+    assert len(kernel.tasks) == stored
+    assert broadcasts == []
+
+def test_null_fields_take_their_defaults(client):
+    """Test that null agent_id, source and tags fall back to their defaults"""
+    response = client.post("/tasks", json={"description": "work", "agent_id": None, "source": None, "tags": None})
+    assert response.status_code == 200
+    task = response.json()
+    assert task["agent_id"] == "assistant"
+    assert task["metadata"]["source"] == "api"
+    assert task["metadata"]["tags"] == []
+    assert client.post("/tasks", json={"tags": "billing"}).json()["metadata"]["tags"] == ["billing"]
+
+@pytest.mark.parametrize("payload", [
+    {"agent_id": 7},
+    {"agent_id": ""},
+    {"source": ["api"]},
+    {"tags": {"billing": True}},
+    {"tags": ["billing", 3]},
+])
+def test_mistyped_fields_are_rejected(client, payload):
+    """Test that wrongly typed agent_id, source and tags answer 422 instead of 500"""
+    assert client.post("/tasks", json={"description": "work", **payload}).status_code == 422
+    response = client.post("/tasks/batch", json=[{"description": "ok"}, {"description": "work", **payload}])
+    assert response.status_code == 422
+    assert response.json()["detail"].startswith("Task 1:")
+
+def stored_task(status=TaskStatus.COMPLETED, **fields):
+    fields = {"description": "answered", "created_at": datetime.now(), **fields}
+    task = Task(
+        id=str(uuid.uuid4()),
+        status=status,
+        agent_id="assistant",
+        priority=1,
+        updated_at=datetime.now(),
+        **fields,
+    )
+    kernel.tasks.add(task, notify=False)
+    return task
+
+def tagged_tasks(count):
+    """Tasks under a fresh tag, one second apart, oldest first"""
+    tag = uuid.uuid4().hex
+    start = datetime.now()
+    return tag, [
+        stored_task(
+            description=f"task {index}",
+            created_at=start + timedelta(seconds=index),
+            metadata=TaskMetadata(client_info="", tags=(tag,)),
+        )
+        for index in range(count)
+    ]
+
+def test_task_list_is_newest_first_and_paged_by_cursor(client):
+    """Test that a bare listing starts at the newest task and next_cursor walks to the oldest"""
+    tag, tasks = tagged_tasks(5)
+    newest_first = [task.id for task in reversed(tasks)]
+
+    seen = []
+    params = {"tag": tag, "limit": 2}
+    while True:
+        page = client.get("/tasks", params=params).json()
+        seen.extend(task["id"] for task in page["tasks"])
+        if page["next_cursor"] is None:
+            break
+        params["cursor"] = page["next_cursor"]
+    assert seen == newest_first
+
+    page = client.get("/tasks", params={"tag": tag, "order": "asc", "limit": 2}).json()
+    assert [task["id"] for task in page["tasks"]] == newest_first[:-3:-1]
+    assert client.get("/tasks", params={"order": "sideways"}).status_code == 422
+    assert client.get("/tasks", params={"cursor": "not-a-cursor"}).status_code == 400
+
+def test_task_list_projects_fields(client):
+    """Test that fields= returns only the requested keys, with the same values as the full task"""
+    tag, (task,) = tagged_tasks(1)
+    projected = client.get("/tasks", params={"tag": tag, "fields": "id, status,metadata"}).json()["tasks"]
+    full = task.to_dict()
+    assert projected == [{"id": full["id"], "status": full["status"], "metadata": full["metadata"]}]
+    assert client.get("/tasks", params={"fields": "id,secret"}).status_code == 422
+
+def test_inline_results_are_served_with_ranges(client):
+    """Test that a small result is returned whole, or sliced by a Range header"""
+    task = stored_task(result="short answer")
+    response = client.get(f"/tasks/{task.id}/result")
+    assert (response.status_code, response.text) == (200, "short answer")
+
+    response = client.get(f"/tasks/{task.id}/result", headers={"Range": "bytes=6-"})
+    assert (response.status_code, response.text) == (206, "answer")
+    assert response.headers["content-range"] == "bytes 6-11/12"
+
+def test_offloaded_results_are_streamed_from_the_blob_store(client):
+    """Test 200, 206, 416 and 410 answers for a result kept in the blob store"""
+    data = ("a long answer " * 2000).encode()
+    digest = kernel.results.put(data)
+    task = stored_task(result=data[:512].decode(), result_ref=digest, result_size=len(data))
+
+    response = client.get(f"/tasks/{task.id}/result")
+    assert (response.status_code, response.content) == (200, data)
+    response = client.get(f"/tasks/{task.id}/result", headers={"Range": "bytes=-100"})
+    assert (response.status_code, response.content) == (206, data[-100:])
+    assert response.headers["content-range"] == f"bytes {len(data) - 100}-{len(data) - 1}/{len(data)}"
+    response = client.get(f"/tasks/{task.id}/result", headers={"Range": f"bytes={len(data)}-"})
+    assert response.status_code == 416
+    assert response.headers["content-range"] == f"bytes */{len(data)}"
+
+    kernel.results.path(digest).unlink()
+    assert client.get(f"/tasks/{task.id}/result").status_code == 410
+
+def test_final_update_carries_only_the_preview_of_an_offloaded_result(broadcasts, monkeypatch):
+    """Test that the task_update broadcast holds the preview and reference, not the whole answer"""
+    answer = "x" * (flux_kernel.TASK_RESULT_INLINE_BYTES + 1)
+
+    async def execute(task, topics):
+        return answer
+
+    monkeypatch.setattr(kernel, "_execute_agent", execute)
+    task = stored_task(status=TaskStatus.PENDING)
+    asyncio.run(kernel._run_task(task))
+
+    assert task.result_ref is not None
+    assert len(task.result) == flux_kernel.TASK_RESULT_PREVIEW_CHARS
+    updates = [data for event_type, data, _ in broadcasts if event_type == "task_update"]
+    assert updates[-1]["result"] == task.result
+    assert (updates[-1]["result_ref"], updates[-1]["result_size"]) == (task.result_ref, len(answer))
+    assert kernel.results.read_all(task.result_ref).decode() == answer
+
+def test_offloaded_results_without_a_blob_store_answer_503(client, monkeypatch):
+    """Test that a result reference is reported as unavailable when no result store is configured"""
+    task = stored_task(result="preview", result_ref="0" * 64, result_size=10_000)
+    monkeypatch.setattr(kernel, "results", None)
+    assert client.get(f"/tasks/{task.id}/result").status_code == 503
+
+def test_streamed_deltas_join_up_to_the_final_result(broadcasts, monkeypatch):
+    """Test that task_delta offsets tile the final result and the time to first token is recorded"""
+    class StreamingAgent:
+        async def astream_task(self, task_id, description):
+            for word in ("Plan ", "the ", "sacred ", "migration."):
+                await asyncio.sleep(0.005)
+                yield word
+
+    monkeypatch.setattr(flux_kernel, "gaia", StreamingAgent())
+    monkeypatch.setattr(flux_kernel, "TASK_STREAMING", True)
+    monkeypatch.setattr(flux_kernel, "TASK_STREAM_WINDOW_MS", 1)
+    monkeypatch.setattr(kernel.metrics, "first_token_count", 0)
+    task = stored_task(status=TaskStatus.PENDING, description=f"streamed {uuid.uuid4()}")
+    task.agent_id = "architect"
+    asyncio.run(kernel._run_task(task))
+
+    deltas = [data for event_type, data, _ in broadcasts if event_type == "task_delta"]
+    assert len(deltas) > 1
+    text = ""
+    for delta in deltas:
+        assert delta["task_id"] == task.id and delta["offset"] == len(text)
+        text += delta["delta"]
+    update = [data for event_type, data, _ in broadcasts if event_type == "task_update"][-1]
+    assert text == update["result"] == "Thoth's sacred guidance: Plan the sacred migration."
+    assert task.time_to_first_token is not None and task.time_to_first_token > 0
+    assert update["time_to_first_token"] == task.time_to_first_token
+    assert kernel.metrics.first_token_count == 1
+
+class ClosingSubscription(EventSubscription):
+    """Publishes `live` events once the stream is live, then ends it at the first idle wait"""
+    live = []
+
+    async def get(self, timeout):
+        for event_type, data in self.live:
+            self.bus.publish(event_type, data)
+        self.live = []
+        event = await super().get(0.01)
+        if event is None:
+            self.overflowed = True
+        return event
+
+def read_sse(response):
+    frames = []
+    for block in response.text.split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if ": " in line and not line.startswith(":"))
+        if "event" in fields:
+            frames.append((int(fields["id"]) if "id" in fields else None, fields["event"]))
+    return frames
+
+@pytest.fixture
+def bus(monkeypatch):
+    bus = EventBus(history_size=4, task_history_size=2)
+    monkeypatch.setattr(flux_kernel, "event_bus", bus)
+    monkeypatch.setattr(flux_kernel, "EventSubscription", ClosingSubscription)
+    monkeypatch.setattr(ClosingSubscription, "live", [])
+    return bus
+
+def test_task_event_stream_opens_with_a_snapshot_then_goes_live(client, bus):
+    """Test that a fresh task stream sends task_snapshot, then only that task's live events"""
+    task = stored_task(status=TaskStatus.PENDING)
+    ClosingSubscription.live = [
+        ("task_update", {"id": "someone-else"}),
+        ("task_delta", {"task_id": task.id, "delta": "Hi", "offset": 0}),
+    ]
+    response = client.get(f"/tasks/{task.id}/events")
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert read_sse(response) == [(None, "task_snapshot"), (2, "task_delta")]
+    assert client.get("/tasks/missing/events").status_code == 404
+
+def test_task_event_stream_resumes_after_last_event_id(client, bus):
+    """Test that Last-Event-ID replays only newer events, or a snapshot once they were evicted"""
+    task = stored_task(status=TaskStatus.IN_PROGRESS)
+    first = bus.publish("task_progress", {"task_id": task.id, "progress": 0.1})
+    second = bus.publish("task_delta", {"task_id": task.id, "delta": "a", "offset": 0})
+
+    response = client.get(f"/tasks/{task.id}/events", headers={"Last-Event-ID": str(first.id)})
+    assert read_sse(response) == [(second.id, "task_delta")]
+    response = client.get(f"/tasks/{task.id}/events", params={"last_event_id": str(second.id)})
+    assert read_sse(response) == []
+    assert client.get(f"/tasks/{task.id}/events", headers={"Last-Event-ID": "soon"}).status_code == 400
+
+    third = bus.publish("task_delta", {"task_id": task.id, "delta": "b", "offset": 1})
+    response = client.get(f"/tasks/{task.id}/events", headers={"Last-Event-ID": str(first.id - 1)})
+    assert read_sse(response) == [(None, "task_snapshot"), (second.id, "task_delta"), (third.id, "task_delta")]
+
+def test_global_event_stream_filters_and_resyncs(client, bus):
+    """Test that /events filters by agent, resumes by id and asks for a resync after eviction"""
+    first = bus.publish("task_update", {"id": "t1", "agent_id": "engineer"})
+    bus.publish("task_update", {"id": "t2", "agent_id": "researcher"})
+    third = bus.publish("task_update", {"id": "t3", "agent_id": "engineer"})
+
+    response = client.get("/events", params={"agent_id": "engineer"}, headers={"Last-Event-ID": str(first.id)})
+    assert read_sse(response) == [(third.id, "task_update")]
+
+    for index in range(4):
+        bus.publish("agent_activity", {"agent_id": "engineer", "index": index})
+    response = client.get("/events", params={"agent_id": "engineer", "last_event_id": str(first.id)})
+    frames = read_sse(response)
+    assert frames[0] == (None, "resync")
+    assert [event_id for event_id, _ in frames[1:]] == [bus.last_event_id - 3 + index for index in range(4)]
@@ -0,0 +1,30 @@
+from model_factory import ModelFactory
+
+class FakeModel:
+    """Stand-in chat model that records tool bindings"""
+    def __init__(self, *args, **kwargs):
+        self.bound = []
+
+    def bind_tools(self, tools):
+        self.bound.append(tools)
+        return ("bound", tuple(tools))
+
+def test_models_and_tool_bindings_are_shared():
+    """Test that the factory builds one model per settings and binds each tool set once"""
+    factory = ModelFactory("OPENAI", "gpt-test", 0.0, http_clients=lambda: (None, None), build=FakeModel)
+
+    model = factory.get_model("OPENAI", "gpt-test", 0)
+    assert factory.get_model("openai", "gpt-test", 0.0) is model
+    assert factory.get_model("OPENAI", "gpt-test", 0.5) is not model
+
+    tools = [object(), object()]
+    first = factory.get_tool_model(tools, "OPENAI", model_name="gpt-test", temperature=0)
+    assert factory.get_tool_model(list(tools), "OPENAI", model_name="gpt-test", temperature=0) is first
+    factory.get_tool_model(tools[:1], "OPENAI", model_name="gpt-test", temperature=0)
+    assert len(model.bound) == 2
+
+def test_unset_settings_use_the_defaults():
+    """Test that omitted provider, name and temperature resolve to the factory defaults"""
+    factory = ModelFactory("OPENAI", "gpt-test", 0.0, http_clients=lambda: (None, None), build=FakeModel)
+    assert factory.get_model() is factory.get_model("openai", "gpt-test", 0)
+    assert factory.to_dict() == {"models": 1, "tool_models": 0}
@@ -0,0 +1,73 @@
+import asyncio
+import threading
+import time
+
+from provider_limiter import ProviderLimiter
+
+def test_provider_limiter_caps_in_flight_calls():
+    """Test that no more than `limit` callers hold a provider slot at once"""
+    limiter = ProviderLimiter(2)
+    peak = 0
+    lock = threading.Lock()
+
+    def call():
+        nonlocal peak
+        with limiter.slot():
+            with lock:
+                peak = max(peak, limiter.in_flight)
+            time.sleep(0.02)
+
+    threads = [threading.Thread(target=call) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert peak == 2
+    assert limiter.to_dict() == {"limit": 2, "in_flight": 0, "waiting": 0, "calls": 6}
+
+def test_async_slots_share_the_provider_limit():
+    """Test that coroutines and threads draw from the same provider slots"""
+    limiter = ProviderLimiter(2)
+    peak = 0
+
+    async def call():
+        nonlocal peak
+        async with limiter.aslot():
+            peak = max(peak, limiter.in_flight)
+            await asyncio.sleep(0.02)
+
+    async def scenario():
+        with limiter.slot():
+            await asyncio.gather(*(call() for _ in range(4)))
+
+    asyncio.run(scenario())
+    assert peak == 2
+    assert limiter.to_dict() == {"limit": 2, "in_flight": 0, "waiting": 0, "calls": 5}
+
+def test_async_slots_are_granted_in_arrival_order():
+    """Test that released slots go to the longest waiter and cancelled waiters leave the queue"""
+    limiter = ProviderLimiter(1)
+    order = []
+
+    async def call(name):
+        async with limiter.aslot():
+            order.append(name)
+            await asyncio.sleep(0)
+
+    async def scenario():
+        async with limiter.aslot():
+            first = asyncio.create_task(call("first"))
+            cancelled = asyncio.create_task(call("cancelled"))
+            second = asyncio.create_task(call("second"))
+            await asyncio.sleep(0.01)
+            assert limiter.waiting == 3
+            cancelled.cancel()
+            await asyncio.sleep(0.01)
+        # Arrives after the release, so it queues behind the earlier waiters
+        late = asyncio.create_task(call("late"))
+        await asyncio.gather(first, second, late)
+
+    asyncio.run(scenario())
+    assert order == ["first", "second", "late"]
+    assert limiter.to_dict() == {"limit": 1, "in_flight": 0, "waiting": 0, "calls": 4}
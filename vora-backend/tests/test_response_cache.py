@@ -0,0 +1,77 @@
+import asyncio
+import time
+
+from response_cache import ResponseCache, cache_key
+
+def test_key_depends_on_every_input():
+    """Test that model, temperature, system prompt and content all change the key"""
+    base = cache_key("gpt-4", 0, "system", "hello")
+    assert cache_key("gpt-4", 0.0, "system", "hello") == base
+    for other in (
+        cache_key("gpt-4o", 0, "system", "hello"),
+        cache_key("gpt-4", 0.5, "system", "hello"),
+        cache_key("gpt-4", 0, "other", "hello"),
+        cache_key("gpt-4", 0, "system", "hello!"),
+    ):
+        assert other != base
+
+def test_memory_tier_evicts_and_expires():
+    """Test LRU eviction and TTL expiry in the memory tier"""
+    cache = ResponseCache(max_entries=2, ttl_seconds=0.05)
+    cache.put("a", "A")
+    cache.put("b", "B")
+    assert cache.get("a") == "A"
+    cache.put("c", "C")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+    time.sleep(0.06)
+    assert cache.get("a") is None
+    assert cache.to_dict()["hits"]["memory"] == 2
+    assert cache.misses == 2
+
+def test_sqlite_tier_survives_restart(tmp_path):
+    """Test that responses persist in SQLite and are promoted to memory on a hit"""
+    path = str(tmp_path / "cache.sqlite")
+    ResponseCache(db_path=path).put("key", "stored")
+
+    cache = ResponseCache(db_path=path)
+    assert cache.get("key") == "stored"
+    assert cache.get("key") == "stored"
+    assert cache.hits == {"memory": 1, "sqlite": 1, "semantic": 0}
+
+def test_semantic_tier_matches_near_duplicates_in_scope():
+    """Test that similar prompts hit within a scope and dissimilar ones miss"""
+    vectors = {
+        "reset my password": [1.0, 0.0, 0.1],
+        "reset my password please": [1.0, 0.0, 0.12],
+        "write a poem": [0.0, 1.0, 0.0],
+    }
+    calls = []
+
+    def embed(text):
+        calls.append(text)
+        return vectors[text]
+
+    cache = ResponseCache(embed=embed, similarity_threshold=0.99)
+    cache.get("k1", "scope", "reset my password")
+    cache.put("k1", "Use the reset link.", "scope", "reset my password")
+
+    assert cache.get("k2", "scope", "reset my password please") == "Use the reset link."
+    assert cache.get("k3", "scope", "write a poem") is None
+    assert cache.get("k4", "other-scope", "reset my password please") is None
+    assert calls.count("reset my password") == 1
+    assert cache.hits["semantic"] == 1
+
+def test_async_lookups_share_tiers_with_sync_ones(tmp_path):
+    """Test that aget and aput read and write the same tiers as get and put"""
+    path = str(tmp_path / "cache.sqlite")
+
+    async def scenario():
+        cache = ResponseCache(db_path=path)
+        assert await cache.aget("key") is None
+        await cache.aput("key", "stored")
+        assert cache.get("key") == "stored"
+        return await ResponseCache(db_path=path).aget("key")
+
+    assert asyncio.run(scenario()) == "stored"
@@ -0,0 +1,59 @@
+import asyncio
+
+import pytest
+
+from single_flight import SingleFlight, normalize_prompt
+
+def test_concurrent_callers_share_one_execution():
+    """Test that callers with the same key share the result and every output chunk"""
+    async def scenario():
+        flights = SingleFlight()
+        calls = 0
+
+        async def work(flight):
+            nonlocal calls
+            calls += 1
+            flight.emit("a")
+            await asyncio.sleep(0.02)
+            flight.emit("b")
+            return "ab"
+
+        received = {"first": [], "second": []}
+        first = asyncio.ensure_future(flights.run("k", work, received["first"].append))
+        await asyncio.sleep(0.01)
+        second = asyncio.ensure_future(flights.run("k", work, received["second"].append))
+        other = asyncio.ensure_future(flights.run("other", work))
+        results = await asyncio.gather(first, second, other)
+        return calls, results, received, flights
+
+    calls, results, received, flights = asyncio.run(scenario())
+    assert calls == 2
+    assert results == ["ab", "ab", "ab"]
+    assert received == {"first": ["a", "b"], "second": ["a", "b"]}
+    assert flights.to_dict() == {"in_flight": 0, "executions": 2, "coalesced": 1}
+
+def test_failure_is_shared_and_not_remembered():
+    """Test that followers receive the leader's exception and a later call runs again"""
+    async def scenario():
+        flights = SingleFlight()
+
+        async def fail(flight):
+            await asyncio.sleep(0.01)
+            raise RuntimeError("boom")
+
+        async def succeed(flight):
+            return "ok"
+
+        outcomes = await asyncio.gather(
+            flights.run("k", fail), flights.run("k", fail), return_exceptions=True
+        )
+        return outcomes, await flights.run("k", succeed)
+
+    outcomes, retried = asyncio.run(scenario())
+    assert all(isinstance(outcome, RuntimeError) for outcome in outcomes)
+    assert retried == "ok"
+
+@pytest.mark.parametrize("text", ["Summarize  the report", " summarize the\nREPORT "])
+def test_normalize_prompt(text):
+    """Test that whitespace and case differences normalize to the same key"""
+    assert normalize_prompt(text) == "summarize the report"
@@ -0,0 +1,98 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from task_executor import QueueFullError, TaskExecutor
+
+def test_executor_processes_all_submissions_within_worker_limit():
+    """Test that 100 concurrent submissions all run without exceeding the worker count"""
+    processed = []
+    active = 0
+    peak = 0
+
+    async def handler(item):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.001)
+        processed.append(item)
+        active -= 1
+
+    async def scenario():
+        executor = TaskExecutor(handler, worker_count=4, max_queue_depth=100)
+        for i in range(100):
+            executor.submit(i)
+        await executor.join()
+        await executor.stop()
+        return executor
+
+    executor = asyncio.run(scenario())
+
+    assert sorted(processed) == list(range(100))
+    assert peak <= 4
+    assert executor.stats.finished == 100
+    assert executor.to_dict()["throughput_per_second"] > 0
+
+def test_executor_rejects_when_queue_is_full():
+    """Test that submissions beyond the queue depth raise QueueFullError"""
+    async def handler(item):
+        await asyncio.sleep(1)
+
+    async def scenario():
+        executor = TaskExecutor(handler, worker_count=1, max_queue_depth=2)
+        executor.submit("a")
+        executor.submit("b")
+        with pytest.raises(QueueFullError):
+            executor.submit("c")
+        await executor.stop()
+        return executor
+
+    executor = asyncio.run(scenario())
+    assert executor.stats.rejected == 1
+
+def test_run_sync_keeps_event_loop_responsive():
+    """Test that blocking calls run off the event loop thread"""
+    def blocking_call():
+        time.sleep(0.05)
+        return threading.current_thread().name
+
+    async def scenario():
+        executor = TaskExecutor(lambda item: asyncio.sleep(0), max_concurrency=2)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        ticker_task = asyncio.create_task(ticker())
+        thread_name = await executor.run_sync(blocking_call)
+        ticker_task.cancel()
+        await executor.stop()
+        return thread_name, ticks
+
+    thread_name, ticks = asyncio.run(scenario())
+    assert thread_name.startswith("flux-agent")
+    assert ticks > 1
+
+def test_submit_many_is_all_or_nothing():
+    """Test that a batch that does not fit the queue is rejected without enqueuing any item"""
+    async def handler(item):
+        await asyncio.sleep(1)
+
+    async def scenario():
+        executor = TaskExecutor(handler, worker_count=1, max_queue_depth=3)
+        executor.submit_many([("a", 0, "", None), ("b", 1, "", None)])
+        with pytest.raises(QueueFullError):
+            executor.submit_many([("c", 0, "", None), ("d", 0, "", None)])
+        depth = executor.queue_depth
+        await executor.stop()
+        return executor, depth
+
+    executor, depth = asyncio.run(scenario())
+    assert depth == 2
+    assert executor.stats.submitted == 2
+    assert executor.stats.rejected == 2
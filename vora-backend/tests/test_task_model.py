@@ -0,0 +1,49 @@
+import json
+from dataclasses import FrozenInstanceError
+from datetime import datetime
+
+import pytest
+
+from task_model import Task, TaskMetadata, TaskStatus
+
+def make_task(**overrides):
+    fields = dict(
+        id="t1",
+        description="write a haiku",
+        status=TaskStatus.PENDING,
+        agent_id="assistant",
+        priority=1,
+        created_at=datetime(2025, 1, 1),
+        updated_at=datetime(2025, 1, 1),
+        metadata=TaskMetadata(client_info="test", tags=["poetry"]),
+    )
+    fields.update(overrides)
+    return Task(**fields)
+
+def test_records_are_slotted_and_metadata_is_frozen():
+    """Test that tasks carry no per-instance __dict__ and metadata cannot be mutated"""
+    task = make_task()
+    assert not hasattr(task, "__dict__")
+    assert not hasattr(task.metadata, "__dict__")
+    assert task.metadata.tags == ("poetry",)
+    with pytest.raises(FrozenInstanceError):
+        task.metadata.source = "cli"
+
+def test_json_cache_follows_updates():
+    """Test that to_json is cached and rebuilt after any attribute is reassigned"""
+    task = make_task()
+    first = task.to_json()
+    assert task.to_json() is first
+    assert json.loads(first) == task.to_dict()
+
+    task.status = TaskStatus.COMPLETED
+    task.result = "Autumn moonlight"
+    data = json.loads(task.to_json())
+    assert data["status"] == "completed"
+    assert data["result"] == "Autumn moonlight"
+
+def test_round_trip_through_dict():
+    """Test that from_dict rebuilds an equal task from to_dict output"""
+    task = make_task(time_to_first_token=0.25)
+    assert Task.from_dict(task.to_dict()) == task
+    assert Task.from_dict(json.loads(task.to_json())) == task
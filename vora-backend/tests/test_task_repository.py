@@ -0,0 +1,50 @@
+import sqlite3
+
+from task_repository import TaskRepository
+
+def make_data(task_id, created_at, status="pending"):
+    return {
+        "id": task_id,
+        "description": "test task",
+        "status": status,
+        "result": None,
+        "created_at": created_at,
+        "updated_at": created_at,
+        "agent_id": "assistant",
+        "priority": 1,
+        "metadata": {"client_info": "test", "source": "api", "tags": []},
+        "archived": False,
+    }
+
+def test_save_is_batched_and_coalesced(tmp_path):
+    """Test that repeated saves of a task are written once, in a single transaction"""
+    repository = TaskRepository(str(tmp_path / "tasks.sqlite"), flush_interval=60)
+    repository.start()
+    repository.save(make_data("t1", "2025-01-01T00:00:01"))
+    repository.save(make_data("t2", "2025-01-01T00:00:02"))
+    repository.save(make_data("t1", "2025-01-01T00:00:01", status="completed"))
+
+    assert repository.load("t1")["status"] == "completed"
+    repository.stop()
+
+    assert repository.batches_written == 1
+    assert repository.rows_written == 2
+    connection = sqlite3.connect(str(tmp_path / "tasks.sqlite"))
+    assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert connection.execute("SELECT status FROM tasks WHERE id = 't1'").fetchone()[0] == "completed"
+
+def test_load_page_walks_newest_first(tmp_path):
+    """Test keyset paging over persisted tasks"""
+    repository = TaskRepository(str(tmp_path / "tasks.sqlite"))
+    repository.start()
+    for second in range(5):
+        repository.save(make_data(f"t{second}", f"2025-01-01T00:00:0{second}"))
+    repository.flush()
+
+    first = repository.load_page(limit=2)
+    second = repository.load_page(before=(first[-1]["created_at"], first[-1]["id"]), limit=10)
+    repository.stop()
+
+    assert [data["id"] for data in first] == ["t4", "t3"]
+    assert [data["id"] for data in second] == ["t2", "t1", "t0"]
+    assert repository.load("missing") is None
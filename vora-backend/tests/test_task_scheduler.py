@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+
+from task_scheduler import QueueFullError, TaskScheduler
+
+def drain(scheduler, count):
+    async def scenario():
+        order = []
+        for _ in range(count):
+            entry = await scheduler.get()
+            order.append(entry.item)
+            scheduler.task_done(entry)
+        return order
+    return asyncio.run(scenario())
+
+def test_higher_priority_runs_first():
+    """Test that entries are dispatched by priority, then by creation time"""
+    scheduler = TaskScheduler(aging_seconds=30)
+    scheduler.put_nowait("batch-1", priority=1, created_at=100.0)
+    scheduler.put_nowait("batch-2", priority=1, created_at=101.0)
+    scheduler.put_nowait("interactive", priority=5, created_at=102.0)
+
+    assert drain(scheduler, 3) == ["interactive", "batch-1", "batch-2"]
+
+def test_aging_prevents_starvation():
+    """Test that a low-priority entry overtakes newer high-priority work after waiting long enough"""
+    scheduler = TaskScheduler(aging_seconds=10)
+    scheduler.put_nowait("old-low", priority=1, created_at=0.0)
+    scheduler.put_nowait("new-high", priority=3, created_at=25.0)
+
+    assert drain(scheduler, 2) == ["old-low", "new-high"]
+    assert scheduler.effective_priority(
+        scheduler.put_nowait("probe", priority=1, created_at=0.0), now=20.0
+    ) == pytest.approx(3.0)
+
+def test_agent_concurrency_cap_skips_busy_agent():
+    """Test that an agent at its cap does not block work for other agents"""
+    scheduler = TaskScheduler(agent_limits={"engineer": 1})
+    scheduler.put_nowait("eng-1", priority=9, agent_id="engineer", created_at=1.0)
+    scheduler.put_nowait("eng-2", priority=9, agent_id="engineer", created_at=2.0)
+    scheduler.put_nowait("research", priority=1, agent_id="researcher", created_at=3.0)
+
+    async def scenario():
+        first = await scheduler.get()
+        second = await scheduler.get()
+        assert scheduler.running() == {"engineer": 1, "researcher": 1}
+
+        waiter = asyncio.create_task(scheduler.get())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+
+        scheduler.task_done(first)
+        third = await waiter
+        return [first.item, second.item, third.item]
+
+    assert asyncio.run(scenario()) == ["eng-1", "research", "eng-2"]
+
+def test_queue_depth_is_bounded():
+    """Test that inserting beyond maxsize raises QueueFullError"""
+    scheduler = TaskScheduler(maxsize=1)
+    scheduler.put_nowait("only")
+    with pytest.raises(QueueFullError):
+        scheduler.put_nowait("overflow")
+    assert [entry.item for entry in scheduler.snapshot()] == ["only"]
+
+def test_priority_is_kept_when_aging_is_off():
+    """Test that with aging disabled entries run by priority, then by creation time"""
+    scheduler = TaskScheduler(aging_seconds=0)
+    scheduler.put_nowait("old-low", priority=1, created_at=0.0)
+    scheduler.put_nowait("new-high", priority=3, created_at=1000.0)
+    scheduler.put_nowait("newer-high", priority=3, created_at=1001.0)
+
+    assert [entry.item for entry in scheduler.snapshot()] == ["new-high", "newer-high", "old-low"]
+    assert drain(scheduler, 3) == ["new-high", "newer-high", "old-low"]
+
+def test_idle_agents_are_forgotten():
+    """Test that heaps and running counts of agents with no work left are dropped"""
+    scheduler = TaskScheduler()
+    for index in range(50):
+        scheduler.put_nowait(index, agent_id=f"agent-{index}")
+
+    assert len(drain(scheduler, 50)) == 50
+    assert scheduler._heaps == {} and scheduler._running == {}
+    assert scheduler.running() == {}
@@ -0,0 +1,74 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from task_store import TaskStore, decode_cursor, encode_cursor
+
+BASE_TIME = datetime(2025, 1, 1)
+
+def make_task(task_id, minutes, status="pending", agent_id="assistant", archived=False, tags=None):
+    return SimpleNamespace(
+        id=task_id,
+        status=status,
+        agent_id=agent_id,
+        archived=archived,
+        created_at=BASE_TIME + timedelta(minutes=minutes),
+        metadata=SimpleNamespace(tags=tags or []),
+    )
+
+def test_lookup_and_ordered_iteration():
+    """Test O(1) lookup by id and iteration ordered by created_at regardless of insertion order"""
+    store = TaskStore()
+    store.add(make_task("b", 2))
+    store.add(make_task("c", 3))
+    store.add(make_task("a", 1))
+
+    assert "a" in store
+    assert store.get("c").id == "c"
+    assert store.get("missing") is None
+    assert [task.id for task in store] == ["a", "b", "c"]
+    assert [task.id for task in store.query(reverse=True)] == ["c", "b", "a"]
+
+def test_secondary_indexes_follow_updates():
+    """Test that filtering by status, agent, archived and tag reflects updates"""
+    store = TaskStore()
+    store.add(make_task("t1", 1, agent_id="engineer", tags=["infra"]))
+    store.add(make_task("t2", 2, agent_id="engineer"))
+    store.add(make_task("t3", 3, agent_id="researcher", tags=["infra"]))
+
+    store.update("t1", status="completed")
+    store.update("t3", archived=True)
+
+    assert [t.id for t in store.query(status="pending")] == ["t2", "t3"]
+    assert [t.id for t in store.query(agent_id="engineer", status="completed")] == ["t1"]
+    assert [t.id for t in store.query(tag="infra", archived=False)] == ["t1"]
+    assert store.count(archived=True) == 1
+    assert list(store.query(agent_id="nobody")) == []
+
+def test_remove_clears_indexes():
+    """Test that removed tasks disappear from lookups, ordering and indexes"""
+    store = TaskStore()
+    store.add(make_task("t1", 1, tags=["x"]))
+    store.add(make_task("t2", 2, tags=["x"]))
+
+    assert store.remove("t1").id == "t1"
+    assert store.remove("t1") is None
+    assert len(store) == 1
+    assert [t.id for t in store] == ["t2"]
+    assert [t.id for t in store.query(tag="x")] == ["t2"]
+
+def test_query_supports_time_range_and_cursor():
+    """Test created_at range filters and resuming after a cursor in both directions"""
+    store = TaskStore()
+    for minute in range(6):
+        store.add(make_task(f"t{minute}", minute, agent_id="engineer" if minute % 2 else "assistant"))
+
+    window = store.query(
+        created_after=BASE_TIME + timedelta(minutes=1),
+        created_before=BASE_TIME + timedelta(minutes=5),
+    )
+    assert [t.id for t in window] == ["t1", "t2", "t3", "t4"]
+
+    first_page = list(store.query(agent_id="engineer"))[:2]
+    cursor = encode_cursor(first_page[-1])
+    assert [t.id for t in store.query(agent_id="engineer", after=decode_cursor(cursor))] == ["t5"]
+    assert [t.id for t in store.query(after=decode_cursor(cursor), reverse=True)] == ["t2", "t1", "t0"]
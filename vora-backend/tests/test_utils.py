@@ -0,0 +1,91 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+from utils import ModuleRegistry, SourceCatalog
+
+def write_module(path, value):
+    path.write_text(f"LOADS = []\nLOADS.append(1)\nVALUE = {value!r}\n")
+
+def test_registry_reuses_unchanged_module(tmp_path):
+    """Test that loading an unchanged file returns the cached module without re-executing it"""
+    source = tmp_path / "sample.py"
+    write_module(source, "a")
+    registry = ModuleRegistry()
+
+    first = registry.load(str(source))
+    second = registry.load(str(source))
+
+    assert first is second
+    assert first.__name__ in sys.modules
+    assert registry.to_dict() == {"modules": 1, "hits": 1, "loads": 1, "reloads": 0}
+
+def test_registry_hot_reloads_changed_file(tmp_path):
+    """Test that a content change reloads the module while a touch alone does not"""
+    source = tmp_path / "sample.py"
+    write_module(source, "a")
+    registry = ModuleRegistry()
+    first = registry.load(str(source))
+
+    stat = source.stat()
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert registry.load(str(source)) is first
+
+    write_module(source, "bb")
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2 * 10**9))
+    second = registry.load(str(source))
+
+    assert second is not first
+    assert second.VALUE == "bb"
+    assert first.__name__ not in sys.modules
+    assert registry.load(str(source), reload=True) is not second
+    assert registry.reloads == 2
+
+def test_registry_does_not_cache_failed_loads(tmp_path):
+    """Test that a module raising during import is not cached"""
+    source = tmp_path / "broken.py"
+    source.write_text("raise RuntimeError('boom')\n")
+    registry = ModuleRegistry()
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            registry.load(str(source))
+    assert registry.to_dict()["modules"] == 0
+
+def test_catalog_reads_definitions_without_executing(tmp_path):
+    """Test that the catalog extracts docstrings and signatures statically and picks up changes"""
+    (tmp_path / "search.py").write_text(
+        "raise RuntimeError('must not run')\n"
+        "def search(query: str, limit: int = 5) -> str:\n"
+        "    \"\"\"Search for things.\"\"\"\n"
+    )
+    (tmp_path / "helper.py").write_text(
+        "class Helper:\n"
+        "    \"\"\"Helps out.\"\"\"\n"
+        "helper = Helper()\n"
+    )
+    (tmp_path / "_private.py").write_text("")
+    catalog = SourceCatalog(str(tmp_path), check_interval=0)
+
+    entries = catalog.entries()
+    assert sorted(entries) == ["helper", "search"]
+    assert entries["search"].signature == "search(query: str, limit: int=5) -> str"
+    assert entries["search"].doc == "Search for things."
+    assert entries["helper"].doc == "Helps out."
+
+    (tmp_path / "broken.py").write_text("def broken(:\n")
+    assert catalog.entries()["broken"].error.startswith("SyntaxError")
+    assert catalog.entries()["search"] is entries["search"]
+
+def test_catalog_describes_every_real_tool():
+    """Test that every module in tools/ is catalogued, including StructuredTool.from_function tools"""
+    tools_dir = Path(__file__).resolve().parent.parent / "tools"
+    entries = SourceCatalog(str(tools_dir), check_interval=0).entries()
+
+    assert sorted(entries) == sorted(path.stem for path in tools_dir.glob("*.py") if not path.name.startswith("_"))
+    assert {name: entry.error for name, entry in entries.items() if entry.error} == {}
+    assert entries["fetch_web_page_content"].signature == "fetch_web_page_content(url: str)"
+    assert entries["fetch_web_page_content"].doc == "Fetch content from a web page."
+    assert entries["fetch_web_page_raw_html"].signature == "fetch_web_page_raw_html(url: str) -> str"
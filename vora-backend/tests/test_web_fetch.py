@@ -0,0 +1,164 @@
+import asyncio
+from contextlib import contextmanager
+
+import httpx
+import pytest
+
+from web_fetch import FetchError, PageFetcher, body_html, extract_text
+
+ARTICLE = """<!doctype html><html lang="en"><head><title>Static page</title>
+<meta name="description" content="A page that renders on the server"><style>p { color: red }</style></head>
+<body><h1>Heading</h1><p>First paragraph with <b>bold</b> text.</p><script>track()</script>
+<p>""" + "Plenty of server rendered text. " * 20 + """</p></body></html>"""
+
+SHELL = """<html><head><title>App</title></head><body><div id="root"></div>
+<noscript>You need to enable JavaScript to run this app.</noscript><script src="/app.js"></script></body></html>"""
+
+# Long enough to pass `min_text_chars`, but its noscript fallback asks for JavaScript
+CONSENT_SHELL = """<html><body><p>""" + "Cookie notice and navigation. " * 10 + """</p>
+<noscript>This site requires JavaScript.</noscript><script src="/app.js"></script></body></html>"""
+
+class FakePool:
+    def __init__(self):
+        self.urls = []
+
+    @contextmanager
+    def checkout(self):
+        pool = self
+
+        class Driver:
+            page_source = "<html><body><p>Rendered by the browser</p></body></html>"
+
+            def get(self, url):
+                pool.urls.append(url)
+
+            def execute_script(self, script):
+                return {"title": "Rendered", "description": "", "language": "en"}
+
+        yield Driver()
+
+def make_fetcher(pages, **settings):
+    def respond(request):
+        if request.url.path not in pages:
+            raise httpx.ConnectError("connection refused", request=request)
+        status, content_type, body = pages[request.url.path]
+        return httpx.Response(status, headers={"content-type": content_type}, text=body)
+
+    transport = httpx.MockTransport(respond)
+    pool = FakePool()
+    fetcher = PageFetcher(
+        httpx.Client(transport=transport, base_url="https://example.com"),
+        httpx.AsyncClient(transport=transport, base_url="https://example.com"),
+        pool,
+        **settings,
+    )
+    return fetcher, pool
+
+def test_text_extraction_skips_scripts_and_keeps_blocks():
+    """Test that visible text is split per block with scripts, styles and head removed"""
+    extracted = extract_text(ARTICLE)
+    text = extracted.text()
+    assert text.startswith("Heading\n\nFirst paragraph with bold text.\n\nPlenty")
+    assert "track()" not in text and "color" not in text
+    assert (extracted.title, extracted.language) == ("Static page", "en")
+    assert extracted.description == "A page that renders on the server"
+    shell = extract_text(SHELL)
+    assert shell.text() == "" and "enable JavaScript" in shell.noscript_text
+    assert body_html(ARTICLE).startswith("<body>") and body_html(ARTICLE).endswith("</body>")
+
+def test_static_pages_skip_the_browser():
+    """Test that server-rendered and plain text pages are served from the HTTP response"""
+    fetcher, pool = make_fetcher({
+        "/article": (200, "text/html; charset=utf-8", ARTICLE),
+        "/notes.txt": (200, "text/plain", "just text"),
+    })
+
+    page = fetcher.fetch("https://example.com/article")
+    assert page.via == "http"
+    assert page.metadata()["title"] == "Static page"
+    assert fetcher.fetch("https://example.com/notes.txt").text == "just text"
+    assert asyncio.run(fetcher.afetch("https://example.com/article")).text == page.text
+    assert pool.urls == []
+    assert fetcher.http_pages == 3
+
+def test_script_rendered_and_failed_pages_use_the_browser():
+    """Test that JavaScript shells, refused clients and binary responses fall back to the browser pool"""
+    fetcher, pool = make_fetcher({
+        "/app": (200, "text/html", SHELL),
+        "/consent": (200, "text/html", CONSENT_SHELL),
+        "/blocked": (403, "text/html", "<p>Forbidden</p>"),
+        "/limited": (429, "text/html", "<p>Slow down</p>"),
+        "/file.pdf": (200, "application/pdf", "%PDF"),
+    })
+
+    for path in ("/app", "/consent", "/blocked", "/limited", "/file.pdf"):
+        page = fetcher.fetch(f"https://example.com{path}")
+        assert page.via == "browser"
+        assert page.text == "Rendered by the browser"
+    assert len(pool.urls) == 5
+    assert fetcher.fallbacks == {"script_rendered": 2, "status_403": 1, "status_429": 1, "content_type": 1}
+
+def test_errors_a_browser_would_share_are_raised():
+    """Test that missing pages, server errors and network failures raise instead of loading the browser"""
+    fetcher, pool = make_fetcher({
+        "/gone": (404, "text/html", "<p>Not found</p>"),
+        "/broken": (500, "text/html", "<p>Oops</p>"),
+    })
+
+    with pytest.raises(FetchError, match="HTTP 404"):
+        fetcher.fetch("https://example.com/gone")
+    with pytest.raises(FetchError, match="HTTP 500"):
+        asyncio.run(fetcher.afetch("https://example.com/broken"))
+    with pytest.raises(httpx.ConnectError):
+        fetcher.fetch("https://example.com/unreachable")
+    assert pool.urls == [] and fetcher.fallbacks == {}
+
+def test_oversized_pages_are_dropped_while_streaming():
+    """Test that bodies over max_bytes raise as soon as the limit is passed, without the browser"""
+    served = []
+
+    def chunks():
+        for _ in range(100):
+            served.append(1)
+            yield b"<p>" + b"x" * 1000 + b"</p>"
+
+    async def achunks():
+        for chunk in chunks():
+            yield chunk
+
+    def respond(request):
+        if request.url.path == "/declared":
+            return httpx.Response(200, headers={"content-type": "text/html", "content-length": "100000"}, content=b"")
+        stream = achunks() if request.url.path == "/async" else chunks()
+        return httpx.Response(200, headers={"content-type": "text/html"}, content=stream)
+
+    transport = httpx.MockTransport(respond)
+    pool = FakePool()
+    fetcher = PageFetcher(httpx.Client(transport=transport), httpx.AsyncClient(transport=transport), pool, max_bytes=5000)
+
+    with pytest.raises(FetchError, match="larger than 5000 bytes"):
+        fetcher.fetch("https://example.com/declared")
+    with pytest.raises(FetchError, match="larger than 5000 bytes"):
+        fetcher.fetch("https://example.com/stream")
+    assert len(served) < 10
+    with pytest.raises(FetchError, match="larger than 5000 bytes"):
+        asyncio.run(fetcher.afetch("https://example.com/async"))
+    assert pool.urls == [] and fetcher.fallbacks == {}
+
+def test_modes_force_one_path():
+    """Test that "http" mode never starts a browser and "browser" mode always does"""
+    pages = {
+        "/app": (200, "text/html", SHELL),
+        "/article": (200, "text/html", ARTICLE),
+        "/blocked": (403, "text/html", "<p>Forbidden</p>"),
+    }
+    fetcher, pool = make_fetcher(pages, mode="http")
+    assert fetcher.fetch("https://example.com/app").via == "http"
+    with pytest.raises(FetchError, match="status_403"):
+        fetcher.fetch("https://example.com/blocked")
+    assert pool.urls == []
+
+    fetcher, pool = make_fetcher(pages, mode="browser")
+    assert fetcher.fetch("https://example.com/article").via == "browser"
+    with pytest.raises(ValueError):
+        make_fetcher(pages, mode="sometimes")
@@ -0,0 +1,204 @@
+import asyncio
+import json
+
+from websocket_manager import WebSocketManager
+
+class FakeWebSocket:
+    """Minimal stand-in for a Starlette WebSocket that records sent messages"""
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.sent = []
+        self.closed = False
+        self.release = asyncio.Event()
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        if self.delay is None:
+            await self.release.wait()
+        elif self.delay:
+            await asyncio.sleep(self.delay)
+        self.sent.append(json.loads(text))
+
+    async def close(self, code=1000):
+        self.closed = True
+
+def test_broadcast_does_not_wait_for_slow_clients():
+    """Test that a stalled client neither blocks broadcast nor delays fast clients"""
+    async def scenario():
+        manager = WebSocketManager(max_queue=16)
+        stalled, fast = FakeWebSocket(delay=None), FakeWebSocket()
+        await manager.connect(stalled)
+        await manager.connect(fast)
+
+        await asyncio.wait_for(manager.broadcast("agent_activity", {"agent_id": "a"}), timeout=0.1)
+        await asyncio.sleep(0.01)
+
+        assert len(fast.sent) == 1
+        assert stalled.sent == []
+        manager.disconnect(stalled)
+        manager.disconnect(fast)
+
+    asyncio.run(scenario())
+
+def test_coalesce_policy_keeps_latest_progress():
+    """Test that queued progress events for one task are replaced by newer ones"""
+    async def scenario():
+        manager = WebSocketManager(max_queue=4, policy="coalesce")
+        client = FakeWebSocket(delay=None)
+        await manager.connect(client)
+        await manager.broadcast("agent_activity", {"agent_id": "a"})
+        await asyncio.sleep(0)
+
+        for step in range(10):
+            await manager.broadcast_task_progress("t1", step / 10, "running")
+
+        client.release.set()
+        await asyncio.sleep(0.01)
+        manager.disconnect(client)
+        return client.sent
+
+    sent = asyncio.run(scenario())
+    progress = [message["data"]["progress"] for message in sent if message["type"] == "task_progress"]
+    assert progress == [0.9]
+
+def test_coalesced_events_keep_their_order():
+    """Test that a newer task_update is not delivered ahead of events queued after the one it replaced"""
+    async def scenario():
+        manager = WebSocketManager(max_queue=4, policy="coalesce")
+        client = FakeWebSocket(delay=None)
+        await manager.connect(client)
+        await manager.broadcast("agent_activity", {"agent_id": "a"})
+        await asyncio.sleep(0)
+
+        await manager.broadcast("task_update", {"id": "t1", "status": "in_progress"})
+        await manager.broadcast("task_delta", {"task_id": "t1", "delta": "Hi", "offset": 0})
+        await manager.broadcast("task_update", {"id": "t1", "status": "completed"})
+        for step in range(20):
+            await manager.broadcast_task_progress("t1", step / 20, "running")
+        connection = manager.active_connections[client]
+        assert connection.pending == 3 and len(connection._queue) <= 2 * manager.max_queue
+
+        client.release.set()
+        await asyncio.sleep(0.01)
+        manager.disconnect(client)
+        return client.sent
+
+    sent = asyncio.run(scenario())
+    assert [message["type"] for message in sent] == ["agent_activity", "task_delta", "task_update", "task_progress"]
+    assert sent[2]["data"]["status"] == "completed"
+
+def test_disconnect_policy_drops_slow_client():
+    """Test that a client with a full queue is disconnected under the disconnect policy"""
+    async def scenario():
+        manager = WebSocketManager(max_queue=2, policy="disconnect")
+        client = FakeWebSocket(delay=None)
+        await manager.connect(client)
+        for index in range(5):
+            await manager.broadcast("agent_activity", {"index": index})
+        await asyncio.sleep(0)
+        return manager, client
+
+    manager, client = asyncio.run(scenario())
+    assert manager.active_connections == {}
+    assert manager.slow_disconnects == 1
+    assert client.closed
+
+def test_broadcast_encodes_each_event_once(monkeypatch):
+    """Test that one broadcast to many clients serializes the message a single time"""
+    import event_bus
+
+    calls = []
+    original = event_bus.encode_json
+    monkeypatch.setattr(event_bus, "encode_json", lambda message: calls.append(message) or original(message))
+
+    async def scenario():
+        manager = WebSocketManager()
+        clients = [FakeWebSocket() for _ in range(50)]
+        for client in clients:
+            await manager.connect(client)
+        await manager.broadcast("task_update", {"id": "t1", "result": "x" * 10000})
+        await asyncio.sleep(0.01)
+        for client in clients:
+            manager.disconnect(client)
+        return clients
+
+    clients = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert all(client.sent[0]["data"]["id"] == "t1" for client in clients)
+
+def test_subscriptions_filter_events_by_topic():
+    """Test that subscribed clients only receive events for their topics"""
+    async def scenario():
+        manager = WebSocketManager()
+        everything, by_task, by_agent = FakeWebSocket(), FakeWebSocket(), FakeWebSocket()
+        for client in (everything, by_task, by_agent):
+            await manager.connect(client)
+
+        await manager.handle_message(by_task, {"type": "subscribe", "data": {"task_id": "t1"}})
+        await manager.handle_message(by_agent, {"type": "subscribe", "data": {"agent_id": ["engineer"]}})
+
+        await manager.broadcast("task_update", {"id": "t1", "agent_id": "assistant", "metadata": {"tags": []}})
+        await manager.broadcast("task_update", {"id": "t2", "agent_id": "engineer", "metadata": {"tags": []}})
+        await manager.broadcast_task_progress("t2", 0.5, "running", topics={("task", "t2"), ("agent", "engineer")})
+        await asyncio.sleep(0.01)
+
+        await manager.handle_message(by_task, {"type": "unsubscribe"})
+        await manager.broadcast("agent_activity", {"agent_id": "researcher"})
+        await asyncio.sleep(0.01)
+        return everything, by_task, by_agent
+
+    everything, by_task, by_agent = asyncio.run(scenario())
+
+    def events(client):
+        return [(m["type"], m["data"].get("id") or m["data"].get("task_id") or m["data"].get("agent_id"))
+                for m in client.sent if m["type"] not in ("subscriptions",)]
+
+    assert len(events(everything)) == 4
+    assert events(by_task) == [("task_update", "t1"), ("agent_activity", "researcher")]
+    assert events(by_agent) == [("task_update", "t2"), ("task_progress", "t2")]
+
+def test_invalid_client_messages_are_not_rebroadcast():
+    """Test that client messages are answered privately instead of echoed to everyone"""
+    async def scenario():
+        manager = WebSocketManager()
+        sender, other = FakeWebSocket(), FakeWebSocket()
+        await manager.connect(sender)
+        await manager.connect(other)
+        await manager.handle_message(sender, {"type": "task_update", "data": {"id": "spoofed"}})
+        await manager.handle_message(sender, {"type": "subscribe", "data": {}})
+        await manager.handle_message(sender, {"type": "subscribe", "data": {"task_id": 5}})
+        await manager.handle_message(sender, {"type": "subscribe", "data": {"agent_id": ["engineer", None]}})
+        await manager.handle_message(sender, {"type": "unsubscribe", "data": {"tag": {"name": "billing"}}})
+        await asyncio.sleep(0.01)
+        return manager, sender, other
+
+    manager, sender, other = asyncio.run(scenario())
+    assert other.sent == []
+    assert [message["type"] for message in sender.sent] == ["error"] * 5
+    assert not next(iter(manager.active_connections.values())).subscriptions
+
+def test_delta_batcher_groups_tokens_by_window():
+    """Test that streamed tokens are published in a few ordered frames with offsets"""
+    from websocket_manager import DeltaBatcher
+
+    frames = []
+
+    async def publish(delta, offset):
+        frames.append((offset, delta))
+
+    async def scenario():
+        batcher = DeltaBatcher(publish, window=0.02)
+        for index in range(20):
+            batcher.add(f"t{index} ")
+            await asyncio.sleep(0.002)
+        await batcher.close()
+        return batcher
+
+    batcher = asyncio.run(scenario())
+    text = "".join(delta for _, delta in frames)
+    assert text == "".join(f"t{index} " for index in range(20))
+    assert 1 < len(frames) < 20
+    assert [offset for offset, _ in frames] == [sum(len(d) for _, d in frames[:i]) for i in range(len(frames))]
+    assert batcher.frames == len(frames)
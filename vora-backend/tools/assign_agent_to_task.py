@@ -1,5 +1,4 @@
 import logging
-import sys
 import traceback
 from typing import Optional
 from uuid import uuid4
@@ -24,7 +23,7 @@ def assign_agent_to_task(agent_name: str, task: str) -> str:
     logger.info(f"Task {task_id}: Assigning agent '{agent_name}' to task: {task}")
 
     try:
-        # Load and validate agent
+        # Load and validate agent (cached by utils.load_module until the file changes)
         agent_module = utils.load_module(f"agents/{agent_name}.py")
         agent_function = getattr(agent_module, agent_name)
         
@@ -32,10 +31,6 @@ def assign_agent_to_task(agent_name: str, task: str) -> str:
         result = agent_function(uuid=task_id)
         response = result["messages"][-1].content if result and result.get("messages") else None
         
-        # Cleanup
-        if agent_module.__name__ in sys.modules:
-            del sys.modules[agent_module.__name__]
-        
         if not response:
             raise ValueError(f"Agent '{agent_name}' returned no response")
             
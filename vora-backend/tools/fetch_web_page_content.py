@@ -1,14 +1,20 @@
-from langchain_core.tools import tool
-from langchain_community.document_loaders.url_selenium import SeleniumURLLoader
+from langchain_core.documents import Document
+from langchain_core.tools import StructuredTool
 
-@tool
-def fetch_web_page_content(url: str):
+import config
+
+def _fetch_web_page_content(url: str):
     """Fetch content from a web page."""
-    loader = SeleniumURLLoader(
-        urls=[url],
-        executable_path="/usr/bin/chromedriver",
-        arguments=['--headless', '--disable-gpu', '--no-sandbox', '--disable-dev-shm-usage']
-    )
-    pages = loader.load()
-    
-    return pages[0]
\ No newline at end of file
+    page = config.get_page_fetcher().fetch(url)
+    return Document(page_content=page.text, metadata=page.metadata())
+
+async def _afetch_web_page_content(url: str):
+    page = await config.get_page_fetcher().afetch(url)
+    return Document(page_content=page.text, metadata=page.metadata())
+
+# Built with both entry points so graphs running under ainvoke fetch on the event loop
+fetch_web_page_content = StructuredTool.from_function(
+    func=_fetch_web_page_content,
+    coroutine=_afetch_web_page_content,
+    name="fetch_web_page_content",
+)
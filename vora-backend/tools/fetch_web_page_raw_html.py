@@ -1,22 +1,18 @@
-from langchain_core.tools import tool
+from langchain_core.tools import StructuredTool
 
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
+import config
+from web_fetch import body_html
 
-@tool
-def fetch_web_page_raw_html(url: str) -> str:
+def _fetch_web_page_raw_html(url: str) -> str:
     """Fetches the raw HTML of a web page. If a CSS selector is provided, returns only the matching elements."""
-    options = Options()
-    options.add_argument('--headless')
-    options.add_argument("--disable-gpu")
-    options.add_argument('--no-sandbox')
-    options.add_argument('--disable-dev-shm-usage')
-        
-    service = Service('/usr/bin/chromedriver')
-    
-    driver = webdriver.Chrome(options=options, service=service)
+    return body_html(config.get_page_fetcher().fetch(url).html)
 
-    driver.get(url)
+async def _afetch_web_page_raw_html(url: str) -> str:
+    return body_html((await config.get_page_fetcher().afetch(url)).html)
 
-    return driver.execute_script("return document.body.outerHTML;")
\ No newline at end of file
+# Built with both entry points so graphs running under ainvoke fetch on the event loop
+fetch_web_page_raw_html = StructuredTool.from_function(
+    func=_fetch_web_page_raw_html,
+    coroutine=_afetch_web_page_raw_html,
+    name="fetch_web_page_raw_html",
+)
@@ -1,71 +1,149 @@
-import sqlite3
+import ast
+import os
 import importlib.util
+import hashlib
 import sys
 import string
 import secrets
+import threading
+import time
 import traceback
-import json
+from dataclasses import dataclass
 from typing import Dict, List, Optional, Any
 from pathlib import Path
-from langgraph.checkpoint.base import BaseCheckpointSaver
+from checkpoint_store import SQLiteCheckpointer
 
 # ------------------------------------------------------
 # Database Configuration
 # ------------------------------------------------------
-DB_PATH = Path("checkpoints.sqlite")
-conn = sqlite3.connect(str(DB_PATH), check_same_thread=False)
+DB_PATH = Path(os.getenv("CHECKPOINT_DB_PATH", "checkpoints.sqlite"))
+CHECKPOINT_FLUSH_INTERVAL = float(os.getenv("CHECKPOINT_FLUSH_INTERVAL", "0.05"))
+CHECKPOINT_KEEP = int(os.getenv("CHECKPOINT_KEEP", "20"))
+CHECKPOINT_THREAD_TTL_SECONDS = float(os.getenv("CHECKPOINT_THREAD_TTL_SECONDS", "0"))
+CHECKPOINT_MAX_THREADS = int(os.getenv("CHECKPOINT_MAX_THREADS", "0"))
+CHECKPOINT_COMPACT_INTERVAL = float(os.getenv("CHECKPOINT_COMPACT_INTERVAL", "300"))
+CHECKPOINT_MAX_DELTA_CHAIN = int(os.getenv("CHECKPOINT_MAX_DELTA_CHAIN", "32"))
+CHECKPOINT_CACHE_THREADS = int(os.getenv("CHECKPOINT_CACHE_THREADS", "1024"))
 
-class SQLiteCheckpointer(BaseCheckpointSaver):
-    """Enhanced SQLite-based checkpoint system for Forge AI"""
-    
-    def __init__(self, connection: sqlite3.Connection):
-        self.connection = connection
-        self.cursor = connection.cursor()
-        self._initialize_schema()
-
-    def _initialize_schema(self) -> None:
-        """Initialize the database schema with proper indexing"""
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS checkpoints (
-                id TEXT PRIMARY KEY,
-                data TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        self.connection.commit()
-
-    def get(self, key: str) -> dict:
-        """Retrieve checkpoint data by key"""
-        self.cursor.execute(
-            "SELECT data FROM checkpoints WHERE id = ?", 
-            (key,)
-        )
-        result = self.cursor.fetchone()
-        return json.loads(result[0]) if result else {}
-
-    def put(self, key: str, value: dict) -> None:
-        """Store checkpoint data with automatic JSON serialization"""
-        self.cursor.execute(
-            "INSERT OR REPLACE INTO checkpoints (id, data) VALUES (?, ?)",
-            (key, json.dumps(value))
-        )
-        self.connection.commit()
-
-    def get_tuple(self, config: dict) -> Optional[tuple]:
-        """Get tuple data from checkpoint"""
-        key = json.dumps(config, sort_keys=True)
-        data = self.get(key)
-        if not data:
-            return None
-        return tuple(data.get('tuple', []))
-
-    def put_tuple(self, config: dict, value: tuple) -> None:
-        """Store tuple data in checkpoint"""
-        key = json.dumps(config, sort_keys=True)
-        self.put(key, {'tuple': list(value)})
-
-# Initialize the checkpointer
-checkpointer = SQLiteCheckpointer(conn)
+# Initialize the checkpointer; a retention value of 0 disables that limit
+checkpointer = SQLiteCheckpointer(
+    str(DB_PATH),
+    flush_interval=CHECKPOINT_FLUSH_INTERVAL,
+    max_delta_chain=CHECKPOINT_MAX_DELTA_CHAIN,
+    keep_checkpoints=CHECKPOINT_KEEP or None,
+    thread_ttl_seconds=CHECKPOINT_THREAD_TTL_SECONDS or None,
+    max_threads=CHECKPOINT_MAX_THREADS or None,
+    compact_interval=CHECKPOINT_COMPACT_INTERVAL,
+    cache_size=CHECKPOINT_CACHE_THREADS,
+)
+
+# ------------------------------------------------------
+# Agent and Tool Catalog
+# ------------------------------------------------------
+@dataclass
+class CatalogEntry:
+    """The definition a module file exports under its own name, read without executing it"""
+    name: str
+    path: str
+    mtime_ns: int
+    doc: Optional[str] = None
+    signature: Optional[str] = None
+    error: Optional[str] = None
+
+def _read_function(entry: CatalogEntry, node: ast.AST) -> None:
+    entry.doc = ast.get_docstring(node)
+    entry.signature = f"{entry.name}({ast.unparse(node.args)})"
+    if node.returns is not None:
+        entry.signature += f" -> {ast.unparse(node.returns)}"
+
+def _wrapped_function(call: ast.Call) -> Optional[str]:
+    """
+    Name of the function passed to a factory call such as
+    `StructuredTool.from_function(func=_fetch, ...)`, if any.
+    """
+    arguments = [keyword.value for keyword in call.keywords if keyword.arg == "func"] + call.args[:1]
+    if arguments and isinstance(arguments[0], ast.Name):
+        return arguments[0].id
+    return None
+
+def parse_catalog_entry(path: Path) -> CatalogEntry:
+    """
+    Read the docstring and signature of the function, or the class of the
+    instance, that `path` defines under the file's stem, using `ast`. A name
+    assigned from a call that wraps a module-level function, such as
+    `StructuredTool.from_function(func=...)`, is described by that function.
+    """
+    name = path.stem
+    entry = CatalogEntry(name=name, path=str(path), mtime_ns=path.stat().st_mtime_ns)
+    try:
+        tree = ast.parse(path.read_bytes(), filename=str(path))
+    except SyntaxError as e:
+        entry.error = f"SyntaxError: {e}"
+        return entry
+
+    classes = {node.name: node for node in tree.body if isinstance(node, ast.ClassDef)}
+    functions = {
+        node.name: node for node in tree.body if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+    }
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name == name:
+            _read_function(entry, node)
+            return entry
+        if not (
+            isinstance(node, ast.Assign)
+            and any(isinstance(target, ast.Name) and target.id == name for target in node.targets)
+            and isinstance(node.value, ast.Call)
+        ):
+            continue
+        if isinstance(node.value.func, ast.Name) and node.value.func.id in classes:
+            # Agents such as gaia are module-level instances of a class
+            entry.doc = ast.get_docstring(classes[node.value.func.id])
+            return entry
+        wrapped = _wrapped_function(node.value)
+        if wrapped in functions:
+            _read_function(entry, functions[wrapped])
+            return entry
+
+    entry.error = f"No definition named '{name}'"
+    return entry
+
+class SourceCatalog:
+    """
+    Catalog of the modules in a directory, built with `ast` and kept current by
+    mtime checks made at most every `check_interval` seconds. Only files that
+    changed are parsed again.
+    """
+
+    def __init__(self, directory: str, check_interval: float = 1.0):
+        self.directory = Path(directory)
+        self.check_interval = check_interval
+        self._entries: Dict[str, CatalogEntry] = {}
+        self._checked_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def entries(self) -> Dict[str, CatalogEntry]:
+        """Current entries by name, excluding files whose names start with an underscore"""
+        now = time.monotonic()
+        if self._checked_at is None or now - self._checked_at >= self.check_interval:
+            self.refresh()
+        return self._entries
+
+    def refresh(self) -> None:
+        """Re-scan the directory now, parsing new and modified files"""
+        with self._lock:
+            entries = {}
+            for path in sorted(self.directory.glob("*.py")):
+                if not path.is_file() or path.name.startswith("_"):
+                    continue
+                entry = self._entries.get(path.stem)
+                if entry is None or entry.mtime_ns != path.stat().st_mtime_ns:
+                    entry = parse_catalog_entry(path)
+                entries[path.stem] = entry
+            self._entries = entries
+            self._checked_at = time.monotonic()
+
+agent_catalog = SourceCatalog("agents")
+tool_catalog = SourceCatalog("tools")
 
 # ------------------------------------------------------
 # Agent Management
@@ -100,7 +178,6 @@ def list_broken_tools() -> Dict[str, List[Any]]:
         try:
             module = load_module(f"tools/{tool}.py")
             getattr(module, tool)
-            del sys.modules[module.__name__]
         except Exception as e:
             exception_trace = traceback.format_exc()
             broken_tools[tool] = [e, exception_trace]
@@ -122,21 +199,30 @@ def all_agents(exclude: List[str] = ["bragi"]) -> Dict[str, str]:
     """
     List all available agents and their documentation.
     Optionally exclude specific agents from the list.
+    Read from the agent catalog, so no agent module is executed.
     """
-    agents = list_agents()
-    agents = [agent for agent in agents if agent not in exclude]
-    agent_funcs = {}
-    
-    for agent in agents:
-        try:
-            module = load_module(f"agents/{agent}.py")
-            agent_func = getattr(module, agent)
-            agent_funcs[agent] = agent_func.__doc__
-            del sys.modules[module.__name__]
-        except Exception as e:
-            print(f"WARNING: Failed to load agent '{agent}'. {e.__class__.__name__}: {e}")
-    
-    return agent_funcs
+    agent_docs = {}
+
+    for agent, entry in agent_catalog.entries().items():
+        if agent in exclude:
+            continue
+        if entry.error:
+            print(f"WARNING: Failed to read agent '{agent}'. {entry.error}")
+            continue
+        agent_docs[agent] = entry.doc
+
+    return agent_docs
+
+def all_tools() -> Dict[str, Dict[str, Optional[str]]]:
+    """
+    List all available tools with their signatures and documentation.
+    Read from the tool catalog, so no tool module is executed.
+    """
+    return {
+        tool: {"signature": entry.signature, "doc": entry.doc}
+        for tool, entry in tool_catalog.entries().items()
+        if not entry.error
+    }
 
 def list_broken_agents() -> Dict[str, List[Any]]:
     """
@@ -150,7 +236,6 @@ def list_broken_agents() -> Dict[str, List[Any]]:
         try:
             module = load_module(f"agents/{agent}.py")
             getattr(module, agent)
-            del sys.modules[module.__name__]
         except Exception as e:
             exception_trace = traceback.format_exc()
             broken_agents[agent] = [e, exception_trace]
@@ -177,26 +262,135 @@ def gensym(length: int = 32, prefix: str = "forge_") -> str:
     symbol = "".join(secrets.choice(alphabet) for _ in range(length))
     return f"{prefix}{symbol}"
 
-def load_module(source: str, module_name: Optional[str] = None) -> Any:
+# ------------------------------------------------------
+# Module Registry
+# ------------------------------------------------------
+class _LoadedModule:
+    """A module loaded from a source file, with the file state it was loaded from"""
+    __slots__ = ("module", "mtime_ns", "size", "digest")
+
+    def __init__(self, module: Any, mtime_ns: int, size: int, digest: str):
+        self.module = module
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.digest = digest
+
+class ModuleRegistry:
+    """
+    Cache of modules loaded from source files, keyed by resolved path.
+
+    A cached module is reused while the file's mtime and size are unchanged. If
+    they change, the content hash decides: the same content keeps the cached
+    module, different content is executed again under a new module name and
+    replaces it (hot reload).
+    """
+
+    def __init__(self):
+        self._modules: Dict[str, _LoadedModule] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.loads = 0
+        self.reloads = 0
+
+    def load(self, source: str, reload: bool = False) -> Any:
+        """
+        Return the module for `source`, executing the file only when it is not
+        cached, has changed on disk, or `reload` is set.
+        """
+        path = str(Path(source).resolve())
+        with self._lock:
+            path_lock = self._locks.setdefault(path, threading.Lock())
+
+        # Loads of different files proceed in parallel; one file is executed once
+        with path_lock:
+            stat = Path(path).stat()
+            entry = self._modules.get(path)
+            if not reload and entry is not None and (entry.mtime_ns, entry.size) == (stat.st_mtime_ns, stat.st_size):
+                self.hits += 1
+                return entry.module
+
+            code = Path(path).read_bytes()
+            digest = hashlib.sha256(code).hexdigest()
+            if not reload and entry is not None and entry.digest == digest:
+                entry.mtime_ns, entry.size = stat.st_mtime_ns, stat.st_size
+                self.hits += 1
+                return entry.module
+
+            module = _execute_module(path, code, f"forge_{Path(path).stem}_{digest[:12]}")
+            self._modules[path] = _LoadedModule(module, stat.st_mtime_ns, stat.st_size, digest)
+            if entry is not None:
+                self.reloads += 1
+                if sys.modules.get(entry.module.__name__) is entry.module:
+                    del sys.modules[entry.module.__name__]
+            else:
+                self.loads += 1
+            return module
+
+    def invalidate(self, source: Optional[str] = None) -> None:
+        """
+        Forget one cached module, or all of them, so the next load executes the file again.
+        """
+        with self._lock:
+            if source is None:
+                entries = list(self._modules.values())
+                self._modules.clear()
+            else:
+                entry = self._modules.pop(str(Path(source).resolve()), None)
+                entries = [entry] if entry is not None else []
+        for entry in entries:
+            if sys.modules.get(entry.module.__name__) is entry.module:
+                del sys.modules[entry.module.__name__]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Describe registry contents and activity"""
+        return {
+            "modules": len(self._modules),
+            "hits": self.hits,
+            "loads": self.loads,
+            "reloads": self.reloads,
+        }
+
+module_registry = ModuleRegistry()
+
+def _execute_module(source: str, code: bytes, module_name: str) -> Any:
+    spec = importlib.util.spec_from_file_location(module_name, source)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Could not load module from {source}")
+
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    try:
+        # Execute the bytes that were hashed, not whatever is on disk by now
+        exec(compile(code, source, "exec"), module.__dict__)
+    except BaseException:
+        del sys.modules[module_name]
+        raise
+    return module
+
+def load_module(source: str, module_name: Optional[str] = None, reload: bool = False) -> Any:
     """
     Load a Python module from a file path.
-    
+
+    Modules are cached in `module_registry` and reused until the file changes.
+    Passing an explicit `module_name` bypasses the cache and always executes
+    the file.
+
     Args:
         source: Path to the source file
         module_name: Optional custom module name
-    
+        reload: Execute the file again even if it is unchanged
+
     Returns:
         Loaded module object
     """
     if module_name is None:
-        module_name = gensym()
+        return module_registry.load(source, reload=reload)
 
-    spec = importlib.util.spec_from_file_location(module_name, source)
-    if spec is None or spec.loader is None:
-        raise ImportError(f"Could not load module from {source}")
-        
-    module = importlib.util.module_from_spec(spec)
-    sys.modules[module_name] = module
-    spec.loader.exec_module(module)
+    return _execute_module(source, Path(source).read_bytes(), module_name)
 
-    return module
\ No newline at end of file
+def reload_module(source: str) -> Any:
+    """
+    Execute a module file again and replace its cached version.
+    """
+    return module_registry.load(source, reload=True)
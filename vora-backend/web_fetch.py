@@ -0,0 +1,324 @@
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import logging
+import re
+
+logger = logging.getLogger("flux.web")
+
+FETCH_MODES = ("auto", "http", "browser")
+
+# Statuses that often depend on the client (bot blocking, rate limits keyed on the
+# client) and so may succeed in a real browser; other errors are returned as is
+BROWSER_RETRY_STATUSES = frozenset((403, 429))
+
+# Sent by the HTTP fast path; some sites answer non-browser agents with an error page
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,text/plain;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+# Title, description and language of a page loaded in the browser, read in one round trip
+PAGE_METADATA_SCRIPT = """
+const description = document.querySelector('meta[name="description"]');
+return {
+    title: document.title || "",
+    description: description ? description.content : "",
+    language: document.documentElement.lang || "",
+};
+"""
+
+# Phrases of "this page needs JavaScript" shells served to clients that do not run scripts
+_JS_REQUIRED = re.compile(r"enable javascript|javascript is (?:required|disabled)|requires javascript", re.I)
+_BODY = re.compile(r"<body\b.*</body\s*>", re.I | re.S)
+
+class FetchError(RuntimeError):
+    """
+    Raised when a page cannot be fetched and loading it in a browser would not help.
+    """
+
+# ------------------------------------------------------
+# HTML Text Extraction
+# ------------------------------------------------------
+class HTMLTextExtractor(HTMLParser):
+    """
+    Collects the visible text of an HTML document, one paragraph per block
+    element, together with its title, meta description and language.
+    """
+    SKIPPED = frozenset(("script", "style", "noscript", "template", "svg", "head", "iframe", "object"))
+    BLOCKS = frozenset((
+        "address", "article", "aside", "blockquote", "br", "dd", "div", "dl", "dt", "figcaption",
+        "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li", "main", "nav",
+        "ol", "p", "pre", "section", "table", "td", "th", "tr", "ul",
+    ))
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.title = ""
+        self.description = ""
+        self.language = ""
+        self.scripts = 0
+        # Text of <noscript> fallbacks, which is not visible but tells script-only pages apart
+        self.noscript_text = ""
+        self._noscript_depth = 0
+        self._blocks: List[str] = []
+        self._current: List[str] = []
+        self._skip_depth = 0
+        self._in_title = False
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        if tag == "html":
+            self.language = dict(attrs).get("lang") or self.language
+        elif tag == "meta":
+            values = dict(attrs)
+            if (values.get("name") or "").lower() == "description":
+                self.description = values.get("content") or ""
+        elif tag == "title":
+            self._in_title = True
+        elif tag == "body":
+            # Recover from a <head> that was never closed
+            self._skip_depth = 0
+        if tag == "script":
+            self.scripts += 1
+        elif tag == "noscript":
+            self._noscript_depth += 1
+        if tag in self.SKIPPED:
+            self._skip_depth += 1
+        elif tag in self.BLOCKS:
+            self._end_block()
+
+    def handle_startendtag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        # Void elements such as <meta/> and <br/> must not open a skipped region
+        if tag in self.SKIPPED:
+            return
+        self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "title":
+            self._in_title = False
+        elif tag == "noscript":
+            self._noscript_depth = max(0, self._noscript_depth - 1)
+        if tag in self.SKIPPED:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag in self.BLOCKS:
+            self._end_block()
+
+    def handle_data(self, data: str) -> None:
+        if self._in_title:
+            self.title += data
+        elif self._noscript_depth:
+            self.noscript_text += data
+        elif not self._skip_depth:
+            self._current.append(data)
+
+    def text(self) -> str:
+        self._end_block()
+        return "\n\n".join(self._blocks)
+
+    def _end_block(self) -> None:
+        block = " ".join("".join(self._current).split())
+        if block:
+            self._blocks.append(block)
+        self._current = []
+
+def extract_text(html: str) -> HTMLTextExtractor:
+    """
+    Parse `html` and return the extractor holding its text and metadata.
+    """
+    extractor = HTMLTextExtractor()
+    extractor.feed(html)
+    extractor.close()
+    return extractor
+
+def body_html(html: str) -> str:
+    """
+    The `<body>` element of an HTML document, or the whole document if it has none.
+    """
+    match = _BODY.search(html)
+    return match.group(0) if match else html
+
+# ------------------------------------------------------
+# Fetched Pages
+# ------------------------------------------------------
+@dataclass(slots=True)
+class WebPage:
+    """
+    A fetched web page: its HTML, visible text and metadata, and whether it
+    came from the HTTP fast path or the browser.
+    """
+    url: str
+    html: str
+    text: str
+    title: str = ""
+    description: str = ""
+    language: str = ""
+    via: str = "http"
+
+    def metadata(self) -> Dict[str, Any]:
+        return {
+            "source": self.url,
+            "title": self.title or "No title found.",
+            "description": self.description or "No description found.",
+            "language": self.language or "No language found.",
+            "fetched_via": self.via,
+        }
+
+# ------------------------------------------------------
+# PageFetcher: HTTP First, Browser Fallback
+# ------------------------------------------------------
+class PageFetcher:
+    """
+    Fetches web pages over pooled keep-alive HTTP clients, falling back to a
+    headless browser from `browser_pool` only when the response looks like it
+    needs JavaScript to render.
+
+    A response falls back when the server refuses the client (403, 429), when
+    it is not HTML or text, or when its visible text is shorter than
+    `min_text_chars` (or asks for JavaScript) while the page carries scripts.
+    Other errors, and bodies over `max_bytes`, raise FetchError: a browser
+    would not do better. Bodies are streamed, so an oversized page is dropped
+    as soon as it passes the limit. `mode` "http" never uses the browser and
+    "browser" always does.
+    """
+    def __init__(
+        self,
+        client: Any,
+        async_client: Any,
+        browser_pool: Any,
+        mode: str = "auto",
+        min_text_chars: int = 200,
+        max_bytes: int = 5 * 1024 * 1024,
+    ) -> None:
+        if mode not in FETCH_MODES:
+            raise ValueError(f"Unsupported fetch mode {mode!r}, expected one of {FETCH_MODES}")
+        self.client = client
+        self.async_client = async_client
+        self.browser_pool = browser_pool
+        self.mode = mode
+        self.min_text_chars = min_text_chars
+        self.max_bytes = max_bytes
+
+        self.http_pages: int = 0
+        self.browser_pages: int = 0
+        self.fallbacks: Dict[str, int] = {}
+
+    def fetch(self, url: str) -> WebPage:
+        """
+        Fetch `url`, through the browser only when the HTTP response is not usable.
+
+        Raises:
+            FetchError: If the page does not exist, is too large, or the server
+                answers with an error a browser would get as well.
+        """
+        if self.mode != "browser":
+            with self.client.stream("GET", url) as response:
+                reason = self._check_response(url, response)
+                if reason is None:
+                    body = bytearray()
+                    for chunk in response.iter_bytes():
+                        self._append(url, body, chunk)
+                    page, reason = self._to_page(response, bytes(body))
+                    if page is not None:
+                        return page
+            self._fall_back(url, reason)
+        return self.fetch_with_browser(url)
+
+    async def afetch(self, url: str) -> WebPage:
+        """
+        Async `fetch`; the browser fallback runs in a worker thread.
+        """
+        if self.mode != "browser":
+            async with self.async_client.stream("GET", url) as response:
+                reason = self._check_response(url, response)
+                if reason is None:
+                    body = bytearray()
+                    async for chunk in response.aiter_bytes():
+                        self._append(url, body, chunk)
+                    page, reason = self._to_page(response, bytes(body))
+                    if page is not None:
+                        return page
+            self._fall_back(url, reason)
+        return await asyncio.to_thread(self.fetch_with_browser, url)
+
+    def fetch_with_browser(self, url: str) -> WebPage:
+        with self.browser_pool.checkout() as driver:
+            driver.get(url)
+            html = driver.page_source
+            metadata = driver.execute_script(PAGE_METADATA_SCRIPT) or {}
+        self.browser_pages += 1
+        return WebPage(
+            url=url,
+            html=html,
+            text=extract_text(html).text(),
+            title=metadata.get("title", ""),
+            description=metadata.get("description", ""),
+            language=metadata.get("language", ""),
+            via="browser",
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Describe fetch activity for JSON responses.
+        """
+        return {
+            "mode": self.mode,
+            "http_pages": self.http_pages,
+            "browser_pages": self.browser_pages,
+            "fallbacks": dict(self.fallbacks),
+        }
+
+    def _check_response(self, url: str, response: Any) -> Optional[str]:
+        """
+        Inspect the status and headers of a response before its body is read:
+        None if the body should be read, or the reason to use the browser instead.
+        """
+        if response.status_code in BROWSER_RETRY_STATUSES:
+            return f"status_{response.status_code}"
+        if response.status_code >= 400:
+            raise FetchError(f"Fetching {url} failed with HTTP {response.status_code}")
+        content_type = response.headers.get("content-type", "").lower()
+        if "html" not in content_type and not content_type.startswith("text/"):
+            return "content_type"
+        length = response.headers.get("content-length", "")
+        if length.isdigit() and int(length) > self.max_bytes:
+            raise FetchError(f"{url} is larger than {self.max_bytes} bytes")
+        return None
+
+    def _append(self, url: str, body: bytearray, chunk: bytes) -> None:
+        body += chunk
+        if len(body) > self.max_bytes:
+            raise FetchError(f"{url} is larger than {self.max_bytes} bytes")
+
+    def _to_page(self, response: Any, body: bytes) -> Tuple[Optional[WebPage], str]:
+        """
+        A page built from a response body, or None and the reason it needs the browser.
+        """
+        html = body.decode(response.encoding or "utf-8", errors="replace")
+        if "html" not in response.headers.get("content-type", "").lower():
+            self.http_pages += 1
+            return WebPage(url=str(response.url), html=html, text=html), ""
+
+        extracted = extract_text(html)
+        text = extracted.text()
+        asks_for_script = _JS_REQUIRED.search(extracted.noscript_text) or _JS_REQUIRED.search(text)
+        if self.mode == "auto" and extracted.scripts and (
+            len(text) < self.min_text_chars or (asks_for_script and len(text) < 5 * self.min_text_chars)
+        ):
+            return None, "script_rendered"
+        self.http_pages += 1
+        return WebPage(
+            url=str(response.url),
+            html=html,
+            text=text,
+            title=" ".join(extracted.title.split()),
+            description=extracted.description,
+            language=extracted.language,
+        ), ""
+
+    def _fall_back(self, url: str, reason: str) -> None:
+        if self.mode == "http":
+            raise FetchError(f"Could not fetch {url} over HTTP ({reason})")
+        self.fallbacks[reason] = self.fallbacks.get(reason, 0) + 1
+        logger.debug(f"Fetching {url} with the browser ({reason})")
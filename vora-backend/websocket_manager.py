@@ -0,0 +1,393 @@
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Hashable, Iterable, List, Optional, Set
+import asyncio
+import logging
+
+from fastapi import WebSocket
+
+from event_bus import Event, EventBus, Topic, encode_json
+
+logger = logging.getLogger("flux.websocket")
+
+# Policies for a client whose outbound queue is full
+SLOW_CONSUMER_POLICIES = ("coalesce", "drop_oldest", "disconnect")
+
+# Subscription message fields and the topic kind each one maps to
+TOPIC_FIELDS = {"task_id": "task", "agent_id": "agent", "tag": "tag"}
+
+def parse_topics(data: Any) -> Set[Topic]:
+    """
+    Read topics from a subscribe/unsubscribe payload such as
+    {"task_id": "...", "agent_id": ["engineer"], "tag": "billing"}.
+
+    Raises:
+        ValueError: If the payload contains no recognised topic, or a field is not
+            a string or a list of strings.
+    """
+    topics = set()
+    if isinstance(data, dict):
+        for field_name, kind in TOPIC_FIELDS.items():
+            values = data.get(field_name)
+            if values is None:
+                continue
+            if isinstance(values, str):
+                values = [values]
+            if not isinstance(values, list) or not all(isinstance(value, str) for value in values):
+                raise ValueError(f"{field_name} must be a string or a list of strings")
+            topics.update((kind, value) for value in values)
+    if not topics:
+        raise ValueError(f"Expected at least one of {sorted(TOPIC_FIELDS)}")
+    return topics
+
+def coalesce_key(event_type: str, data: Any) -> Optional[Hashable]:
+    """
+    Key under which a newer event supersedes an older queued one, or None if every
+    occurrence of the event matters.
+    """
+    if not isinstance(data, dict):
+        return None
+    if event_type == "task_progress":
+        return (event_type, data.get("task_id"))
+    if event_type == "task_update":
+        return (event_type, data.get("id"))
+    return None
+
+# ------------------------------------------------------
+# Client Connection
+# ------------------------------------------------------
+class ClientConnection:
+    """
+    One WebSocket client with its own bounded outbound queue and writer task.
+    """
+    def __init__(self, websocket: WebSocket, manager: "WebSocketManager", max_queue: int, policy: str) -> None:
+        self.websocket = websocket
+        self.manager = manager
+        self.max_queue = max_queue
+        self.policy = policy
+        self.dropped: int = 0
+        self.coalesced: int = 0
+        self.subscriptions: Set[Topic] = set()
+
+        # Each entry is a mutable [key, payload] pair; coalescing blanks the superseded
+        # payload in place and queues the newer one at the tail, so order is kept
+        self._queue: Deque[List[Any]] = deque()
+        self._queued_by_key: Dict[Hashable, List[Any]] = {}
+        self._live = 0
+        self._ready = asyncio.Event()
+        self._writer: Optional[asyncio.Task] = None
+
+    @property
+    def pending(self) -> int:
+        return self._live
+
+    def start(self) -> None:
+        self._writer = asyncio.get_running_loop().create_task(self._write_loop())
+
+    def stop(self) -> None:
+        if self._writer is not None and self._writer is not asyncio.current_task():
+            self._writer.cancel()
+        self._writer = None
+
+    def enqueue(self, payload: str, key: Optional[Hashable] = None) -> bool:
+        """
+        Queue a pre-encoded JSON payload for this client without waiting.
+
+        Returns False if the client is too slow and should be disconnected.
+        """
+        if self.policy == "coalesce" and key is not None:
+            stale = self._queued_by_key.pop(key, None)
+            if stale is not None:
+                stale[1] = None
+                self._live -= 1
+                self.coalesced += 1
+                if len(self._queue) >= 2 * self.max_queue:
+                    self._queue = deque(entry for entry in self._queue if entry[1] is not None)
+
+        while self._live >= self.max_queue:
+            if self.policy == "disconnect":
+                return False
+            oldest = self._queue.popleft()
+            self._discard(oldest)
+            if oldest[1] is not None:
+                self._live -= 1
+                self.dropped += 1
+
+        entry = [key, payload]
+        self._queue.append(entry)
+        self._live += 1
+        if key is not None:
+            self._queued_by_key[key] = entry
+        self._ready.set()
+        return True
+
+    def _discard(self, entry: List[Any]) -> None:
+        key = entry[0]
+        if key is not None and self._queued_by_key.get(key) is entry:
+            del self._queued_by_key[key]
+
+    async def _write_loop(self) -> None:
+        try:
+            while True:
+                await self._ready.wait()
+                while self._queue:
+                    entry = self._queue.popleft()
+                    self._discard(entry)
+                    if entry[1] is None:
+                        continue
+                    self._live -= 1
+                    await self.websocket.send_text(entry[1])
+                self._ready.clear()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to send message to client: {e}")
+            self.manager.disconnect(self.websocket)
+
+# ------------------------------------------------------
+# WebSocket Manager
+# ------------------------------------------------------
+class WebSocketManager:
+    """
+    Manages active WebSocket connections and enables server-side broadcast to clients.
+
+    Broadcasting encodes each event to JSON once and only enqueues the resulting
+    text: every client drains its own queue on a dedicated writer task, so one
+    slow browser cannot delay events for the others. When a client's queue is
+    full, `policy` decides whether to coalesce superseded progress events, drop
+    the oldest queued message, or disconnect the client.
+
+    Events flow through an EventBus: `broadcast` publishes onto the bus and the
+    manager delivers every published event to its clients, alongside any other
+    transport subscribed to the same bus.
+
+    Clients may subscribe to task, agent and tag topics. A client with no
+    subscriptions receives every event; once subscribed it only receives events
+    for its topics, and events nobody is interested in are never encoded.
+    """
+    def __init__(self, max_queue: int = 256, policy: str = "coalesce", bus: Optional[EventBus] = None) -> None:
+        if policy not in SLOW_CONSUMER_POLICIES:
+            raise ValueError(f"Unknown slow consumer policy: {policy}")
+
+        self.max_queue = max_queue
+        self.policy = policy
+        self.active_connections: Dict[WebSocket, ClientConnection] = {}
+        self.slow_disconnects: int = 0
+
+        self._unfiltered: Set[ClientConnection] = set()
+        self._subscribers: Dict[Topic, Set[ClientConnection]] = {}
+
+        self.bus = bus if bus is not None else EventBus()
+        self.bus.subscribe(self.deliver)
+
+    async def connect(self, websocket: WebSocket) -> None:
+        """
+        Accept and register a new WebSocket connection.
+        """
+        await websocket.accept()
+        client = ClientConnection(websocket, self, self.max_queue, self.policy)
+        self.active_connections[websocket] = client
+        self._unfiltered.add(client)
+        client.start()
+        logger.info(f"WebSocket connected. Total active connections: {len(self.active_connections)}")
+
+    def disconnect(self, websocket: WebSocket) -> None:
+        """
+        Unregister a WebSocket connection and stop its writer.
+        """
+        client = self.active_connections.pop(websocket, None)
+        if client is not None:
+            self._unfiltered.discard(client)
+            self._remove_subscriptions(client, set(client.subscriptions))
+            client.stop()
+            logger.info(f"WebSocket disconnected. Remaining connections: {len(self.active_connections)}")
+
+    def subscribe(self, websocket: WebSocket, topics: Iterable[Topic]) -> None:
+        """
+        Restrict a client to events for the given topics, in addition to any it already follows.
+        """
+        client = self.active_connections.get(websocket)
+        if client is None:
+            return
+        for topic in topics:
+            client.subscriptions.add(topic)
+            self._subscribers.setdefault(topic, set()).add(client)
+        if client.subscriptions:
+            self._unfiltered.discard(client)
+
+    def unsubscribe(self, websocket: WebSocket, topics: Optional[Iterable[Topic]] = None) -> None:
+        """
+        Stop following the given topics, or all topics if none are given. A client left
+        without subscriptions receives every event again.
+        """
+        client = self.active_connections.get(websocket)
+        if client is None:
+            return
+        self._remove_subscriptions(client, set(client.subscriptions if topics is None else topics))
+        if not client.subscriptions:
+            self._unfiltered.add(client)
+
+    async def handle_message(self, websocket: WebSocket, message: Any) -> None:
+        """
+        Process a message received from a client: subscribe, unsubscribe or ping.
+        """
+        message_type = message.get("type") if isinstance(message, dict) else None
+        data = message.get("data") if isinstance(message, dict) else None
+        try:
+            if message_type == "subscribe":
+                self.subscribe(websocket, parse_topics(data))
+            elif message_type == "unsubscribe":
+                self.unsubscribe(websocket, parse_topics(data) if data else None)
+            elif message_type == "ping":
+                self.send(websocket, {"type": "pong", "data": {}})
+                return
+            else:
+                raise ValueError(f"Unsupported message type: {message_type}")
+        except ValueError as e:
+            self.send(websocket, {"type": "error", "data": {"message": str(e)}})
+            return
+
+        client = self.active_connections.get(websocket)
+        self.send(websocket, {
+            "type": "subscriptions",
+            "data": {
+                "topics": sorted(f"{kind}:{value}" for kind, value in client.subscriptions) if client else [],
+            },
+        })
+
+    def send(self, websocket: WebSocket, message: Dict[str, Any]) -> None:
+        """
+        Queue a message for a single client, preserving order with broadcasts.
+        """
+        client = self.active_connections.get(websocket)
+        if client is not None and not client.enqueue(encode_json(message)):
+            self._drop_slow_client(client)
+
+    async def broadcast(self, event_type: str, data: Any, topics: Optional[Iterable[Topic]] = None) -> None:
+        """
+        Publish an event on the bus and return immediately.
+
+        `topics` defaults to those derived from the event data.
+        """
+        self.bus.publish(event_type, data, topics)
+
+    def deliver(self, event: Event) -> None:
+        """
+        Queue a published event for every interested client. Events nobody is
+        interested in are never encoded.
+        """
+        recipients = set(self._unfiltered)
+        for topic in event.topics:
+            recipients.update(self._subscribers.get(topic, ()))
+        if not recipients:
+            return
+
+        key = coalesce_key(event.type, event.data)
+        for client in recipients:
+            if not client.enqueue(event.payload, key):
+                self._drop_slow_client(client)
+
+    async def broadcast_agent_activity(
+        self, agent_id: str, activity: str, details: Dict[str, Any] = None, topics: Optional[Iterable[Topic]] = None
+    ) -> None:
+        await self.broadcast("agent_activity", {
+            "agent_id": agent_id,
+            "activity": activity,
+            "details": details or {},
+        }, topics)
+
+    async def broadcast_task_progress(
+        self, task_id: str, progress: float, status: str, current_action: str = None, topics: Optional[Iterable[Topic]] = None
+    ) -> None:
+        await self.broadcast("task_progress", {
+            "task_id": task_id,
+            "progress": progress,
+            "status": status,
+            "current_action": current_action,
+        }, topics)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Describe connection and backpressure counters for JSON responses.
+        """
+        clients = list(self.active_connections.values())
+        return {
+            "connections": len(clients),
+            "policy": self.policy,
+            "max_queue": self.max_queue,
+            "queued_messages": sum(client.pending for client in clients),
+            "dropped_messages": sum(client.dropped for client in clients),
+            "coalesced_messages": sum(client.coalesced for client in clients),
+            "slow_disconnects": self.slow_disconnects,
+            "subscribed_topics": len(self._subscribers),
+        }
+
+    def _remove_subscriptions(self, client: ClientConnection, topics: Set[Topic]) -> None:
+        for topic in topics:
+            client.subscriptions.discard(topic)
+            subscribers = self._subscribers.get(topic)
+            if subscribers is not None:
+                subscribers.discard(client)
+                if not subscribers:
+                    del self._subscribers[topic]
+
+    def _drop_slow_client(self, client: ClientConnection) -> None:
+        logger.warning("Disconnecting slow WebSocket client with a full send queue")
+        self.slow_disconnects += 1
+        self.disconnect(client.websocket)
+        asyncio.get_running_loop().create_task(self._close(client.websocket))
+
+    async def _close(self, websocket: WebSocket) -> None:
+        try:
+            await websocket.close(code=1013)
+        except Exception:
+            pass
+
+# ------------------------------------------------------
+# Delta Batcher
+# ------------------------------------------------------
+class DeltaBatcher:
+    """
+    Collects streamed text fragments and publishes them at most once per `window`
+    seconds, so token streams become a handful of frames instead of one per token.
+
+    `publish` receives the joined text and its character offset within the stream.
+    `add` must be called on the event loop thread.
+    """
+    def __init__(self, publish: Callable[[str, int], Awaitable[None]], window: float = 0.1) -> None:
+        self.publish = publish
+        self.window = window
+        self.frames: int = 0
+
+        self._buffer: List[str] = []
+        self._offset = 0
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._sends: List[asyncio.Task] = []
+
+    def add(self, text: str) -> None:
+        if not text:
+            return
+        self._buffer.append(text)
+        if self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(self.window, self._flush)
+
+    async def close(self) -> None:
+        """
+        Publish whatever is still buffered and wait for all sends to finish.
+        """
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+        self._flush()
+        await asyncio.gather(*self._sends)
+        self._sends.clear()
+
+    def _flush(self) -> None:
+        self._flush_handle = None
+        if not self._buffer:
+            return
+
+        delta = "".join(self._buffer)
+        self._buffer.clear()
+        offset, self._offset = self._offset, self._offset + len(delta)
+        self.frames += 1
+        self._sends = [send for send in self._sends if not send.done()]
+        self._sends.append(asyncio.get_running_loop().create_task(self.publish(delta, offset)))
@@ -83,12 +83,23 @@ export default function ChatPage() {
     // Connect to WebSocket and set up message handler
     websocketService.connect()
     
-    const messageHandler = (data: WebSocketMessage) => {
+    const messageHandler = async (data: WebSocketMessage) => {
       if (data.type === 'task_update' && typeof data.data === 'object' && data.data && 'result' in data.data) {
+        let content = String(data.data.result)
+        // Large results arrive as a preview; the full text is served by the result endpoint
+        if (data.data.result_ref) {
+          try {
+            const response = await fetch(`${config.apiUrl}/tasks/${data.data.id}/result`)
+            if (!response.ok) throw new Error('Failed to fetch task result')
+            content = await response.text()
+          } catch (error) {
+            console.error('Error fetching task result:', error)
+          }
+        }
         setMessages(prev => [...prev, {
           id: `msg_${Date.now()}_${Math.random().toString(36).substr(2, 9)}`,
           role: 'assistant',
-          content: String(data.data.result),
+          content,
           timestamp: new Date()
         }])
         setIsLoading(false)